@@ -3,10 +3,16 @@ import bpy_extras
 import textwrap
 import subprocess
 import tempfile
+import time
 import os
-import uuid
 from os import path
-from .eab_utils.object_dependencies import ObjectDependencies
+from .eab_utils.worker_pool import WorkerPool, WorkerError
+from .eab_utils.snapshot import Snapshot
+from .eab_utils.timing import PhaseTimer, default_report_path
+from .eab_utils.manifest import write_manifest
+from .eab_utils.blend_file import BlendFile, BlendFileError, ID_CODES, ID_TYPE_CODES, UNRENAMED_ID_CODES
+from .eab_utils.name_index import NameIndex
+from .eab_utils.fingerprint import ObjectFingerprints
 from .eab_utils import utils as U
 
 bl_info = {
@@ -20,8 +26,26 @@ bl_info = {
 	"category": "Import-Export"
 }
 
-target_scene_items = []
-target_scene_default_item = '("ACTIVE_SCENE", "Active Scene", "")'
+target_scene_default_item = ("ACTIVE_SCENE", "Active Scene", "")
+# Enum items of the target scene property, kept at module level so Blender doesn't lose the strings
+target_scene_items = [target_scene_default_item]
+# filepath -> ((size, mtime), scene names), so a destination file is only read again when it changes
+scene_names_cache = {}
+# Destination file waiting for its scenes to be read, and when it was selected
+pending_target_file = None
+pending_target_file_time = 0
+# Seconds without a new file selection before the selected file is read
+TARGET_SCENE_UPDATE_DELAY = 0.3
+addon_dir = path.dirname(path.realpath(__file__))
+worker_pool = None
+# Summary of each file written by the last export : filepath, number of objects, status and duration
+batch_summary = []
+
+def get_worker_pool():
+	global worker_pool
+	if worker_pool is None:
+		worker_pool = WorkerPool(bpy.app.binary_path, path.join(addon_dir, 'worker.py'))
+	return worker_pool
 
 def _label_multiline(context, text, parent):
 	chars = int(context.region.width / 7)   # 7 pix on 1 character
@@ -32,27 +56,86 @@ def _label_multiline(context, text, parent):
 
 
 def filepath_set(self, value):
+	global pending_target_file, pending_target_file_time
 	if path.exists(value) and path.isfile(value) and path.splitext(value)[1].lower() == '.blend':
-		target_scene_items_update(self, value)
+		# The file is read from a timer, once the user stops clicking through files, so browsing doesn't stall
+		pending_target_file = value
+		pending_target_file_time = time.monotonic()
+		if not bpy.app.timers.is_registered(target_scene_items_timer):
+			bpy.app.timers.register(target_scene_items_timer, first_interval=TARGET_SCENE_UPDATE_DELAY)
 	bpy.context.window_manager.eab_filepath = value
 
-def target_scene_items_update(self, value):
-	wm = bpy.context.window_manager
-	target_scene_items = [eval(target_scene_default_item)]
-
-	if not path.exists(value):
+def target_scene_items_timer():
+	global pending_target_file
+	remaining = TARGET_SCENE_UPDATE_DELAY - (time.monotonic() - pending_target_file_time)
+	if remaining > 0:
+		return remaining
+
+	filepath = pending_target_file
+	pending_target_file = None
+	if filepath is not None:
+		target_scene_items_update(filepath)
+	return None
+
+def get_scene_names(filepath):
+	stat = os.stat(filepath)
+	key = (stat.st_size, stat.st_mtime_ns)
+	cached = scene_names_cache.get(filepath)
+	if cached is not None and cached[0] == key:
+		return cached[1]
+
+	scene_names = get_file_id_names(filepath).get('SC', [])
+	scene_names_cache[filepath] = (key, scene_names)
+	return scene_names
+
+def get_file_id_names(filepath, use_name_index=False):
+	"""Names of the local datablocks of a blend file per ID code, read from the file blocks without loading it, or from its name index"""
+	try:
+		if use_name_index:
+			return NameIndex(filepath).get()['names']
+		blend_file = BlendFile(filepath)
+		return {code: blend_file.id_names(code) for code in blend_file.ids.keys()}
+	except BlendFileError:
+		# Unknown file format, Blender reads it
+		with bpy.data.libraries.load(filepath, link=True) as (data_from, data_to):
+			return {code: list(getattr(data_from, d)) for code, d in ID_CODES.items() if hasattr(data_from, d)}
+
+def get_blend_filepath(filepath):
+	"""Return filepath with the .blend extension, an empty path is left empty"""
+	if filepath == '' or path.splitext(filepath)[1].lower() == '.blend':
+		return filepath
+	return filepath + '.blend'
+
+def get_batch_filepaths(directory, names):
+	"""Return a .blend file path in directory for each name. Names that are the same once cleaned, like "A.B" and "A_B", are numbered"""
+	filepaths = []
+	used_names = set()
+	for n in names:
+		name = bpy.path.clean_name(n)
+		unique_name = name
+		i = 1
+		# File systems can be case insensitive
+		while unique_name.lower() in used_names:
+			unique_name = f'{name}_{i:03d}'
+			i += 1
+		used_names.add(unique_name.lower())
+		filepaths.append(path.join(directory, unique_name + '.blend'))
+	return filepaths
+
+def target_scene_items_update(filepath):
+	global target_scene_items
+	if not path.exists(filepath):
 		return
 
-	with bpy.data.libraries.load(value, link=True) as (data_from, data_to):
-		for i,s in enumerate(data_from.scenes):
-			target_scene_items.append((s, s, ''))
-			
-	wm.eab_target_scene_items = str(target_scene_items)
+	target_scene_items = [target_scene_default_item] + [(s, s, '') for s in get_scene_names(filepath)]
 
-def target_scene_items_list(self, context):
-	wm = context.window_manager
+	# The export dialog is not redrawn by the timer
+	for window in bpy.context.window_manager.windows:
+		for area in window.screen.areas:
+			area.tag_redraw()
 
-	return eval(wm.eab_target_scene_items)
+def target_scene_items_list(self, context):
+	return target_scene_items
 
 
 class TILA_OP_ExportAsBlendSaveCurrentFile(bpy.types.Operator):
@@ -77,6 +160,16 @@ class TILA_OP_ExportAsBlendSaveCurrentFile(bpy.types.Operator):
 
 
 
+class TILA_PG_ExportAsBlendBatchObject(bpy.types.PropertyGroup):
+	# The object name is stored in the name property of the PropertyGroup
+	pass
+
+
+class TILA_PG_ExportAsBlendBatchJob(bpy.types.PropertyGroup):
+	filepath: bpy.props.StringProperty(name='File Path', subtype='FILE_PATH')
+	objects: bpy.props.CollectionProperty(type=TILA_PG_ExportAsBlendBatchObject)
+
+
 class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper):
 	bl_idname = "export_scene.tila_export_as_blend"
 	bl_label = "Export as Blend"
@@ -120,6 +213,18 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 		name='Export Mode',
   		description='Choose how you want the data to be transfered from the current file.')
 	
+	batch_mode: bpy.props.EnumProperty(
+		items=[("NONE", "Single File", "Selected objects are exported to the destination file"),
+			   ("OBJECTS", "One File per Object", "Each selected object is exported to its own file, named after the object, in the destination folder"),
+			   ("COLLECTIONS", "One File per Collection", "Each top level collection holding selected objects is exported with all its objects to its own file, named after the collection, in the destination folder")],
+		name='Batch',
+		description='Export several files at once, from the same session')
+	batch_jobs: bpy.props.CollectionProperty(type=TILA_PG_ExportAsBlendBatchJob, options={'HIDDEN', 'SKIP_SAVE'})
+	engine: bpy.props.EnumProperty(
+		items=[("BACKGROUND", "Background Blender", "Data is imported to the destination file by a background Blender"),
+			   ("IN_PROCESS", "In Process", "Data is written to the destination file from the current session, much faster on small selections. Only used when overriding a clean file with appended objects and no packed data, the Background Blender engine is used otherwise")],
+		name='Engine',
+		description='Choose how the destination file is written')
 	create_collection_hierarchy: bpy.props.BoolProperty(name='Create Collection Hierarchy',
 														description='Each Objects will be exported in its respective collection hierarchy from the source Blend file. Otherwise all Objects will be exported in the default collection',
 														default=True)
@@ -138,24 +243,47 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 	dependencies_in_dedicated_collection: bpy.props.BoolProperty(name='Export dependencies in dedicated collection',
 																		description='Each object dependencies are put in a dedicated collection named "Dependencies". If unchecked, each dependencies will be placed their respective collection from the source blend file',
 																		default=False)
+	snapshot_mode: bpy.props.EnumProperty(
+		items=[("FULL", "Full File", "The whole current file is saved to a temporary file"),
+			   ("PARTIAL", "Exported Data Only", "Only the selected objects, their children, their dependencies and the collections holding them are saved to a temporary file")],
+		name='Unsaved File Snapshot',
+		description='Choose what is saved to a temporary file when exporting from a file with unsaved changes')
 	pack_external_data: bpy.props.BoolProperty(	name='Pack External Data',
 												description='All data exported will be packed into the blend file, to avoid external files dependencies. It would increase drastically the size of the exported file and saving time',
 												default=False)
 	open_exported_blend: bpy.props.BoolProperty(	name='Open Exported Blend',
 												 	description='The Exported blend file will be opened after export',
 												 	default=False)
+	use_background_worker: bpy.props.BoolProperty(	name='Use Background Worker',
+													description='Run the export in a background Blender that is kept alive between exports, instead of starting a new Blender each time. The worker is stopped after being idle for a few minutes',
+													default=False)
+	incremental: bpy.props.BoolProperty(	name='Incremental',
+										description='Only export the objects that changed since they were last exported to the file, and replace their previous export. Unchanged objects are left untouched in the file',
+										default=False)
+	use_name_index: bpy.props.BoolProperty(	name='Name Index',
+											description='Keep the datablock names of the exported file in a <file>_eab_index.json sidecar, written after each export. Following appends to the file read the names from the sidecar while the file is unchanged',
+											default=False)
 	print_debug: bpy.props.BoolProperty( 	name='Print debug messages',
 											description='Print debug message in console',
 											default=False)
+	write_report: bpy.props.BoolProperty(	name='Write Timing Report',
+											description='Write the duration of each export phase and the number of exported datablocks to a json report',
+											default=False)
+	report_file: bpy.props.StringProperty(	name='Report File',
+											description='Path of the json report. If empty, the report is written next to the exported file',
+											subtype='FILE_PATH',
+											default='')
+	profile: bpy.props.EnumProperty(
+		items=[("NONE", "Disabled", "The background Blender is not profiled"),
+			   ("CPU", "Functions", "The background Blender is profiled with cProfile, the stats are written next to the exported file as <file>_import_command.pstats"),
+			   ("MEMORY", "Functions and Memory", "The background Blender is profiled with cProfile and tracemalloc, the memory peak and top allocations are also written next to the exported file as <file>_import_command_memory.txt")],
+		name='Profile',
+		description='Profile the background Blender running the export')
 	# relink_as_library : bpy.props.BoolProperty(	name='Relink as Library',
 	#                                         	description='After export, the file is relink as a library in the current Scene',
 	#                                          	default=False)
 	filename_ext = '.blend'
 	
-	@property
-	def uuid(self):
-		return uuid.uuid1().hex
-
 	def draw(self, context):
 		layout = self.layout
 		col = layout.column()
@@ -183,6 +311,10 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 		r = col.row()
 		r.prop(self, 'export_mode', expand=True)
 
+		box.prop(self, 'engine')
+		if self.source == 'OBJECTS':
+			box.prop(self, 'batch_mode')
+
 		if bpy.data.is_dirty and self.export_mode == 'LINK':
 			box2 = box.box()
 			text='You are about to link data from an unsaved file which might not work properly. It is recommended to save before exporting.'
@@ -193,10 +325,15 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 		if self.export_mode == "APPEND":
 			box.prop(self, 'pack_external_data')
 
+		if self.source == 'OBJECTS' and self.file_override == 'APPEND_LINK' and self.export_mode == 'APPEND':
+			box.prop(self, 'incremental')
+
 		if self.file_override == 'OVERRIDE':
 			box.prop(self, 'export_to_clean_file')
 
 		if self.source == "OBJECTS":
+			if bpy.data.is_dirty:
+				box.prop(self, 'snapshot_mode')
 			box.prop(self, 'export_object_children')
 			box.prop(self, 'create_collection_hierarchy')
 			box.prop(self, 'dependencies_in_dedicated_collection')
@@ -208,7 +345,13 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 			col.enabled = self.export_in_new_collection
 
 		box.prop(self, 'open_exported_blend')
+		box.prop(self, 'use_background_worker')
+		box.prop(self, 'use_name_index')
 		box.prop(self, 'print_debug')
+		box.prop(self, 'write_report')
+		if self.write_report:
+			box.prop(self, 'report_file')
+		box.prop(self, 'profile')
 		# col.prop(self, 'relink_as_library')
 
 		# Operation Description
@@ -252,90 +395,82 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 			_label_multiline(context=context, text=text, parent=box)
 
 	def execute(self, context):
+		# Batch jobs given by a script hold their own paths, the file browser path can be unset or outdated
 		filepath = context.window_manager.eab_filepath
-		ext = path.splitext(filepath)[1].lower()
-		if ext != '.blend':
-			filepath += '.blend'
-		
-		self.selected_objects = [o.name for o in bpy.context.selected_objects]
-		self.name_collisions = {}
+		if not len(self.batch_jobs):
+			if filepath == '':
+				self.report({'ERROR'}, 'Export As Blend : No destination file')
+				return {'CANCELLED'}
+			filepath = get_blend_filepath(filepath)
+
+		global batch_summary
+		batch_summary = []
+		jobs = []
+		for object_names, job_filepath in self.get_jobs(context, filepath):
+			# Jobs given by a script can lack a destination or name objects that don't exist
+			missing_objects = [n for n in object_names if n not in bpy.data.objects]
+			if job_filepath == '' or len(missing_objects):
+				self.report({'WARNING'}, f'Export As Blend : Skipping job "{job_filepath}", ' + ('no destination file' if job_filepath == '' else f'objects not found : {", ".join(missing_objects)}'))
+				batch_summary.append({'filepath': job_filepath, 'objects': len(object_names), 'status': 'CANCELLED', 'duration': 0.0})
+				continue
+			jobs.append((object_names, job_filepath))
+
+		if not len(jobs):
+			self.report({'ERROR'}, 'Export As Blend : Nothing to export')
+			return {'CANCELLED'}
+		if len(self.batch_jobs):
+			filepath = jobs[0][1]
 
 		# Cancel if current file and destination file are the same
-		if os.path.normpath(filepath) == os.path.normpath(bpy.data.filepath):
-			self.report({'ERROR'}, "Destination file have to be different than source file")
-			return {'CANCELLED'}
+		for _, job_filepath in jobs:
+			if os.path.normpath(job_filepath) == os.path.normpath(bpy.data.filepath):
+				self.report({'ERROR'}, "Destination file have to be different than source file")
+				return {'CANCELLED'}
+
+		self.timer = PhaseTimer('export_as_blend', self.get_report_file(jobs[0][1]))
+		if self.timer.enabled and path.exists(self.timer.report_file):
+			os.remove(self.timer.report_file)
+		self.timer.count('jobs', len(jobs))
+		self.timer.count('selected_objects', sum(len(object_names) for object_names, _ in jobs))
+
+		# Every job of a batch runs in the same background Blender
+		self.use_worker = self.use_background_worker or len(jobs) > 1
+
+		in_process = False
+		if self.engine == 'IN_PROCESS':
+			if self.in_process_export_supported:
+				in_process = True
+			else:
+				self.report({'INFO'}, 'Export As Blend : In Process engine only supports overriding a clean file with appended objects and no packed data, using Background Blender engine')
 
 		# Save to a temp folder if current file is dirty. Otherwise some objects will not be visible from the target file.
-		if bpy.data.is_dirty:
-			self.tmpdir, self.current_file = self.save_copy_as_temp_file(path.basename(filepath))
-			saved_to_temp_folder = True
-		else:
-			self.current_file = bpy.data.filepath
-			saved_to_temp_folder = False
-
-		# Force override if the destination path doesn't exist ( Can't append/link to file that doesn't exists)
-		if not path.exists(filepath):
-			self.file_override == 'OVERRIDE'
-		# If destination path exists and append/link has been set
-		elif self.file_override == 'APPEND_LINK' and self.export_mode == 'APPEND':
-			# get name collisions
-			self.name_collisions = self.get_name_collisions_from_file(filepath, [o for o in self.selected_objects])
-
-			# if any name collision found
-			if len(self.name_collisions.keys()):
-				# Save temporary file if necessary to keep current file untoutched
-				if os.path.normpath(self.current_file) == os.path.normpath(bpy.data.filepath):
+		saved_to_temp_folder = False
+		self.current_file = bpy.data.filepath
+		if bpy.data.is_dirty and not in_process:
+			with self.timer.phase('temp_save'):
+				if self.source == 'OBJECTS' and self.snapshot_mode == 'PARTIAL':
+					objects = {n for object_names, _ in jobs for n in object_names}
+					self.tmpdir, self.current_file = self.save_partial_copy_as_temp_file(path.basename(filepath), context, [bpy.data.objects[n] for n in objects])
+				else:
 					self.tmpdir, self.current_file = self.save_copy_as_temp_file(path.basename(filepath))
-					saved_to_temp_folder = True
-				
-				# rename objects collision in temporary file
-				rename_parameneters = [	'--original_names', *self.name_collisions.keys(),
-										'--new_names', *self.name_collisions.values(),
-										'--print_debug', str(self.print_debug)]
-				subprocess.check_call([bpy.app.binary_path,
-									'--background',
-									self.current_file,
-									'--factory-startup',
-									'--python', path.join(path.dirname(path.realpath(__file__)), 'rename_objects.py'), '--'] + rename_parameneters)
-
-		# fix selected_objects name if name collision found
-		for i,n in enumerate(self.selected_objects):
-			if n in self.name_collisions.keys():
-				self.selected_objects[i] = self.name_collisions[n]
-
-		import_parameters = [	'--source_file', self.current_file,
-								'--destination_file', filepath,
-								'--source_data', self.source,
-								'--file_override', self.file_override,
-								'--target_scene', self.target_scene,
-								'--export_mode', self.export_mode,
-								'--export_to_clean_file', str(self.export_to_clean_file),
-								'--pack_external_data', str(self.pack_external_data),
-								'--source_scene_name', context.scene.name,
-								'--source_object_list', *self.selected_objects,
-					   	 		'--export_object_children', str(self.export_object_children),
-								'--create_collection_hierarchy', str(self.create_collection_hierarchy),
-								'--export_in_new_collection', str(self.export_in_new_collection),
-								'--new_collection_name', self.new_collection_name,
-								'--dependencies_in_dedicated_collection', str(self.dependencies_in_dedicated_collection),
-								'--print_debug', str(self.print_debug)
-							]
-
-		if len(self.name_collisions.keys()):
-			import_parameters += [	'--imported_names', *self.name_collisions.values(),
-									'--new_names', *self.name_collisions.keys()]
+			saved_to_temp_folder = True
 
-		if self.file_override == 'OVERRIDE':
-			subprocess.check_call([bpy.app.binary_path,
-						'--background',
-						'--factory-startup',
-						'--python', path.join(path.dirname(path.realpath(__file__)), 'import_command.py'), '--'] + import_parameters)
-		elif self.file_override == 'APPEND_LINK':
-			subprocess.check_call([bpy.app.binary_path,
-						'--background',
-						filepath,
-						'--factory-startup',
-						'--python', path.join(path.dirname(path.realpath(__file__)), 'import_command.py'), '--'] + import_parameters)
+		# The source is analysed once for every job of a batch
+		self.source_layout = None
+		self.used_ids = None
+		self.object_fingerprints = None
+		if self.source == 'OBJECTS' and not in_process:
+			with self.timer.phase('source_layout'):
+				objects = {n for object_names, _ in jobs for n in object_names}
+				self.source_layout = Snapshot(context.scene, [bpy.data.objects[n] for n in objects], self.print_debug).source_layout(bpy.data.collections)
+
+		for object_names, job_filepath in jobs:
+			start = time.perf_counter()
+			exported = self.export_job(context, object_names, job_filepath, in_process)
+			batch_summary.append({	'filepath': job_filepath,
+									'objects': len(object_names),
+									'status': 'FINISHED' if exported else 'CANCELLED',
+									'duration': time.perf_counter() - start})
 
 		#   Not Working Yet
 		# if self.relink_as_library:
@@ -350,13 +485,167 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 		# 			for cc in c:
 		# 				bpy.data.collections[cc].objects.link(bpy.data.objects[o.name])
 
-		if self.open_exported_blend:
-			subprocess.Popen([bpy.app.binary_path, filepath])
-
 		if saved_to_temp_folder:
 			U.delete_folder_if_exist(self.tmpdir)
 
-		return {'FINISHED'}
+		exported_count = len([j for j in batch_summary if j['status'] == 'FINISHED'])
+		self.timer.count('exported_files', exported_count)
+		self.timer.write()
+
+		if len(batch_summary) > 1:
+			for j in batch_summary:
+				print(f'Export As Blend : {j["status"]} : "{j["filepath"]}" : {j["objects"]} objects in {j["duration"]:.2f}s')
+			self.report({'INFO'} if exported_count == len(batch_summary) else {'WARNING'}, f'Export As Blend : {exported_count} of {len(batch_summary)} files exported, see console for details')
+		elif self.open_exported_blend and exported_count:
+			subprocess.Popen([bpy.app.binary_path, jobs[0][1]])
+
+		return {'FINISHED'} if exported_count else {'CANCELLED'}
+
+	def get_jobs(self, context, filepath):
+		"""Return the (object names, destination filepath) of each file to export"""
+		if len(self.batch_jobs):
+			return [([o.name for o in j.objects], get_blend_filepath(bpy.path.abspath(j.filepath))) for j in self.batch_jobs]
+
+		selected_objects = [o.name for o in context.selected_objects]
+		if self.source != 'OBJECTS' or self.batch_mode == 'NONE':
+			return [(selected_objects, filepath)]
+
+		directory = path.dirname(filepath)
+		if self.batch_mode == 'OBJECTS':
+			return list(zip([[n] for n in selected_objects], get_batch_filepaths(directory, selected_objects)))
+
+		# One file per top level collection holding selected objects
+		selected_objects = set(selected_objects)
+		jobs = []
+		for c in context.scene.collection.children:
+			object_names = [o.name for o in c.all_objects]
+			if not len(selected_objects.intersection(object_names)):
+				continue
+			jobs.append((c.name, object_names))
+		return list(zip([object_names for _, object_names in jobs], get_batch_filepaths(directory, [n for n, _ in jobs])))
+
+	def export_job(self, context, object_names, filepath, in_process=False):
+		self.selected_objects = object_names
+		self.name_collisions = {}
+
+		if in_process:
+			with self.timer.phase('export_in_process'):
+				self.export_in_process(context, filepath, [bpy.data.objects[n] for n in object_names])
+				if self.use_name_index:
+					try:
+						NameIndex(filepath).rebuild()
+					except BlendFileError as e:
+						print(e)
+						self.report({'WARNING'}, f'Export As Blend : Cannot write the name index of "{filepath}", see console for details')
+			return True
+
+		# Force override if the destination path doesn't exist ( Can't append/link to file that doesn't exists)
+		if not path.exists(filepath):
+			self.file_override == 'OVERRIDE'
+		# If destination path exists and append/link has been set
+		elif self.file_override == 'APPEND_LINK' and self.export_mode == 'APPEND':
+			# get name collisions
+			with self.timer.phase('collision_scan'):
+				self.name_collisions = self.get_name_collisions_from_file(filepath, self.selected_objects)
+		self.timer.count('name_collisions', sum(len(n) for n in self.name_collisions.values()))
+
+		# Fingerprints of the exported objects and of the objects brought with them, compared to the ones stored in the destination file by the import session
+		fingerprints = {}
+		incremental = self.incremental and self.source == 'OBJECTS' and self.file_override == 'APPEND_LINK' and self.export_mode == 'APPEND' and path.exists(filepath)
+		if incremental:
+			with self.timer.phase('fingerprints'):
+				objects = [bpy.data.objects[n] for n in object_names]
+				exported, dependencies = Snapshot(context.scene, objects, self.print_debug).collect(include_children=self.export_object_children)
+				# Parents are appended with their children, their fingerprint tells if their previous export can be kept
+				related = exported | dependencies
+				# Objects hashed for a job are not hashed again by the next jobs of a batch
+				if self.object_fingerprints is None:
+					self.object_fingerprints = ObjectFingerprints(self.export_object_children, self.print_debug)
+				fingerprints = self.object_fingerprints.fingerprints(related | set(U.get_ancestors(related)))
+
+		# Options are passed through a manifest file, the object and name lists could exceed the command line length limit
+		import_options = {	'source_file': self.current_file,
+							'destination_file': filepath,
+							'source_data': self.source,
+							'file_override': self.file_override,
+							'target_scene': self.target_scene,
+							'export_mode': self.export_mode,
+							'export_to_clean_file': self.export_to_clean_file,
+							'pack_external_data': self.pack_external_data,
+							'source_scene_name': context.scene.name,
+							'source_object_list': self.selected_objects,
+							'export_object_children': self.export_object_children,
+							'create_collection_hierarchy': self.create_collection_hierarchy,
+							'export_in_new_collection': self.export_in_new_collection,
+							'new_collection_name': self.new_collection_name,
+							'dependencies_in_dedicated_collection': self.dependencies_in_dedicated_collection,
+							'rename_map': self.name_collisions,
+							'name_index': self.use_name_index,
+							'incremental': incremental,
+							'fingerprints': fingerprints,
+							# The import session reads the layout of the exported objects instead of linking the source scene to analyse it
+							'source_layout': self.source_layout,
+							'print_debug': self.print_debug,
+							'report_file': self.timer.report_file,
+							'profile': self.profile}
+		manifest = write_manifest(import_options)
+
+		# Includes the Blender startup, compare with the import_command section of the report
+		try:
+			with self.timer.phase('blender_script'):
+				if self.file_override == 'OVERRIDE':
+					imported = self.run_blender_script('import_command', None, ['--manifest', manifest])
+				elif self.file_override == 'APPEND_LINK':
+					imported = self.run_blender_script('import_command', filepath, ['--manifest', manifest])
+		finally:
+			os.remove(manifest)
+
+		return imported
+
+	def get_report_file(self, filepath):
+		if not self.write_report:
+			return None
+		if self.report_file != '':
+			return bpy.path.abspath(self.report_file)
+		return default_report_path(filepath)
+
+	@property
+	def in_process_export_supported(self):
+		return (self.source == 'OBJECTS' and
+				self.file_override == 'OVERRIDE' and
+				self.export_mode == 'APPEND' and
+				self.export_to_clean_file and
+				not self.pack_external_data)
+
+	def export_in_process(self, context, filepath, objects):
+		snapshot = Snapshot(context.scene, objects, self.print_debug)
+		snapshot.write_export(filepath,
+							export_object_children=self.export_object_children,
+							create_collection_hierarchy=self.create_collection_hierarchy,
+							export_in_new_collection=self.export_in_new_collection and self.new_collection_name != '',
+							new_collection_name=self.new_collection_name,
+							dependencies_in_dedicated_collection=self.dependencies_in_dedicated_collection)
+
+	def run_blender_script(self, script_name, blend_file, parameters):
+		if self.use_worker:
+			try:
+				get_worker_pool().run(script_name, blend_file, [script_name, '--'] + parameters)
+			except WorkerError as e:
+				print(e)
+				self.report({'ERROR'}, f'Export As Blend : Background worker failed to run "{script_name}", see console for details')
+				return False
+		else:
+			command = [bpy.app.binary_path, '--background']
+			if blend_file is not None:
+				command.append(blend_file)
+			try:
+				subprocess.check_call(command + ['--factory-startup',
+												'--python', path.join(addon_dir, f'{script_name}.py'), '--'] + parameters)
+			except (subprocess.CalledProcessError, OSError) as e:
+				print(e)
+				self.report({'ERROR'}, f'Export As Blend : Background Blender failed to run "{script_name}", see console for details')
+				return False
+		return True
 
 	def save_copy_as_temp_file(self, file_name):
 		tmpdir = tempfile.mkdtemp()
@@ -367,48 +656,61 @@ class TILA_OP_ExportAsBlend(bpy.types.Operator, bpy_extras.io_utils.ExportHelper
 		
 		return tmpdir, filepath
 
-	def get_name_collisions_from_file(self, filepath, local_names):
-		name_collision = {}
-		# register name collision for objects in local_names
-		with bpy.data.libraries.load(filepath, link=False) as (data_from, _):
-			for name in data_from.objects:
-				if name in local_names:
-					name_collision[name] = f'{name}_{self.uuid}'
-				
-					# register name collision for ojects children
-					if self.export_object_children:
-						children = U.get_object_children(bpy.data.objects[name])
-						for c in children:
-							if c in data_from.objects and c not in name_collision.keys():
-								name_collision[c] = f'{c}_{self.uuid}'
-		
-			# register name collision for objects dependencies
-			name_collision_list = list(name_collision.keys())
-			for name in name_collision_list:
-				obj = bpy.data.objects[name]
-				dependencies = ObjectDependencies(obj, print_message=True)
-				dependencies.dependencies
-				object_dependencies = dependencies.dependency_objects
-				for o in object_dependencies:
-					if o in name_collision.keys() or o not in data_from.objects:
-						continue
-
-					name_collision[o] = f'{o}_{self.uuid}'
-			
-		return name_collision
+	def save_partial_copy_as_temp_file(self, file_name, context, objects):
+		tmpdir = tempfile.mkdtemp()
+		filepath = path.join(
+					tmpdir, file_name)
+		snapshot = Snapshot(context.scene, objects, self.print_debug)
+		snapshot.write_closure(filepath)
+
+		return tmpdir, filepath
+
+	def get_name_collisions_from_file(self, filepath, object_names):
+		"""Return the rename map of the export, {bpy.data collection name: {colliding name: new base name}}.
+		Every local datablock of the export closure is checked against the destination file, read once.
+		Colliding datablocks keep their name as base name, the import session renames them to the next valid name in destination file"""
+		objects = [bpy.data.objects[n] for n in object_names]
+		exported, dependencies = Snapshot(bpy.context.scene, objects, self.print_debug).collect(include_children=self.export_object_children)
+
+		# The users of every ID of the file are read once for all the jobs of a batch
+		if self.used_ids is None:
+			self.used_ids = U.get_used_ids()
+		closure_names = {}
+		for i in U.get_id_closure(exported | dependencies, self.used_ids):
+			closure_names.setdefault(ID_TYPE_CODES.get(i.id_type), set()).add(i.name)
+
+		file_names = get_file_id_names(filepath, self.use_name_index)
+		name_collisions = {}
+		for code, names in closure_names.items():
+			if code is None or code in UNRENAMED_ID_CODES:
+				continue
+			collisions = names.intersection(file_names.get(code, ()))
+			if len(collisions):
+				name_collisions[ID_CODES[code]] = {n: n for n in sorted(collisions)}
+
+		return name_collisions
 	
 
+def export_batch(jobs, **settings):
+	"""Export each job from the current session, a job being a (object names, destination filepath) tuple.
+	settings are the properties of the export operator. Return the summary of each job"""
+	if not len(jobs) or any(f == '' for _, f in jobs):
+		raise ValueError('Export As Blend : every batch job needs a destination filepath')
+	bpy.ops.export_scene.tila_export_as_blend('EXEC_DEFAULT',
+											batch_jobs=[{'filepath': f, 'objects': [{'name': n} for n in names]} for names, f in jobs],
+											**settings)
+	return batch_summary
+
+
 def menu_func_export(self, context):
 	self.layout.operator(TILA_OP_ExportAsBlend.bl_idname,
 						 text="Export as Blend (.blend)")
 
 
-classes = (TILA_OP_ExportAsBlend, TILA_OP_ExportAsBlendSaveCurrentFile)
+classes = (TILA_PG_ExportAsBlendBatchObject, TILA_PG_ExportAsBlendBatchJob, TILA_OP_ExportAsBlend, TILA_OP_ExportAsBlendSaveCurrentFile)
 
 
 def register():
-	bpy.types.WindowManager.eab_target_scene_items = bpy.props.StringProperty(
-		name="Target Scene items", default=target_scene_default_item)
 	bpy.types.WindowManager.eab_filepath = bpy.props.StringProperty(
 			name="Filepath", default='')
 
@@ -420,10 +722,17 @@ def register():
 
 
 def unregister():
+	global worker_pool
+	if worker_pool is not None:
+		worker_pool.shutdown()
+		worker_pool = None
+
+	if bpy.app.timers.is_registered(target_scene_items_timer):
+		bpy.app.timers.unregister(target_scene_items_timer)
+
 	for cls in reversed(classes):
 		bpy.utils.unregister_class(cls)
 
-	del bpy.types.WindowManager.eab_target_scene_items
 	del bpy.types.WindowManager.eab_filepath
 	bpy.types.TOPBAR_MT_file_export.remove(menu_func_export)
 
@@ -0,0 +1,218 @@
+import sys
+import types
+
+SCENE_COLLECTION_NAME = 'Scene Collection'
+
+
+class ID():
+	def __init__(self, name, library=None):
+		self._name = name
+		self.library = library
+		self.properties = {}
+		# Set by the bpy.data collection holding the ID
+		self.id_type = None
+		self.id_collection = None
+
+	def __repr__(self):
+		return f'<{type(self).__name__} "{self.name}">'
+
+	@property
+	def name(self):
+		return self._name
+
+	@name.setter
+	def name(self, name):
+		if self.id_collection is None:
+			self._name = name
+		else:
+			self.id_collection.rename(self, name)
+
+	@property
+	def users(self):
+		"""Objects using the ID as data and collections holding it"""
+		return sum(o.data is self for o in data.objects) + sum(self in c.objects for c in data.collections)
+
+	# Custom properties
+	def __getitem__(self, key):
+		return self.properties[key]
+
+	def __setitem__(self, key, value):
+		self.properties[key] = value
+
+	def keys(self):
+		return self.properties.keys()
+
+	def get(self, key, default=None):
+		return self.properties.get(key, default)
+
+	def user_remap(self, new_id):
+		"""Replace the parent, object data and collection references to this ID by new_id"""
+		for o in data.objects:
+			if o.parent is self:
+				o.parent = new_id
+			if o.data is self:
+				o.data = new_id
+		for c in data.collections:
+			if self in c.objects:
+				c.objects.unlink(self)
+				if new_id not in c.objects:
+					c.objects.link(new_id)
+
+
+class Object(ID):
+	def __init__(self, name, parent=None, library=None):
+		super(Object, self).__init__(name, library)
+		self.parent = parent
+		self.data = None
+		self.users_collection = []
+		self.modifiers = []
+		self.constraints = []
+
+	@property
+	def children(self):
+		return tuple(o for o in data.objects if o.parent is self)
+
+
+class Collection(ID):
+	def __init__(self, name, library=None):
+		super(Collection, self).__init__(name, library)
+		self.children = CollectionChildren()
+		self.objects = CollectionObjects(self)
+
+
+class Scene(ID):
+	def __init__(self, name, library=None):
+		super(Scene, self).__init__(name, library)
+		self.collection = Collection(SCENE_COLLECTION_NAME)
+
+
+class bpy_prop_collection(list):
+	"""List of IDs that can be indexed and searched by name, like the bpy.data collections"""
+	def __getitem__(self, key):
+		if isinstance(key, str):
+			for e in self:
+				if e.name == key:
+					return e
+			raise KeyError(key)
+		return super(bpy_prop_collection, self).__getitem__(key)
+
+	def __contains__(self, key):
+		if isinstance(key, str):
+			return any(e.name == key for e in self)
+		return super(bpy_prop_collection, self).__contains__(key)
+
+	def get(self, key, default=None):
+		return self[key] if key in self else default
+
+
+class CollectionChildren(bpy_prop_collection):
+	def link(self, collection):
+		self.append(collection)
+
+	def unlink(self, collection):
+		self.remove(collection)
+
+
+class CollectionObjects(bpy_prop_collection):
+	def __init__(self, collection):
+		super(CollectionObjects, self).__init__()
+		self.collection = collection
+
+	def link(self, obj):
+		self.append(obj)
+		obj.users_collection.append(self.collection)
+
+	def unlink(self, obj):
+		self.remove(obj)
+		obj.users_collection.remove(self.collection)
+
+
+class BlendDataIDs(bpy_prop_collection):
+	"""bpy.data collection indexed by name, new and renamed IDs get a unique name the way Blender does"""
+	def __init__(self, id_class, id_type):
+		super(BlendDataIDs, self).__init__()
+		self.id_class = id_class
+		self.id_type = id_type
+		self.names = {}
+		self.next_numbers = {}
+
+	def unique_name(self, name):
+		base_name = name
+		count = self.next_numbers.get(base_name, 1)
+		while name in self.names.keys():
+			name = '%s.%03d' % (base_name, count)
+			count += 1
+		self.next_numbers[base_name] = count
+		return name
+
+	def new(self, name, *args):
+		e = self.id_class(self.unique_name(name), *args)
+		e.id_type = self.id_type
+		e.id_collection = self
+		self.append(e)
+		self.names[e.name] = e
+		return e
+
+	def rename(self, e, name):
+		if name == e.name:
+			return
+		del self.names[e.name]
+		e._name = self.unique_name(name)
+		self.names[e.name] = e
+
+	def remove(self, e):
+		super(BlendDataIDs, self).remove(e)
+		del self.names[e.name]
+		e.id_collection = None
+
+	def __getitem__(self, key):
+		if isinstance(key, str):
+			return self.names[key]
+		return super(BlendDataIDs, self).__getitem__(key)
+
+	def __contains__(self, key):
+		if isinstance(key, str):
+			return key in self.names.keys()
+		return super(BlendDataIDs, self).__contains__(key)
+
+
+class BlendData():
+	def __init__(self):
+		self.objects = BlendDataIDs(Object, 'OBJECT')
+		self.collections = BlendDataIDs(Collection, 'COLLECTION')
+		self.scenes = BlendDataIDs(Scene, 'SCENE')
+		self.meshes = BlendDataIDs(ID, 'MESH')
+		self.materials = BlendDataIDs(ID, 'MATERIAL')
+		self.node_groups = BlendDataIDs(ID, 'NODETREE')
+		self.images = BlendDataIDs(ID, 'IMAGE')
+		self.libraries = BlendDataIDs(ID, 'LIBRARY')
+		self.filepath = ''
+		self.is_dirty = False
+
+
+data = BlendData()
+context = types.SimpleNamespace(scene=None)
+
+
+def reset():
+	"""Empty bpy.data, leaving a single scene"""
+	global data
+	data = BlendData()
+	context.scene = data.scenes.new('Scene')
+	module = sys.modules.get('bpy')
+	if module is not None:
+		module.data = data
+
+
+def install():
+	"""Register this stand-in as the bpy module, so eab_utils can be imported outside of Blender"""
+	if 'bpy' in sys.modules.keys():
+		return sys.modules['bpy']
+	module = types.ModuleType('bpy')
+	module.data = data
+	module.context = context
+	module.types = types.SimpleNamespace(ID=ID, Object=Object, Collection=Collection, Scene=Scene, bpy_prop_collection=bpy_prop_collection)
+	module.path = types.SimpleNamespace(abspath=lambda p: p)
+	sys.modules['bpy'] = module
+	reset()
+	return module
@@ -0,0 +1,120 @@
+import bpy
+import sys
+import json
+import random
+import argparse
+
+OBJECT_NAME = 'Object_{:06d}'
+COLLECTION_NAME = 'Collection_{:03d}_{:02d}'
+SCENE_NAME = 'Scene'
+
+
+class SceneGenerator():
+	"""Generate a synthetic source file, and optionally a destination file holding some of the source object names.
+	The object names, the root objects and the colliding names are written to <source_file>.json for the benchmark runner"""
+	def __init__(self, argv):
+		self.parse_argsv(argv[argv.index("--") + 1:])
+		self.random = random.Random(self.seed)
+
+	def parse_argsv(self, argv):
+		parser = argparse.ArgumentParser(description='This command generate a synthetic blend file to benchmark the export.')
+		parser.add_argument('-f', '--source_file', required=True,
+							help='Path of the generated source blend file')
+		parser.add_argument('-d', '--destination_file', default=None,
+							help='Path of the generated destination blend file, only generated if set')
+		parser.add_argument('-n', '--object_count', type=int, default=1000,
+							help='Number of mesh objects')
+		parser.add_argument('-H', '--hierarchy_depth', type=int, default=1,
+							help='Objects are parented in chains of this length, 1 means no parenting')
+		parser.add_argument('-c', '--collection_count', type=int, default=8,
+							help='Number of top level collections')
+		parser.add_argument('-C', '--collection_depth', type=int, default=3,
+							help='Nesting depth of each top level collection')
+		parser.add_argument('-D', '--dependency_fanout', type=int, default=1,
+							help='Number of modifiers referencing another object on each object')
+		parser.add_argument('-r', '--collision_rate', type=float, default=0.0,
+							help='Ratio of the source object names also used in the destination file')
+		parser.add_argument('-s', '--seed', type=int, default=0,
+							help='Random seed')
+		args = parser.parse_args(argv)
+		self.source_file = args.source_file
+		self.destination_file = args.destination_file
+		self.object_count = args.object_count
+		self.hierarchy_depth = max(1, args.hierarchy_depth)
+		self.collection_count = args.collection_count
+		self.collection_depth = args.collection_depth
+		self.dependency_fanout = args.dependency_fanout
+		self.collision_rate = args.collision_rate
+		self.seed = args.seed
+
+	def clean_session(self):
+		bpy.ops.wm.read_factory_settings(use_empty=True)
+		bpy.context.scene.name = SCENE_NAME
+
+	def create_collections(self):
+		leaves = []
+		for i in range(self.collection_count):
+			parent = bpy.context.scene.collection
+			for depth in range(self.collection_depth):
+				coll = bpy.data.collections.new(COLLECTION_NAME.format(i, depth))
+				parent.children.link(coll)
+				parent = coll
+			leaves.append(parent)
+
+		return leaves if len(leaves) else [bpy.context.scene.collection]
+
+	def create_mesh(self, name):
+		mesh = bpy.data.meshes.new(name)
+		mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+		return mesh
+
+	def create_objects(self, names, collections):
+		objects = []
+		for i, name in enumerate(names):
+			obj = bpy.data.objects.new(name, self.create_mesh(name))
+			self.random.choice(collections).objects.link(obj)
+			obj.location = (i % 100, i // 100, 0)
+			if i % self.hierarchy_depth:
+				obj.parent = objects[i - 1]
+			objects.append(obj)
+		return objects
+
+	def add_dependencies(self, objects):
+		if len(objects) < 2:
+			return
+		for obj in objects:
+			for i in range(self.dependency_fanout):
+				target = self.random.choice(objects)
+				if target == obj:
+					continue
+				modifier = obj.modifiers.new(f'Array_{i}', 'ARRAY')
+				modifier.use_relative_offset = False
+				modifier.use_object_offset = True
+				modifier.offset_object = target
+
+	def generate(self):
+		names = [OBJECT_NAME.format(i) for i in range(self.object_count)]
+
+		self.clean_session()
+		objects = self.create_objects(names, self.create_collections())
+		self.add_dependencies(objects)
+		bpy.ops.wm.save_as_mainfile('EXEC_DEFAULT', filepath=self.source_file)
+
+		colliding_names = []
+		if self.destination_file is not None:
+			colliding_names = sorted(self.random.sample(names, int(len(names) * self.collision_rate)))
+			self.clean_session()
+			self.create_objects(colliding_names, [bpy.context.scene.collection])
+			bpy.ops.wm.save_as_mainfile('EXEC_DEFAULT', filepath=self.destination_file)
+
+		description = {	'scene': SCENE_NAME,
+						'objects': names,
+						'roots': [n for i, n in enumerate(names) if not i % self.hierarchy_depth],
+						'colliding_names': colliding_names}
+		with open(self.source_file + '.json', 'w') as f:
+			json.dump(description, f)
+
+
+if __name__ == "__main__":
+	SG = SceneGenerator(sys.argv)
+	SG.generate()
@@ -0,0 +1,208 @@
+import gc
+import os
+import math
+import sys
+import time
+import random
+import argparse
+from types import SimpleNamespace
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.append(BENCHMARK_DIR)
+sys.path.append(ADDON_DIR)
+
+import fake_bpy
+bpy = fake_bpy.install()
+
+from eab_utils.manager import ObjectManager, CollectionManager, unique_name_clean_func
+from eab_utils.element import Object, Collection
+from eab_utils.collection_ancestry import CollectionAncestry
+import eab_utils.utils as U
+from import_command import ImportCommand
+
+DEFAULT_SIZE = 10000
+# Below this size, cache effects and timer noise dominate the growth of the timings
+MINIMUM_SIZE = 10000
+DEFAULT_MAX_EXPONENT = 1.5
+MINIMUM_MEASURE_TIME = 0.2
+# Input sizes of each benchmark, as factors of the smallest size
+SIZE_FACTORS = [1, 2, 4, 8]
+
+
+def growth_exponent(sizes, durations):
+	"""Slope of the least squares line through the log(size), log(duration) points, less sensitive to the noise of a single measure than the slope between the smallest and the largest input"""
+	xs = [math.log(n) for n in sizes]
+	ys = [math.log(max(d, 1e-9)) for d in durations]
+	x_mean = sum(xs) / len(xs)
+	y_mean = sum(ys) / len(ys)
+	return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
+
+
+def random_forest(count, rng, root_ratio=0.1):
+	"""Create count objects in bpy.data, each parented to a random previous object or to nothing"""
+	objects = []
+	for i in range(count):
+		parent = None
+		if len(objects) and rng.random() > root_ratio:
+			parent = rng.choice(objects)
+		objects.append(bpy.data.objects.new(f'Object_{i:06d}', parent))
+	return objects
+
+
+def random_collection_tree(count, rng):
+	"""Create count collections in bpy.data, each linked to the scene collection or to a random previous collection"""
+	parents = [bpy.context.scene.collection]
+	for i in range(count):
+		coll = bpy.data.collections.new(f'Collection_{i:06d}')
+		rng.choice(parents).children.link(coll)
+		parents.append(coll)
+	return parents[1:]
+
+
+class Microbenchmarks():
+	"""Time the pure Python logic of the export against a stand-in bpy, and check how it scales.
+	The growth exponent is fitted over the input sizes : 1 is linear, 2 is quadratic, where doubling the input quadruples the time"""
+	def __init__(self, argv):
+		self.parse_argsv(argv)
+		self.rng = random.Random(self.seed)
+		self.benchmarks = {	'unique_name': self.setup_unique_name,
+							'get_element_by_incoming_name': self.setup_get_element_by_incoming_name,
+							'parent_lookup': self.setup_parent_lookup,
+							'get_parent_collection_names': self.setup_get_parent_collection_names,
+							'reorder_list_child_first': self.setup_reorder_list_child_first}
+
+	def parse_argsv(self, argv):
+		parser = argparse.ArgumentParser(description='This command benchmark the export logic with plain CPython, without Blender.')
+		parser.add_argument('-n', '--size', type=int, default=DEFAULT_SIZE,
+							help='Smallest input size, each benchmark also runs with 2, 4 and 8 times this size')
+		parser.add_argument('-R', '--repeat', type=int, default=5,
+							help='Number of runs of each benchmark, the fastest one is kept')
+		parser.add_argument('-e', '--max_exponent', type=float, default=DEFAULT_MAX_EXPONENT,
+							help='Maximum growth exponent allowed, time being proportional to size ** exponent')
+		parser.add_argument('-b', '--benchmarks', nargs='+', default=None,
+							help='Benchmarks to run, all of them by default')
+		parser.add_argument('-c', '--check_size', type=int, default=100000,
+							help='Number of objects of the random forests the children first ordering is checked on')
+		parser.add_argument('-s', '--seed', type=int, default=0)
+		args = parser.parse_args(argv)
+		if args.size < MINIMUM_SIZE:
+			parser.error(f'size has to be at least {MINIMUM_SIZE}, the growth exponent of smaller inputs is not reliable')
+		self.size = args.size
+		self.repeat = args.repeat
+		self.max_exponent = args.max_exponent
+		self.selected_benchmarks = args.benchmarks
+		self.check_size = args.check_size
+		self.seed = args.seed
+
+	# Each setup method fills bpy.data and returns the function to time, it must give the same result each time it is called
+	def setup_unique_name(self, n):
+		for i in range(n):
+			bpy.data.objects.new('Cube')
+
+		def run():
+			om = ObjectManager(bpy.data.objects, Object)
+			for i in range(n):
+				om.unique_name(f'new_{i}', 'Cube', om.element_correspondance, clean_func=unique_name_clean_func)
+		return run
+
+	def setup_get_element_by_incoming_name(self, n):
+		cm = CollectionManager(bpy.data.collections, Collection)
+		names = [f'Collection_{i:06d}' for i in range(n)]
+		for name in names:
+			cm.add_element(name, register=True)
+
+		def run():
+			for name in names:
+				cm.get_element_by_incoming_name(name)
+		return run
+
+	def setup_parent_lookup(self, n):
+		collections = random_collection_tree(n, self.rng)
+
+		def run():
+			CollectionAncestry(bpy.context.scene.collection, collections).parent_lookup()
+		return run
+
+	def setup_get_parent_collection_names(self, n):
+		collections = random_collection_tree(n, self.rng)
+		command = SimpleNamespace(collection_ancestry=CollectionAncestry(bpy.context.scene.collection, collections))
+
+		def run():
+			command.collection_ancestry.root_paths = {}
+			for c in collections:
+				ImportCommand.get_parent_collection_names(command, c.name, [])
+		return run
+
+	def setup_reorder_list_child_first(self, n):
+		objects = random_forest(n, self.rng)
+		selection = self.rng.sample(objects, n // 2)
+
+		def run():
+			ImportCommand.reorder_list_child_first(None, selection, include_parent=True)
+		return run
+
+	def measure(self, setup, n):
+		best = None
+		for r in range(self.repeat):
+			fake_bpy.reset()
+			run = setup(n)
+			# Like timeit, keep the garbage collector from running during the measure
+			gc.collect()
+			gc.disable()
+			try:
+				# Like timeit autorange, short functions are called several times
+				calls = 0
+				start = time.perf_counter()
+				while time.perf_counter() - start < MINIMUM_MEASURE_TIME:
+					run()
+					calls += 1
+				duration = (time.perf_counter() - start) / calls
+			finally:
+				gc.enable()
+			best = duration if best is None else min(best, duration)
+		return best
+
+	def check_order_children_first(self):
+		"""Every object comes before its parent, and each object is listed once"""
+		fake_bpy.reset()
+		objects = random_forest(self.check_size, self.rng)
+		selection = self.rng.sample(objects, len(objects) // 10)
+
+		for object_list, include_parent in ((objects, False), (selection, True)):
+			ordered = U.order_children_first(object_list, include_parent=include_parent)
+			positions = {o: i for i, o in enumerate(ordered)}
+			assert len(positions) == len(ordered), 'An object is listed several times'
+			assert set(object_list) <= positions.keys(), 'An object is missing'
+			for o in ordered:
+				if o.parent is None:
+					continue
+				if include_parent:
+					assert o.parent in positions.keys(), f'Parent of {o} is missing'
+				if o.parent in positions.keys():
+					assert positions[o] < positions[o.parent], f'{o} is listed after its parent'
+
+		print(f'order_children_first : ordering checked on {self.check_size} objects')
+
+	def run(self):
+		self.check_order_children_first()
+
+		failures = []
+		sizes = [self.size * f for f in SIZE_FACTORS]
+		for name, setup in self.benchmarks.items():
+			if self.selected_benchmarks is not None and name not in self.selected_benchmarks:
+				continue
+			durations = [self.measure(setup, n) for n in sizes]
+			exponent = growth_exponent(sizes, durations)
+			print(f'{name} : ' + ', '.join(f'{n} -> {d * 1000:.1f}ms' for n, d in zip(sizes, durations)) + f' | exponent : {exponent:.2f}')
+			if exponent > self.max_exponent:
+				failures.append(name)
+
+		if len(failures):
+			print(f'Growth exponent above {self.max_exponent} : {", ".join(failures)}')
+			sys.exit(1)
+
+
+if __name__ == "__main__":
+	MB = Microbenchmarks(sys.argv[1:])
+	MB.run()
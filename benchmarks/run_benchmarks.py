@@ -0,0 +1,173 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import itertools
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.append(ADDON_DIR)
+
+from eab_utils.manifest import write_manifest
+
+FILE_OVERRIDES = ['OVERRIDE', 'APPEND_LINK']
+EXPORT_MODES = ['APPEND', 'LINK']
+
+
+class BenchmarkRunner():
+	"""Generate synthetic source files and run import_command.py end to end on them, in every file override and export mode.
+	Wall time, peak RSS, output size and the phase report of each run are written to a json result file"""
+	def __init__(self, argv):
+		self.parse_argsv(argv)
+
+	def parse_argsv(self, argv):
+		parser = argparse.ArgumentParser(description='This command benchmark the export of synthetic scenes with a background Blender.')
+		parser.add_argument('-b', '--blender', required=True,
+							help='Path to the Blender executable')
+		parser.add_argument('-o', '--output', default='benchmark_results.json',
+							help='Path of the json result file')
+		parser.add_argument('-l', '--label', default='',
+							help='Label stored in the results, to compare runs between versions')
+		parser.add_argument('-n', '--object_counts', type=int, nargs='+', default=[100, 1000, 10000],
+							help='Number of objects of each generated source file')
+		parser.add_argument('-H', '--hierarchy_depth', type=int, default=1)
+		parser.add_argument('-c', '--collection_count', type=int, default=8)
+		parser.add_argument('-C', '--collection_depth', type=int, default=3)
+		parser.add_argument('-D', '--dependency_fanout', type=int, default=1)
+		parser.add_argument('-r', '--collision_rate', type=float, default=0.1)
+		parser.add_argument('-R', '--repeat', type=int, default=1,
+							help='Number of runs of each configuration')
+		parser.add_argument('-f', '--file_overrides', nargs='+', choices=FILE_OVERRIDES, default=FILE_OVERRIDES)
+		parser.add_argument('-m', '--export_modes', nargs='+', choices=EXPORT_MODES, default=EXPORT_MODES)
+		parser.add_argument('-k', '--keep_files', action='store_true',
+							help='Keep the generated and exported files')
+		args = parser.parse_args(argv)
+		self.args = args
+
+	@property
+	def scene_parameters(self):
+		return {'hierarchy_depth': self.args.hierarchy_depth,
+				'collection_count': self.args.collection_count,
+				'collection_depth': self.args.collection_depth,
+				'dependency_fanout': self.args.dependency_fanout,
+				'collision_rate': self.args.collision_rate}
+
+	def blender_version(self):
+		output = subprocess.run([self.args.blender, '--version'], capture_output=True, text=True).stdout
+		return output.splitlines()[0] if len(output) else ''
+
+	def run_blender(self, command):
+		"""Run a background Blender, return its wall time and peak RSS in bytes"""
+		start = time.perf_counter()
+		process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+		if hasattr(os, 'wait4'):
+			_, status, rusage = os.wait4(process.pid, 0)
+			process.returncode = os.waitstatus_to_exitcode(status)
+			# ru_maxrss is in KiB on Linux and in bytes on macOS
+			peak_rss = rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+		else:
+			process.wait()
+			peak_rss = None
+		wall_time = time.perf_counter() - start
+
+		if process.returncode:
+			raise subprocess.CalledProcessError(process.returncode, command)
+		return wall_time, peak_rss
+
+	def generate(self, directory, object_count):
+		source_file = os.path.join(directory, f'source_{object_count}.blend')
+		destination_file = os.path.join(directory, f'destination_{object_count}.blend')
+		parameters = [	'--source_file', source_file,
+						'--destination_file', destination_file,
+						'--object_count', str(object_count)]
+		for k, v in self.scene_parameters.items():
+			parameters += [f'--{k}', str(v)]
+
+		self.run_blender([self.args.blender, '--background', '--factory-startup',
+						'--python', os.path.join(BENCHMARK_DIR, 'generate_scene.py'), '--'] + parameters)
+
+		with open(source_file + '.json', 'r') as f:
+			description = json.load(f)
+		return source_file, destination_file, description
+
+	def export(self, directory, source_file, destination_template, description, file_override, export_mode):
+		destination_file = os.path.join(directory, f'export_{file_override}_{export_mode}.blend')
+		report_file = destination_file + '.json'
+		for f in (destination_file, report_file):
+			if os.path.exists(f):
+				os.remove(f)
+
+		command = [self.args.blender, '--background']
+		if file_override == 'APPEND_LINK':
+			shutil.copyfile(destination_template, destination_file)
+			command.append(destination_file)
+
+		options = {	'source_file': source_file,
+					'destination_file': destination_file,
+					'source_data': 'OBJECTS',
+					'file_override': file_override,
+					'export_mode': export_mode,
+					'export_to_clean_file': True,
+					'pack_external_data': False,
+					'source_scene_name': description['scene'],
+					'source_object_list': description['roots'],
+					'export_object_children': True,
+					'create_collection_hierarchy': True,
+					'export_in_new_collection': False,
+					'new_collection_name': 'Root Collection',
+					'dependencies_in_dedicated_collection': False,
+					'report_file': report_file}
+		if file_override == 'APPEND_LINK' and export_mode == 'APPEND':
+			options['name_correspondance'] = {n: n for n in description['colliding_names']}
+		manifest = write_manifest(options, os.path.join(directory, 'manifest.json'))
+
+		wall_time, peak_rss = self.run_blender(command + ['--factory-startup',
+							'--python', os.path.join(ADDON_DIR, 'import_command.py'), '--', '--manifest', manifest])
+
+		with open(report_file, 'r') as f:
+			report = json.load(f)
+
+		return {'wall_time': wall_time,
+				'peak_rss': peak_rss,
+				'output_size': os.path.getsize(destination_file),
+				'report': report}
+
+	def run(self):
+		results = {	'label': self.args.label,
+					'blender_version': self.blender_version(),
+					'scene_parameters': self.scene_parameters,
+					'runs': []}
+
+		directory = tempfile.mkdtemp(prefix='eab_benchmark_')
+		try:
+			for object_count in self.args.object_counts:
+				print(f'Generating {object_count} objects')
+				source_file, destination_template, description = self.generate(directory, object_count)
+
+				for file_override, export_mode in itertools.product(self.args.file_overrides, self.args.export_modes):
+					for i in range(self.args.repeat):
+						result = self.export(directory, source_file, destination_template, description, file_override, export_mode)
+						print(f'{object_count} objects, {file_override} {export_mode} : {result["wall_time"]:.2f}s')
+						results['runs'].append(dict(object_count=object_count,
+													file_override=file_override,
+													export_mode=export_mode,
+													repetition=i,
+													**result))
+		finally:
+			if self.args.keep_files:
+				print(f'Benchmark files kept in "{directory}"')
+			else:
+				shutil.rmtree(directory, ignore_errors=True)
+
+		with open(self.args.output, 'w') as f:
+			json.dump(results, f, indent=4)
+		print(f'Results written to "{self.args.output}"')
+
+
+if __name__ == "__main__":
+	BR = BenchmarkRunner(sys.argv[1:])
+	BR.run()
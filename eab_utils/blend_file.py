@@ -0,0 +1,334 @@
+import os
+import re
+import zlib
+import gzip
+import mmap
+import struct
+
+# zstd is in the standard library from Python 3.14, Blender also bundles the zstandard module
+try:
+	from compression import zstd
+except ImportError:
+	zstd = None
+try:
+	import zstandard
+except ImportError:
+	zstandard = None
+
+# Errors of a truncated or malformed file, reported as a BlendFileError
+DECODE_ERRORS = (OSError, EOFError, ValueError, IndexError, KeyError, struct.error, zlib.error)
+if zstd is not None:
+	DECODE_ERRORS += (zstd.ZstdError,)
+if zstandard is not None:
+	DECODE_ERRORS += (zstandard.ZstdError,)
+
+BLEND_MAGIC = b'BLENDER'
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+ENDB = b'ENDB'
+DNA1 = b'DNA1'
+LIBRARY = b'LI\0\0'
+# Linked datablocks are written as placeholders after their library, the first two characters of their name being their ID code
+ID_LINK_PLACEHOLDER = b'ID\0\0'
+# Bytes kept from the start of each datablock, enough to hold the ID struct
+ID_PREFIX_SIZE = 1024
+SKIP_CHUNK_SIZE = 1 << 20
+
+# ID code -> name of the bpy.data collection
+ID_CODES = {'AC': 'actions',
+			'AR': 'armatures',
+			'BR': 'brushes',
+			'CA': 'cameras',
+			'CF': 'cache_files',
+			'CU': 'curves',
+			'CV': 'hair_curves',
+			'GD': 'grease_pencils',
+			'GR': 'collections',
+			'IM': 'images',
+			'KE': 'shape_keys',
+			'LA': 'lights',
+			'LI': 'libraries',
+			'LP': 'lightprobes',
+			'LS': 'linestyles',
+			'LT': 'lattices',
+			'MA': 'materials',
+			'MB': 'metaballs',
+			'MC': 'movieclips',
+			'ME': 'meshes',
+			'MS': 'masks',
+			'NT': 'node_groups',
+			'OB': 'objects',
+			'PA': 'particles',
+			'PC': 'paint_curves',
+			'PL': 'palettes',
+			'PT': 'pointclouds',
+			'SC': 'scenes',
+			'SK': 'speakers',
+			'SO': 'sounds',
+			'TE': 'textures',
+			'TX': 'texts',
+			'VF': 'fonts',
+			'VO': 'volumes',
+			'WO': 'worlds',
+			'WS': 'workspaces'}
+
+# ID.id_type -> ID code
+ID_TYPE_CODES = {	'ACTION': 'AC',
+					'ARMATURE': 'AR',
+					'BRUSH': 'BR',
+					'CACHEFILE': 'CF',
+					'CAMERA': 'CA',
+					'COLLECTION': 'GR',
+					'CURVE': 'CU',
+					'CURVES': 'CV',
+					'FONT': 'VF',
+					'GREASEPENCIL': 'GD',
+					'IMAGE': 'IM',
+					'KEY': 'KE',
+					'LATTICE': 'LT',
+					'LIBRARY': 'LI',
+					'LIGHT': 'LA',
+					'LIGHT_PROBE': 'LP',
+					'LINESTYLE': 'LS',
+					'MASK': 'MS',
+					'MATERIAL': 'MA',
+					'MESH': 'ME',
+					'META': 'MB',
+					'MOVIECLIP': 'MC',
+					'NODETREE': 'NT',
+					'OBJECT': 'OB',
+					'PAINTCURVE': 'PC',
+					'PALETTE': 'PL',
+					'PARTICLE': 'PA',
+					'POINTCLOUD': 'PT',
+					'SCENE': 'SC',
+					'SOUND': 'SO',
+					'SPEAKER': 'SK',
+					'TEXT': 'TX',
+					'TEXTURE': 'TE',
+					'VOLUME': 'VO',
+					'WORKSPACE': 'WS',
+					'WORLD': 'WO'}
+# Not renamed on collision : collections are merged by name into the destination hierarchy, scenes, libraries and workspaces are not appended, and Blender names every shape key "Key"
+UNRENAMED_ID_CODES = {'GR', 'SC', 'LI', 'WS', 'KE'}
+
+
+class BlendFileError(Exception):
+	pass
+
+
+class SDNA():
+	"""Struct layouts written in the DNA1 block of a blend file, giving the offset of the struct fields in this file"""
+	def __init__(self, data, endian, pointer_size):
+		self.endian = endian
+		self.pointer_size = pointer_size
+		# struct name -> {field name: (offset, size)}
+		self.structs = {}
+		self.parse(data)
+
+	def parse(self, data):
+		if data[:4] != b'SDNA':
+			raise BlendFileError('Invalid DNA1 block')
+		offset = 4
+		names, offset = self.read_strings(data, offset, b'NAME')
+		types, offset = self.read_strings(data, offset, b'TYPE')
+
+		offset = self.expect(data, offset, b'TLEN')
+		type_lengths = struct.unpack_from(f'{self.endian}{len(types)}h', data, offset)
+		offset = self.align(offset + 2 * len(types))
+
+		offset = self.expect(data, offset, b'STRC')
+		struct_count = struct.unpack_from(f'{self.endian}i', data, offset)[0]
+		offset += 4
+		for i in range(struct_count):
+			type_index, field_count = struct.unpack_from(f'{self.endian}2h', data, offset)
+			offset += 4
+			fields = {}
+			field_offset = 0
+			for f in range(field_count):
+				field_type, field_name = struct.unpack_from(f'{self.endian}2h', data, offset)
+				offset += 4
+				name = names[field_name]
+				size = self.pointer_size if name.startswith('*') or name.startswith('(*') else type_lengths[field_type]
+				for dimension in re.findall(r'\[(\d+)\]', name):
+					size *= int(dimension)
+				fields[re.match(r'[(*]*(\w+)', name).group(1)] = (field_offset, size)
+				field_offset += size
+			self.structs[types[type_index]] = fields
+
+	def read_strings(self, data, offset, identifier):
+		offset = self.expect(data, offset, identifier)
+		count = struct.unpack_from(f'{self.endian}i', data, offset)[0]
+		offset += 4
+		strings = []
+		for i in range(count):
+			end = data.index(b'\0', offset)
+			strings.append(data[offset:end].decode('latin-1'))
+			offset = end + 1
+		return strings, self.align(offset)
+
+	def expect(self, data, offset, identifier):
+		if data[offset:offset + 4] != identifier:
+			raise BlendFileError(f'Invalid DNA1 block, {identifier.decode()} expected')
+		return offset + 4
+
+	def align(self, offset):
+		return (offset + 3) & ~3
+
+	def field(self, struct_name, *field_names):
+		"""Offset and size of the first field found, None if the struct has none of them"""
+		fields = self.structs.get(struct_name, {})
+		for name in field_names:
+			if name in fields.keys():
+				return fields[name]
+		return None
+
+
+class BlendFile():
+	"""ID names of a blend file, read from its block headers without loading the file in Blender.
+	Uncompressed files are memory mapped and only the start of the datablocks is read, compressed files are read through streaming decompression"""
+	def __init__(self, filepath):
+		self.filepath = filepath
+		self.version = None
+		self.pointer_size = 8
+		self.endian = '<'
+		# ID code -> list of (name, library filepath), the library being None for local datablocks
+		self.ids = {}
+		# library filepaths, in file order
+		self.libraries = []
+		self.read()
+
+	def read(self):
+		try:
+			self.read_file()
+		except BlendFileError:
+			raise
+		except DECODE_ERRORS as e:
+			raise BlendFileError(f'Cannot read "{self.filepath}" : {e}') from e
+
+	def read_file(self):
+		with open(self.filepath, 'rb') as f:
+			magic = f.read(4)
+			f.seek(0)
+			if magic[:2] == GZIP_MAGIC:
+				with gzip.GzipFile(fileobj=f) as stream:
+					self.read_blocks(stream, lambda size: self.skip_stream(stream, size))
+			elif magic == ZSTD_MAGIC:
+				with self.open_zstd(f) as stream:
+					self.read_blocks(stream, lambda size: self.skip_stream(stream, size))
+			else:
+				if os.fstat(f.fileno()).st_size == 0:
+					raise BlendFileError(f'"{self.filepath}" is empty')
+				with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as stream:
+					self.read_blocks(stream, lambda size: stream.seek(size, os.SEEK_CUR))
+
+	def open_zstd(self, f):
+		if zstd is not None:
+			return zstd.ZstdFile(f)
+		if zstandard is not None:
+			# Blender writes one zstd frame per chunk of the file
+			return zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True, closefd=False)
+		raise BlendFileError(f'"{self.filepath}" is zstd compressed, and no zstd module is available')
+
+	def skip_stream(self, stream, size):
+		while size > 0:
+			chunk = stream.read(min(size, SKIP_CHUNK_SIZE))
+			if not len(chunk):
+				raise BlendFileError(f'Unexpected end of "{self.filepath}"')
+			size -= len(chunk)
+
+	def read_header(self, stream):
+		"""Read the file header, return the struct of the block headers and whether it is the large block header of Blender 5"""
+		header = stream.read(12)
+		if header[:7] != BLEND_MAGIC:
+			raise BlendFileError(f'"{self.filepath}" is not a blend file')
+
+		# Legacy header : BLENDER, pointer size, endianness, version
+		if header[7:8] in (b'_', b'-'):
+			self.pointer_size = 4 if header[7:8] == b'_' else 8
+			self.endian = '<' if header[8:9] == b'v' else '>'
+			self.version = int(header[9:12])
+			return struct.Struct(f'{self.endian}4si{"I" if self.pointer_size == 4 else "Q"}ii'), False
+
+		# Blender 5 header : BLENDER, header size, -, format version, endianness, version
+		if not header[7:9].isdigit():
+			raise BlendFileError(f'Unknown header in "{self.filepath}"')
+		header += stream.read(int(header[7:9]) - len(header))
+		if int(header[10:12]) != 1:
+			raise BlendFileError(f'Unsupported file format version {int(header[10:12])} in "{self.filepath}"')
+		self.pointer_size = 8
+		self.endian = '<' if header[12:13] == b'v' else '>'
+		self.version = int(header[13:17])
+		return struct.Struct(f'{self.endian}4siQqq'), True
+
+	def read_blocks(self, stream, skip):
+		bhead, large_bhead = self.read_header(stream)
+
+		# The DNA1 block is written at the end of the file, so the start of each datablock is kept until it is read
+		blocks = []
+		dna = None
+		while True:
+			data = stream.read(bhead.size)
+			if len(data) < bhead.size:
+				raise BlendFileError(f'Unexpected end of "{self.filepath}"')
+			if large_bhead:
+				code, _, old, length, _ = bhead.unpack(data)
+			else:
+				code, length, old, _, _ = bhead.unpack(data)
+			if code == ENDB:
+				break
+
+			if code in (DNA1, LIBRARY):
+				keep = length
+			elif code[2:] == b'\0\0':
+				keep = min(length, ID_PREFIX_SIZE)
+			else:
+				keep = 0
+
+			if keep:
+				prefix = stream.read(keep)
+				if code == DNA1:
+					dna = prefix
+				else:
+					blocks.append((code, old, prefix))
+			if length > keep:
+				skip(length - keep)
+
+		if dna is None:
+			raise BlendFileError(f'No DNA1 block in "{self.filepath}"')
+		self.read_ids(blocks, SDNA(dna, self.endian, self.pointer_size))
+
+	def read_ids(self, blocks, sdna):
+		name_field = sdna.field('ID', 'name')
+		lib_field = sdna.field('ID', 'lib')
+		library_field = sdna.field('Library', 'filepath', 'name')
+		if name_field is None or lib_field is None or library_field is None:
+			raise BlendFileError(f'No ID name in the DNA of "{self.filepath}"')
+		pointer = f'{self.endian}{"I" if self.pointer_size == 4 else "Q"}'
+
+		libraries = {}
+		library = None
+		for code, old, prefix in blocks:
+			if code == LIBRARY:
+				library = self.read_string(prefix, library_field)
+				libraries[old] = library
+				self.libraries.append(library)
+				continue
+
+			name = self.read_string(prefix, name_field)
+			library_pointer = struct.unpack_from(pointer, prefix, lib_field[0])[0]
+			if code == ID_LINK_PLACEHOLDER:
+				id_code = name[:2]
+				id_library = libraries.get(library_pointer, library)
+			else:
+				id_code = code[:2].decode('latin-1')
+				id_library = libraries.get(library_pointer) if library_pointer else None
+			self.ids.setdefault(id_code, []).append((name[2:], id_library))
+
+	def read_string(self, data, field):
+		offset, size = field
+		return data[offset:offset + size].split(b'\0', 1)[0].decode('utf-8', errors='replace')
+
+	def id_names(self, id_code, local=True):
+		"""Names of the datablocks of an ID code ('OB', 'SC', 'GR'...), only the local ones by default"""
+		return [name for name, library in self.ids.get(id_code, []) if not local or library is None]
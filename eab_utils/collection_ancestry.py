@@ -0,0 +1,63 @@
+class CollectionAncestry():
+	"""Child -> parents index of collections, built with a single iterative traversal from a root collection.
+	Collections that can't be reached from the root collection are indexed too, so objects outside of the scene still get their hierarchy"""
+	def __init__(self, root_collection, collections=()):
+		self.root_name = root_collection.name
+		self.root_parents = {}
+		self.parents = {}
+		self.root_paths = {}
+
+		visited = set()
+		# Pre-order traversal, parents are registered in the outliner order
+		collections_to_process = [root_collection]
+		while len(collections_to_process):
+			coll = collections_to_process.pop()
+			if coll.name in visited:
+				continue
+			visited.add(coll.name)
+			children = list(coll.children)
+			for c in children:
+				self.root_parents.setdefault(c.name, []).append(coll.name)
+				self.parents.setdefault(c.name, []).append(coll.name)
+			collections_to_process += reversed(children)
+
+		for coll in collections:
+			if coll.name in visited:
+				continue
+			visited.add(coll.name)
+			for c in coll.children:
+				self.parents.setdefault(c.name, []).append(coll.name)
+
+	@classmethod
+	def from_parents(cls, root_name, root_parents, parents):
+		"""Index built from the parent lookups of another index, as written to a manifest"""
+		ancestry = cls.__new__(cls)
+		ancestry.root_name = root_name
+		ancestry.root_parents = root_parents
+		ancestry.parents = parents
+		ancestry.root_paths = {}
+		return ancestry
+
+	def parent_lookup(self):
+		"""Return the parent collection names of each collection under the root collection"""
+		return self.root_parents
+
+	def first_parent(self, name):
+		for p in self.parents.get(name, []):
+			if p != self.root_name:
+				return p
+		return None
+
+	def root_path(self, name):
+		"""Return the collection name followed by the names of its first parent, the first parent of that parent, and so on. The root collection is excluded"""
+		if name not in self.root_paths.keys():
+			path = []
+			path_names = set()
+			n = name
+			while n is not None and n not in path_names:
+				path.append(n)
+				path_names.add(n)
+				n = self.first_parent(n)
+			self.root_paths[name] = path
+
+		return list(self.root_paths[name])
@@ -0,0 +1,146 @@
+import bpy
+from .logger import get_logger
+from .object_dependencies import ObjectDependencies
+
+
+class DependencyGraph():
+	"""Objects needed by other objects to be evaluated correctly : modifier targets and hooks, geometry nodes inputs, constraint targets,
+	driver variables, particle instance objects and curve bevel/taper objects.
+	Each object is analysed once, and the dependencies of a whole selection are resolved in a single worklist pass"""
+	def __init__(self, print_message=False):
+		self.log = get_logger('Dependency Graph', print_message)
+		self.references = {}
+		self.object_dependencies = {}
+
+	def modifier_references(self, obj):
+		dep = ObjectDependencies(obj)
+		dep.dependencies
+		self.object_dependencies[obj] = dep
+		references = list(dep.dependency_ids)
+
+		# Geometry nodes inputs are stored as ID properties of the modifier
+		for m in obj.modifiers:
+			if m.type != 'NODES':
+				continue
+			for k in m.keys():
+				references.append(m[k])
+
+		return references
+
+	def constraint_references(self, obj):
+		references = []
+		for c in obj.constraints:
+			properties = ObjectDependencies.pointer_properties(c)
+			for p in properties.get('Object', []) + properties.get('ID', []):
+				references.append(getattr(c, p))
+			if c.type == 'ARMATURE':
+				references += [t.target for t in c.targets]
+
+		return references
+
+	def driver_references(self, obj):
+		references = []
+		shape_keys = getattr(obj.data, 'shape_keys', None)
+		for id_data in (obj, obj.data, shape_keys):
+			if id_data is None or getattr(id_data, 'animation_data', None) is None:
+				continue
+			for d in id_data.animation_data.drivers:
+				for v in d.driver.variables:
+					references += [t.id for t in v.targets]
+
+		return references
+
+	def particle_references(self, obj):
+		references = []
+		for ps in obj.particle_systems:
+			settings = ps.settings
+			references.append(settings.instance_object)
+			if settings.instance_collection is not None:
+				references += list(settings.instance_collection.all_objects)
+
+		return references
+
+	def curve_references(self, obj):
+		if obj.type not in {'CURVE', 'FONT'} or obj.data is None:
+			return []
+
+		return [obj.data.bevel_object, obj.data.taper_object]
+
+	def object_references(self, obj):
+		"""Return the objects directly referenced by obj"""
+		if obj not in self.references.keys():
+			references = []
+			for r in (	self.modifier_references(obj) +
+						self.constraint_references(obj) +
+						self.driver_references(obj) +
+						self.particle_references(obj) +
+						self.curve_references(obj)):
+				if isinstance(r, bpy.types.Object) and r != obj and r not in references:
+					references.append(r)
+			self.references[obj] = references
+
+		return self.references[obj]
+
+	def closure(self, objects):
+		"""Return the objects the given objects depend on, directly or not, excluding the given objects"""
+		selection = set(objects)
+		dependencies = {}
+		visited = set()
+		objects_to_process = list(objects)
+		while len(objects_to_process):
+			o = objects_to_process.pop()
+			if o in visited:
+				continue
+			visited.add(o)
+			for r in self.object_references(o):
+				if r in selection or r in dependencies.keys():
+					continue
+				self.log.info(lambda: f'"{o.name}" depends on "{r.name}"')
+				dependencies[r] = None
+				objects_to_process.append(r)
+
+		return list(dependencies.keys())
+
+	def components(self, objects):
+		"""Return the objects and the objects they depend on grouped in strongly connected components, objects depending on each other sharing a component.
+		Each component comes after the components it depends on"""
+		# Iterative Tarjan, a component is complete once every object it references has been visited
+		index = {}
+		lowlink = {}
+		stack = []
+		on_stack = set()
+		components = []
+		for root in objects:
+			if root in index.keys():
+				continue
+			index[root] = lowlink[root] = len(index)
+			stack.append(root)
+			on_stack.add(root)
+			objects_to_process = [(root, iter(self.object_references(root)))]
+			while len(objects_to_process):
+				o, references = objects_to_process[-1]
+				for r in references:
+					if r not in index.keys():
+						index[r] = lowlink[r] = len(index)
+						stack.append(r)
+						on_stack.add(r)
+						objects_to_process.append((r, iter(self.object_references(r))))
+						break
+					if r in on_stack:
+						lowlink[o] = min(lowlink[o], index[r])
+				else:
+					objects_to_process.pop()
+					if len(objects_to_process):
+						user = objects_to_process[-1][0]
+						lowlink[user] = min(lowlink[user], lowlink[o])
+					if lowlink[o] == index[o]:
+						component = []
+						while True:
+							r = stack.pop()
+							on_stack.discard(r)
+							component.append(r)
+							if r is o:
+								break
+						components.append(component)
+
+		return components
@@ -1,5 +1,5 @@
 import bpy
-from .logger import Logger
+from .logger import get_logger
 
 class Element:
 	def __init__(self, manager, string):
@@ -17,14 +17,15 @@ class Element:
 
 	@name.setter
 	def name(self, value):
-		print(f'Setting local name from "{self._string["local"]}" to "{value}"')
+		self.manager.log.info(lambda: f'Setting local name from "{self._string["local"]}" to "{value}"')
+		self.manager.update_local_index(self, self._string['local'], value)
 		self._string['local'] = value
 
 
 class Collection(Element):
 	def __init__(self, manager, string, print_message=False):
 		super(Collection, self).__init__(manager, string)
-		self.log = Logger(addon_name='Collection', print=print_message)
+		self.log = get_logger('Collection', print_message)
 
 	@property
 	def children(self):
@@ -39,13 +40,13 @@ class Collection(Element):
 		if self.name == "Scene Collection":
 			return bpy.context.scene.collection
 		elif self.name not in self.manager.bpy_data:
-			self.log.error(f'"{self.name}" collection not in current file')
+			self.log.error(lambda: f'"{self.name}" collection not in current file')
 			try:
 				ex = ValueError()
 				ex.strerror = f'Name "{self.name}" not in Collections'
 				raise ex
 			except ValueError as e:
-				self.log.error(f'Value Error : {e.strerror}')
+				self.log.error(lambda: f'Value Error : {e.strerror}')
 		else:
 			return self.manager.bpy_data[self.name]
 
@@ -53,19 +54,19 @@ class Collection(Element):
 class Object(Element):
 	def __init__(self, manager, obj, print_message=False):
 		super(Object, self).__init__(manager, obj.name)
-		self.log = Logger(addon_name='Object', print=print_message)
+		self.log = get_logger('Object', print_message)
 		self._object = obj
 
 	@property
 	def object(self):
 		if self._object is None or self.name not in self.manager.bpy_data:
-			self.log.error(f'"{self.name}" Object not in current file')
+			self.log.error(lambda: f'"{self.name}" Object not in current file')
 			try:
 				ex = ValueError()
 				ex.strerror = f'object "{self.name}" not in {self.manager.bpy_data}'
 				raise ex
 			except ValueError as e:
-				self.log.error(f'Value Error : {e.strerror}')
+				self.log.error(lambda: f'Value Error : {e.strerror}')
 		elif self._object is not None:
 			return self._object
 
@@ -77,8 +78,11 @@ class Object(Element):
 	@name.setter
 	def name(self, value):
 		self.log.info(
-			f'Setting local name from "{self._string["local"]}" to "{value}"')
+			lambda: f'Setting local name from "{self._string["local"]}" to "{value}"')
+		self.manager.update_local_index(self, self._string['local'], value)
 		self._string['local'] = value
 
 	def fix_local_element_name(self):
+		if self._string['local'] != self._object.name:
+			self.manager.update_local_index(self, self._string['local'], self._object.name)
 		self._string['local'] = self._object.name
@@ -0,0 +1,152 @@
+import bpy
+import array
+import hashlib
+from .logger import get_logger
+from .dependency_graph import DependencyGraph
+from .utils import get_children_map, order_children_first
+
+# Custom properties of the exported objects in the destination file
+FINGERPRINT_PROPERTY = 'eab_fingerprint'
+SOURCE_NAME_PROPERTY = 'eab_source_name'
+
+# Mesh arrays read with foreach_get : collection, attribute, values per element, array typecode
+MESH_ARRAYS = [	('vertices', 'co', 3, 'f'),
+				('edges', 'vertices', 2, 'i'),
+				('loops', 'vertex_index', 1, 'i'),
+				('polygons', 'loop_total', 1, 'i'),
+				('polygons', 'material_index', 1, 'i')]
+# Mesh attribute data type -> attribute of its values, values per element, array typecode
+ATTRIBUTE_VALUES = {'FLOAT': ('value', 1, 'f'),
+					'INT': ('value', 1, 'i'),
+					'FLOAT2': ('vector', 2, 'f'),
+					'INT32_2D': ('value', 2, 'i'),
+					'FLOAT_VECTOR': ('vector', 3, 'f'),
+					'FLOAT_COLOR': ('color', 4, 'f'),
+					'BYTE_COLOR': ('color', 4, 'f')}
+
+
+def flatten(value):
+	"""Plain python value of a property, IDs being replaced by their name"""
+	if isinstance(value, bpy.types.ID):
+		return value.name
+	if isinstance(value, (set, frozenset)):
+		return tuple(sorted(value))
+	if isinstance(value, str) or not hasattr(value, '__len__'):
+		return value
+	if hasattr(value, 'keys'):
+		return tuple((k, flatten(value[k])) for k in value.keys())
+	return tuple(flatten(v) for v in value)
+
+
+def get_rna_values(struct):
+	"""Values of the RNA properties of a struct, nested structs and collections excepted"""
+	values = []
+	for p in struct.bl_rna.properties:
+		if p.identifier == 'rna_type' or p.type == 'COLLECTION':
+			continue
+		value = getattr(struct, p.identifier, None)
+		if p.type == 'POINTER' and not isinstance(value, bpy.types.ID):
+			continue
+		values.append((p.identifier, flatten(value)))
+	return values
+
+
+def read_array(collection, attribute, size, typecode):
+	values = array.array(typecode, [0]) * (len(collection) * size)
+	collection.foreach_get(attribute, values)
+	return values.tobytes()
+
+
+class ObjectFingerprints():
+	"""Hash of what an export writes of each object : transforms, object data, modifiers and constraints settings, material slots and collection membership.
+	The fingerprint of an object also covers the objects it depends on, and its children when they are exported with it,
+	so an unchanged fingerprint means that nothing the object brings to the destination file changed"""
+	def __init__(self, include_children=False, print_message=False):
+		self.log = get_logger('Fingerprints', print_message)
+		self.include_children = include_children
+		self.dependency_graph = DependencyGraph(print_message)
+		self.children_map = get_children_map(bpy.data.objects) if include_children else {}
+		self.local_fingerprints = {}
+
+	def update(self, h, *values):
+		h.update(repr(flatten(values)).encode())
+
+	def update_mesh(self, h, mesh):
+		for collection, attribute, size, typecode in MESH_ARRAYS:
+			h.update(read_array(getattr(mesh, collection), attribute, size, typecode))
+
+		for a in mesh.attributes:
+			# Internal attributes are already read through MESH_ARRAYS
+			if a.name.startswith('.') or a.data_type not in ATTRIBUTE_VALUES.keys():
+				continue
+			attribute, size, typecode = ATTRIBUTE_VALUES[a.data_type]
+			self.update(h, a.name, a.domain, a.data_type)
+			h.update(read_array(a.data, attribute, size, typecode))
+
+		if mesh.shape_keys is not None:
+			for k in mesh.shape_keys.key_blocks:
+				self.update(h, k.name, k.value, k.relative_key.name, k.mute)
+				h.update(read_array(k.data, 'co', 3, 'f'))
+
+		self.update(h, [m.name if m is not None else None for m in mesh.materials])
+
+	def local_fingerprint(self, obj):
+		"""Hash of the object alone"""
+		if obj not in self.local_fingerprints.keys():
+			h = hashlib.blake2b(digest_size=16)
+			self.update(h, obj.type, obj.parent, obj.parent_type, obj.parent_bone, obj.matrix_world, obj.matrix_parent_inverse)
+			self.update(h, sorted(c.name for c in obj.users_collection))
+			self.update(h, [(s.link, s.material) for s in obj.material_slots])
+			for m in obj.modifiers:
+				# Geometry nodes inputs are stored as ID properties of the modifier
+				self.update(h, get_rna_values(m), [(k, m[k]) for k in m.keys()])
+			for c in obj.constraints:
+				self.update(h, get_rna_values(c))
+
+			if obj.type == 'MESH' and obj.data is not None:
+				self.update(h, obj.data.name)
+				self.update_mesh(h, obj.data)
+			elif obj.data is not None:
+				self.update(h, obj.data.name, get_rna_values(obj.data))
+
+			self.local_fingerprints[obj] = h.hexdigest()
+
+		return self.local_fingerprints[obj]
+
+	def reference_fingerprints(self, objects):
+		"""Hash of each object and of every object it depends on, directly or not, built from the dependencies up.
+		Objects depending on each other share the hash of their component"""
+		reference_fingerprints = {}
+		for component in self.dependency_graph.components(objects):
+			h = hashlib.blake2b(digest_size=16)
+			for o in sorted(component, key=lambda o: o.name):
+				self.update(h, o.name, self.local_fingerprint(o))
+			members = set(component)
+			self.update(h, sorted({reference_fingerprints[r] for o in component for r in self.dependency_graph.object_references(o) if r not in members}))
+			digest = h.hexdigest()
+			for o in component:
+				reference_fingerprints[o] = digest
+
+		return reference_fingerprints
+
+	def fingerprints(self, objects):
+		"""Return the {object name: fingerprint} dict of the objects"""
+		objects = list(objects)
+		# The children of the whole selection are gathered once, each object being hashed a single time
+		related = dict.fromkeys(objects)
+		objects_to_process = list(objects)
+		while len(objects_to_process):
+			for c in self.children_map.get(objects_to_process.pop(), []):
+				if c not in related.keys():
+					related[c] = None
+					objects_to_process.append(c)
+
+		reference_fingerprints = self.reference_fingerprints(related.keys())
+		fingerprints = {}
+		for o in order_children_first(related.keys()):
+			h = hashlib.blake2b(digest_size=16)
+			self.update(h, reference_fingerprints[o], sorted(fingerprints[c] for c in self.children_map.get(o, [])))
+			fingerprints[o] = h.hexdigest()
+
+		self.log.info(lambda: f'{len(objects)} objects fingerprinted')
+		return {o.name: fingerprints[o] for o in objects}
@@ -1,21 +1,38 @@
 
 class Logger(object):
+	"""Print messages to the console when enabled.
+	Messages are only built when printed : pass a callable returning the message, or a format string and its arguments"""
 	def __init__(self, addon_name='ROOT', print=False):
 		self.addon_name = addon_name
 		self.print = print
 
-	def info(self, message):
-		self.print_message(message, 'INFO')
+	def info(self, message, *args):
+		self.print_message(message, 'INFO', args)
 
-	def debug(self, message):
-		self.print_message(message, 'DEBUG')
+	def debug(self, message, *args):
+		self.print_message(message, 'DEBUG', args)
 
-	def warning(self, message):
-		self.print_message(message, 'WARNING')
+	def warning(self, message, *args):
+		self.print_message(message, 'WARNING', args)
 
-	def error(self, message):
-		self.print_message(message, 'ERROR')
+	def error(self, message, *args):
+		self.print_message(message, 'ERROR', args)
 
-	def print_message(self, message, mode):
-		if self.print:
-			print(f'{self.addon_name} : {mode} : {message}')
+	def print_message(self, message, mode, args=()):
+		if not self.print:
+			return
+		if callable(message):
+			message = message()
+		elif len(args):
+			message = message.format(*args)
+		print(f'{self.addon_name} : {mode} : {message}')
+
+
+loggers = {}
+
+def get_logger(addon_name='ROOT', print=False):
+	"""Return the logger of a component, shared by the callers with the same print flag. A caller enabling the output doesn't enable it for the other callers"""
+	key = (addon_name, bool(print))
+	if key not in loggers.keys():
+		loggers[key] = Logger(addon_name=addon_name, print=bool(print))
+	return loggers[key]
@@ -1,18 +1,79 @@
 import bpy, re
-from .logger import Logger
+from .logger import get_logger
+
+
+NUMBERED_NAME_PATTERN = re.compile(r'^(.*?)([0-9]{3,})$')
+
+
+class NameCorrespondance(dict):
+	"""Dict of key -> name keeping a reverse index of names, so name lookups don't scan all values.
+	It also keeps the next number to try for each numbered name prefix, so finding a free numbered name doesn't count up from 1 each time"""
+	def __init__(self):
+		super(NameCorrespondance, self).__init__()
+		self.name_keys = {}
+		self.next_numbers = {}
+
+	def __setitem__(self, key, name):
+		if key in self:
+			self.discard_name(key, self[key])
+		super(NameCorrespondance, self).__setitem__(key, name)
+		self.name_keys.setdefault(name, {})[key] = None
+
+	def __delitem__(self, key):
+		self.discard_name(key, self[key])
+		super(NameCorrespondance, self).__delitem__(key)
+
+	def discard_name(self, key, name):
+		keys = self.name_keys[name]
+		del keys[key]
+		if not len(keys):
+			del self.name_keys[name]
+			# A freed numbered name is available again for its prefix
+			match = NUMBERED_NAME_PATTERN.match(name)
+			if match is not None and match.group(1) in self.next_numbers.keys():
+				self.next_numbers[match.group(1)] = min(self.next_numbers[match.group(1)], int(match.group(2)))
+
+	def has_name(self, name):
+		return name in self.name_keys
+
+	def keys_for_name(self, name):
+		return list(self.name_keys.get(name, ()))
+
+	def next_available_name(self, name, sep='.'):
+		prefix = name + sep
+		count = self.next_numbers.get(prefix, 1)
+		name_new = "%s%03d" % (prefix, count)
+		while name_new in self.name_keys:
+			count += 1
+			name_new = "%s%03d" % (prefix, count)
+		# Every number below count is taken, the next search starts from there
+		self.next_numbers[prefix] = count
+		return name_new
+
 
 class Manager:
-	def __init__(self, name, bpy_data, element_class, print_message=False):
-		self.log = Logger(addon_name=name, print=print_message)
+	def __init__(self, name, bpy_data, element_class, print_message=False, names=None):
+		self.log = get_logger(name, print_message)
 		self.print_message = print_message
 		self.element_list = []
+		self.element_set = set()
+		self.incoming_index = {}
+		self.local_index = {}
 		self.bpy_data = bpy_data
 		self.element_class = element_class
-		self.element_correspondance = {}
+		self.element_correspondance = NameCorrespondance()
 
 		# init incoming name
+		if names is not None:
+			# Names known from a name index, local names first, bpy_data isn't enumerated
+			for i, n in enumerate(names):
+				if self.element_correspondance.has_name(n):
+					continue
+				self.unique_name(i, n, self.element_correspondance)
+			return
+
 		for i, e in enumerate(bpy_data):
-			if bpy_data[i].library != None and e.name in self.element_correspondance.values():
+			if e.library != None and self.element_correspondance.has_name(e.name):
 				continue
 			self.unique_name(i, e.name, self.element_correspondance)
 
@@ -26,25 +87,40 @@ class Manager:
 				ex.strerror = f"No element in  {type(self.bpy_data)}"
 				raise ex
 			except ValueError as e:
-				self.log.error(f'Value Error : {e.strerror}')
+				self.log.error(lambda: f'Value Error : {e.strerror}')
 
-	def get_element_by_incoming_name(self, name):
-		e = [elem for elem in self.element_list if elem.incoming_name == name]
-		if len(e):
-			return e[0]
+	def append_element(self, elem):
+		if elem in self.element_set:
+			return
+		self.element_list.append(elem)
+		self.element_set.add(elem)
+		self.incoming_index.setdefault(elem.incoming_name, elem)
+		self.local_index.setdefault(elem.name, elem)
+
+	def update_local_index(self, elem, previous_name, name):
+		if elem not in self.element_set:
+			return
+		if self.local_index.get(previous_name) is elem:
+			del self.local_index[previous_name]
+		self.local_index.setdefault(name, elem)
 
-		return None
+	def get_element_by_incoming_name(self, name):
+		return self.incoming_index.get(name)
 
 	def get_element_by_local_name(self, name):
-		e = [elem for elem in self.element_list if elem.name == name]
-		if len(e):
-			return e[0]
+		elem = self.local_index.get(name)
+		if elem is None or elem.name == name:
+			return elem
 
-		return None
+		# Element have been renamed outside of the manager, rebuild local index
+		self.local_index = {}
+		for e in self.element_list:
+			self.local_index.setdefault(e.name, e)
+		return self.local_index.get(name)
 
 	def update_element_name(self, elem, name):
 		if elem in self.element_correspondance.keys():
-			self.log.info(f'Updating element "{elem.name}" name to "{name}"')
+			self.log.info(lambda: f'Updating element "{elem.name}" name to "{name}"')
 			self.element_correspondance[elem] = name
 		else:
 			self.register_element_correspondance(elem)
@@ -79,25 +155,32 @@ class Manager:
 		if name_new is None:
 			count = 1
 			has_number = False
-			name_dict_values = list(name_dict.values())
+			if isinstance(name_dict, NameCorrespondance):
+				is_taken = name_dict.has_name
+			else:
+				is_taken = set(name_dict.values()).__contains__
 
 			if clean_func is None:
 				name_new = name_new_orig = name
 			else:
 				name_new, has_number = clean_func(name)
 				name_new_orig = name_new
-			if has_number or name_new in name_dict_values:
+			if has_number or is_taken(name_new):
 				if name_max == -1:
-					while name_new in name_dict_values:
-						name_new = "%s%s%03d" % (
-							name_new_orig,
-							sep,
-							count,
-						)
-						count += 1
+					if isinstance(name_dict, NameCorrespondance):
+						if is_taken(name_new):
+							name_new = name_dict.next_available_name(name_new_orig, sep)
+					else:
+						while is_taken(name_new):
+							name_new = "%s%s%03d" % (
+								name_new_orig,
+								sep,
+								count,
+							)
+							count += 1
 				else:
 					name_new = name_new[:name_max]
-					while name_new in name_dict_values:
+					while is_taken(name_new):
 						count_str = "%03d" % count
 						name_new = "%.*s%s%s" % (
 							name_max - (len(count_str) + 1),
@@ -116,9 +199,9 @@ class Manager:
 		return self.unique_name(-11, name, self.element_correspondance, clean_func=unique_name_clean_func, register=False)
 
 class ObjectManager(Manager):
-	def __init__(self, bpy_data, element_class, print_message=False):
+	def __init__(self, bpy_data, element_class, print_message=False, names=None):
 		super(ObjectManager, self).__init__(
-			'Object Manager', bpy_data, element_class, print_message)
+			'Object Manager', bpy_data, element_class, print_message, names)
 
 	def add_element(self, obj, register=False, append_to_list=True):
 		if register:
@@ -127,13 +210,12 @@ class ObjectManager(Manager):
 		elem = self.element_class(
 			manager=self, obj=obj, print_message=self.print_message)
 		if append_to_list:
-			if elem not in self.element_list:
-				self.element_list.append(elem)
+			self.append_element(elem)
 
 		return elem
 
 	def parent(self, parent, child, keep_transform=False):
-		self.log.info(f'Parent "{child.name}" object to "{parent.name}" object')
+		self.log.info(lambda: f'Parent "{child.name}" object to "{parent.name}" object')
 		child.object.parent = parent.object
 		if keep_transform:
 			child.object.matrix_parent_inverse = parent.object.matrix_world.inverted()
@@ -151,46 +233,43 @@ class ObjectManager(Manager):
 				ex.strerror = f"Unrecognise type for Collection {type(element)}"
 				raise ex
 			except ValueError as e:
-				self.log.error(f'Value Error : {e.strerror}')
+				self.log.error(lambda: f'Value Error : {e.strerror}')
 
 	def get_element(self, name):
-		valid_elements = {
-			e: n for e, n in self.element_correspondance.items() if not isinstance(e, int)}
-		for e, n in valid_elements.items():
-			if n == name and not isinstance(e, int):
-				self.log.info(f'Element found : {e}')
+		for e in self.element_correspondance.keys_for_name(name):
+			if not isinstance(e, int):
+				self.log.info(lambda: f'Element found : {e}')
 				return self.conform_element(e)
 
 		return self.add_element(self.bpy_data[name], register=True)
 
 		
 class CollectionManager(Manager):
-	def __init__(self, bpy_data, element_class, print_message=False):
+	def __init__(self, bpy_data, element_class, print_message=False, names=None):
 		super(CollectionManager, self).__init__(
-			'Collection Manager', bpy_data, element_class, print_message)
+			'Collection Manager', bpy_data, element_class, print_message, names)
 
 	def get_element_by_incoming_name(self, name):
-		self.log.info(f'Get element by incomming name : "{name}"')
-		e = [elem for elem in self.element_list if elem.incoming_name == name]
-		if len(e):
-			self.log.info(f'Element Found : "{e[0].name}"')
-			return e[0]
+		self.log.info(lambda: f'Get element by incomming name : "{name}"')
+		elem = self.incoming_index.get(name)
+		if elem is not None:
+			self.log.info(lambda: f'Element Found : "{elem.name}"')
+			return elem
 		else:
-			self.log.info(f'Element NOT Found : Adding new Element')
+			self.log.info(lambda: f'Element NOT Found : Adding new Element')
 			return self.add_element(name, register=True)
 
 	def add_element(self, name, append_to_list=True, register=False):
 		new_name = self.unique_name(name, name, self.element_correspondance,
 									clean_func=unique_name_clean_func, register=register)
 		if new_name != name:
-			self.log.info(f'New name for "{name}" is "{new_name}"')
+			self.log.info(lambda: f'New name for "{name}" is "{new_name}"')
 
 		elem = self.element_class(manager=self, string=name,
 								  print_message=self.print_message)
 		elem.name = new_name
 		if append_to_list:
-			if elem not in self.element_list:
-				self.element_list.append(elem)
+			self.append_element(elem)
 		return elem
 
 	def conform_element(self, element):
@@ -206,25 +285,23 @@ class CollectionManager(Manager):
 				ex.strerror = f"Unrecognise type for Collection {type(element)}"
 				raise ex
 			except ValueError as e:
-				self.log.error(f'Value Error : {e.strerror}')
+				self.log.error(lambda: f'Value Error : {e.strerror}')
 
 	def get_element(self, name):
-		valid_elements = {
-			e: n for e, n in self.element_correspondance.items() if not isinstance(e, int)}
-		for e, n in valid_elements.items():
-			if n == name and not isinstance(e, int):
-				self.log.info(f'Element found : {e}')
+		for e in self.element_correspondance.keys_for_name(name):
+			if not isinstance(e, int):
+				self.log.info(lambda: f'Element found : {e}')
 				return self.conform_element(e)
 
 		return self.add_element(name, register=True)
 
 	# Linking and Unlinking Methods
 	def create_collection(self, collection_name):
-		if collection_name not in self.element_correspondance.values():
+		if not self.element_correspondance.has_name(collection_name):
 			coll = self.add_element(collection_name)
 		else:
 			coll = self.get_element(collection_name)
-		self.log.info(f'Create new collection : "{coll.name}"')
+		self.log.info(lambda: f'Create new collection : "{coll.name}"')
 		self.bpy_data.new(coll.name)
 		self.register_element_correspondance(self.bpy_data[coll.name])
 		return coll
@@ -234,7 +311,7 @@ class CollectionManager(Manager):
 		if object.name in collection.objects:
 			return
 		self.log.info(
-			f'Link object "{object.name}" to collection "{collection.name}"')
+			lambda: f'Link object "{object.name}" to collection "{collection.name}"')
 		collection.objects.link(object)
 
 	def unlink_object_from_collection(self, object, collection):
@@ -242,14 +319,14 @@ class CollectionManager(Manager):
 		if object.name not in collection.objects:
 			return
 		self.log.info(
-			f'Unlink object "{object.name}" from collection "{collection.name}"')
+			lambda: f'Unlink object "{object.name}" from collection "{collection.name}"')
 		collection.objects.unlink(object)
 
 	def move_object_to_collection(self, object, from_collection, to_collection):
 		from_collection = self.conform_element(from_collection).collection
 		to_collection = self.conform_element(to_collection).collection
 		self.log.info(
-			f'Move object "{object.name}" from collection "{from_collection.name}" to "{to_collection.name}"')
+			lambda: f'Move object "{object.name}" from collection "{from_collection.name}" to "{to_collection.name}"')
 		from_collection.objects.unlink(object)
 		to_collection.objects.link(object)
 
@@ -257,14 +334,14 @@ class CollectionManager(Manager):
 		child_collection = self.conform_element(child_collection).collection
 		parent_collection = self.conform_element(parent_collection).collection
 		self.log.info(
-			f'Link Collection "{child_collection.name}" to collection "{parent_collection.name}"')
+			lambda: f'Link Collection "{child_collection.name}" to collection "{parent_collection.name}"')
 		parent_collection.children.link(child_collection)
 
 	def unlink_collection_from_collection(self, child_collection, parent_collection):
 		child_collection = self.conform_element(child_collection).collection
 		parent_collection = self.conform_element(parent_collection).collection
 		self.log.info(
-			f'Unink Collection "{child_collection.name}" from collection "{parent_collection.name}"')
+			lambda: f'Unink Collection "{child_collection.name}" from collection "{parent_collection.name}"')
 		parent_collection.children.unlink(child_collection)
 
 	def get_layer_collection_by_name(self, layer_collection, collection_name):
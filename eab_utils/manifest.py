@@ -0,0 +1,39 @@
+import json
+import argparse
+import tempfile
+
+
+def str_to_bool(value):
+	"""argparse type of the boolean options"""
+	if isinstance(value, bool):
+		return value
+	if value.lower() in ('true', 'yes', '1'):
+		return True
+	if value.lower() in ('false', 'no', '0'):
+		return False
+	raise argparse.ArgumentTypeError(f'Boolean value expected, got "{value}"')
+
+
+def write_manifest(options, filepath=None):
+	"""Write the options of a command to a json manifest, to a temporary file if filepath is None. Return the manifest path"""
+	if filepath is None:
+		with tempfile.NamedTemporaryFile('w', prefix='eab_manifest_', suffix='.json', delete=False, encoding='utf-8') as f:
+			json.dump(options, f)
+			return f.name
+
+	with open(filepath, 'w', encoding='utf-8') as f:
+		json.dump(options, f)
+	return filepath
+
+
+def read_manifest(filepath):
+	with open(filepath, 'r', encoding='utf-8') as f:
+		return json.load(f)
+
+
+def get_manifest_path(argv):
+	"""Return the --manifest path of a command line, None if there is none"""
+	parser = argparse.ArgumentParser(add_help=False)
+	parser.add_argument('-M', '--manifest', default=None)
+	args, _ = parser.parse_known_args(argv)
+	return args.manifest
@@ -0,0 +1,61 @@
+import os
+import json
+from .blend_file import BlendFile
+
+INDEX_SUFFIX = '_eab_index.json'
+
+
+def default_index_path(filepath):
+	return os.path.splitext(filepath)[0] + INDEX_SUFFIX
+
+
+class NameIndex():
+	"""Names of the datablocks of a blend file per ID code, kept in a json sidecar next to the file.
+	The sidecar holds the size and mtime of the file it was written for, it is rebuilt from the file when the file was saved outside of the addon"""
+	def __init__(self, filepath, index_file=None):
+		self.filepath = filepath
+		self.index_file = index_file if index_file is not None else default_index_path(filepath)
+
+	def read(self):
+		"""Return the index, None if there is none or if the file changed since it was written"""
+		if not os.path.exists(self.index_file) or not os.path.exists(self.filepath):
+			return None
+		try:
+			with open(self.index_file, 'r', encoding='utf-8') as f:
+				index = json.load(f)
+		except (OSError, ValueError):
+			return None
+
+		# Any save changes the mtime, so a file saved outside of the addon is read again, even if only the middle of it changed
+		stat = os.stat(self.filepath)
+		if index.get('size') != stat.st_size or index.get('mtime') != stat.st_mtime_ns:
+			return None
+		return index
+
+	def write(self, names, linked_names):
+		"""Write the sidecar of the file as it is on disk, names and linked_names being {ID code: names} of its local and linked datablocks"""
+		stat = os.stat(self.filepath)
+		index = {	'size': stat.st_size,
+					'mtime': stat.st_mtime_ns,
+					'names': names,
+					'linked_names': linked_names}
+
+		# Written next to the sidecar then moved, so a sidecar is never read half written
+		temp_file = self.index_file + '.tmp'
+		with open(temp_file, 'w', encoding='utf-8') as f:
+			json.dump(index, f)
+		os.replace(temp_file, self.index_file)
+		return index
+
+	def rebuild(self):
+		blend_file = BlendFile(self.filepath)
+		names = {code: blend_file.id_names(code) for code in blend_file.ids.keys()}
+		linked_names = {code: [n for n, library in ids if library is not None] for code, ids in blend_file.ids.items()}
+		return self.write(names, linked_names)
+
+	def get(self):
+		"""Return the index, rebuilt from the file when the sidecar is missing or outdated"""
+		index = self.read()
+		if index is None:
+			index = self.rebuild()
+		return index
@@ -1,26 +1,57 @@
 import bpy
-from .logger import Logger
+from .logger import get_logger
+
+
+def get_id_type(struct):
+	# Return the identifier of the ID type an RNA struct derives from, 'ID' for generic ID pointers, None if it isn't an ID
+	if struct.identifier == 'ID':
+		return 'ID'
+	while struct.base is not None:
+		if struct.base.identifier == 'ID':
+			return struct.identifier
+		struct = struct.base
+	return None
 
 
 class ObjectDependencies():
 	compatible_modifier_type = (bpy.types.Object,)
+	# RNA struct identifier -> ID type -> names of the pointer properties that can hold this ID type
+	pointer_properties_cache = {}
 
-	def __init__(self, obj, print_message=False):
-		self.log = Logger(addon_name='Object Dependencies', print=print_message)
+	def __init__(self, obj, print_message=None):
+		self.log = get_logger('Object Dependencies', print_message)
 		self.object = obj
 		self._dependencies = None
 		self.dependency_objects = []
+		self.dependency_ids = []
 
 	@property
 	def data_type(self):
 		return {'modifiers': self.object.modifiers}
 
+	@classmethod
+	def pointer_properties(cls, struct):
+		identifier = struct.bl_rna.identifier
+		if identifier not in cls.pointer_properties_cache.keys():
+			properties = {}
+			for p in struct.bl_rna.properties:
+				if p.type != 'POINTER' or p.identifier == 'rna_type':
+					continue
+				id_type = get_id_type(p.fixed_type)
+				if id_type is None:
+					continue
+				properties.setdefault(id_type, []).append(p.identifier)
+			cls.pointer_properties_cache[identifier] = properties
+
+		return cls.pointer_properties_cache[identifier]
+
 	@property
 	def dependencies(self):
 		if self._dependencies is None:
 			self._dependencies = {'modifiers': {}}
 			for m in self.object.modifiers:
-				for p in dir(m):
+				properties = self.pointer_properties(m)
+				for p in properties.get('Object', []) + properties.get('ID', []):
 					a = getattr(m, p)
 					if isinstance(a, self.compatible_modifier_type):
 						if m.name not in self._dependencies['modifiers'].keys():
@@ -30,6 +61,7 @@ class ObjectDependencies():
 
 						if a.name not in self.dependency_objects:
 							self.dependency_objects.append(a.name)
+							self.dependency_ids.append(a)
 
 		return self._dependencies
 
@@ -49,6 +81,6 @@ class ObjectDependencies():
 						self.dependencies[t][n][p])
 					obj2 = object_manager.get_element(self.dependencies[t][n][p])
 					self.log.info(
-						f'Resolving dependencies, setting attr of {m.name}.{p} to {obj.name} {obj2.name}')
+						lambda: f'Resolving dependencies, setting attr of {m.name}.{p} to {obj.name} {obj2.name}')
 					setattr(m, p, object_manager.get_element_by_incoming_name(
 						self.dependencies[t][n][p]).object)
@@ -0,0 +1,62 @@
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_MODES = ['NONE', 'CPU', 'MEMORY']
+MEMORY_TOP_STATISTICS = 25
+
+
+class Profiler():
+	"""Capture a cProfile of some phases of a command, and their tracemalloc peak and snapshot in MEMORY mode.
+	Results are dumped to <output_prefix>.pstats and <output_prefix>_memory.txt after each phase"""
+	def __init__(self, output_prefix, mode='NONE'):
+		self.output_prefix = output_prefix
+		self.mode = mode
+		self.profile = None
+		self.memory_phases = []
+
+	@property
+	def enabled(self):
+		return self.mode != 'NONE'
+
+	@property
+	def pstats_file(self):
+		return self.output_prefix + '.pstats'
+
+	@property
+	def memory_file(self):
+		return self.output_prefix + '_memory.txt'
+
+	@contextmanager
+	def phase(self, name):
+		if not self.enabled:
+			yield
+			return
+
+		if self.profile is None:
+			self.profile = cProfile.Profile()
+		trace_memory = self.mode == 'MEMORY' and not tracemalloc.is_tracing()
+		if trace_memory:
+			tracemalloc.start()
+		self.profile.enable()
+		try:
+			yield
+		finally:
+			self.profile.disable()
+			if trace_memory:
+				snapshot = tracemalloc.take_snapshot()
+				_, peak = tracemalloc.get_traced_memory()
+				tracemalloc.stop()
+				self.memory_phases.append((name, peak, snapshot.statistics('lineno')[:MEMORY_TOP_STATISTICS]))
+			self.dump()
+
+	def dump(self):
+		self.profile.dump_stats(self.pstats_file)
+		if not len(self.memory_phases):
+			return
+		with open(self.memory_file, 'w') as f:
+			for name, peak, statistics in self.memory_phases:
+				f.write(f'{name} : peak {peak / 1024:.1f} KiB\n')
+				for s in statistics:
+					f.write(f'\t{s}\n')
+				f.write('\n')
@@ -0,0 +1,211 @@
+import bpy
+from .logger import get_logger
+from .dependency_graph import DependencyGraph
+from .utils import get_children_map, get_ancestors
+from .collection_ancestry import CollectionAncestry
+
+SCENE_COLLECTION_NAME = 'Scene Collection'
+DEPENDENCIES_COLLECTION_NAME = 'Dependencies'
+TEMPORARY_NAME_SUFFIX = '__eab_tmp'
+# Bytes of an ID name, longer names are truncated by Blender
+MAX_ID_NAME_LENGTH = 63
+
+
+def truncate_name(name, length=MAX_ID_NAME_LENGTH):
+	return name.encode('utf-8')[:length].decode('utf-8', errors='ignore')
+
+
+class TemporaryIDNames():
+	"""Free some local datablock names for the time of the context, by temporarily renaming the datablocks holding them.
+	The temporary names fit in the ID name length and are not used by any datablock, and the datablocks renamed so far are restored even if the context fails"""
+	def __init__(self, bpy_data, names, print_message=False):
+		self.log = get_logger('Snapshot', print_message)
+		self.bpy_data = bpy_data
+		self.names = names
+		self.renamed = {}
+
+	def temporary_name(self, name, taken_names):
+		for i in range(len(taken_names) + 1):
+			suffix = f'{TEMPORARY_NAME_SUFFIX}{i}'
+			temporary_name = truncate_name(name, MAX_ID_NAME_LENGTH - len(suffix)) + suffix
+			if temporary_name not in taken_names:
+				return temporary_name
+
+	def __enter__(self):
+		local_ids = {i.name: i for i in self.bpy_data if i.library is None}
+		taken_names = {i.name for i in self.bpy_data}
+		try:
+			for n in self.names:
+				if n not in local_ids.keys():
+					continue
+				temporary_name = self.temporary_name(n, taken_names)
+				taken_names.add(temporary_name)
+				local_ids[n].name = temporary_name
+				self.renamed[n] = local_ids[n]
+		except BaseException:
+			self.restore()
+			raise
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.restore()
+
+	def restore(self):
+		for n, i in self.renamed.items():
+			i.name = n
+			if i.name != n:
+				self.log.warning(lambda: f'Cannot restore the name of "{i.name}" to "{n}", the name is used by another datablock')
+		self.renamed = {}
+
+
+class Snapshot():
+	"""Write a subset of the current session to a blend file.
+	The collections and the scene are written as proxies, only holding the objects of the subset, so the datablocks of the rest of the session are left out"""
+	def __init__(self, scene, objects, print_message=False):
+		self.log = get_logger('Snapshot', print_message)
+		self.print_message = print_message
+		self.scene = scene
+		self.objects = objects
+
+	def parent_lookup(self):
+		return CollectionAncestry(self.scene.collection).parent_lookup()
+
+	def collect(self, include_children=True, dependency_graph=None):
+		"""Return the exported objects and the objects they depend on"""
+		exported = set(self.objects)
+		if include_children:
+			# Children are walked as objects, a linked child can share its name with a local object
+			children_map = get_children_map(bpy.data.objects)
+			objects_to_process = list(self.objects)
+			while len(objects_to_process):
+				for c in children_map.get(objects_to_process.pop(), []):
+					if c not in exported:
+						exported.add(c)
+						objects_to_process.append(c)
+
+		if dependency_graph is None:
+			dependency_graph = DependencyGraph(self.print_message)
+		dependencies = set(dependency_graph.closure(exported))
+
+		return exported, dependencies
+
+	def source_layout(self, collections=()):
+		"""Return the parent, collections and object references of the objects, their children, their dependencies and their parents, and the collection hierarchy of the scene, as plain names.
+		The import command reads it instead of linking the source scene to analyse it"""
+		dependency_graph = DependencyGraph(self.print_message)
+		exported, dependencies = self.collect(include_children=True, dependency_graph=dependency_graph)
+		# Parents are appended with their children, an incremental export needs their previous export
+		ancestors = set(get_ancestors(exported | dependencies))
+		ancestry = CollectionAncestry(self.scene.collection, collections)
+		scene_collections = set(ancestry.root_parents.keys()) | {self.scene.collection.name}
+
+		objects = {}
+		for o in sorted(exported | dependencies | ancestors, key=lambda o: o.name):
+			collection_names = [c.name for c in o.users_collection]
+			# Collections of other scenes are left out, unless the object is in none of the scene
+			in_scene = [c for c in collection_names if c in scene_collections]
+			objects[o.name] = {	'parent': o.parent.name if o.parent is not None else None,
+								'collections': in_scene if len(in_scene) else collection_names,
+								'references': [r.name for r in dependency_graph.object_references(o)],
+								'dependencies': dependency_graph.object_dependencies[o].dependencies}
+
+		return {'root_collection_name': self.scene.collection.name,
+				'root_parents': ancestry.root_parents,
+				'parents': ancestry.parents,
+				'collections_in_scene': [c.name for c in collections if self.scene.user_of_id(c)],
+				'objects': objects}
+
+	def closure_objects(self):
+		exported, dependencies = self.collect()
+		return exported | dependencies
+
+	def mirror_layout(self, objects):
+		"""Return the collection hierarchy and the object collections of the scene, restricted to the given objects"""
+		parent_lookup = self.parent_lookup()
+		collection_parents = {}
+		object_collections = {}
+		for o in objects:
+			for c in o.users_collection:
+				if c == self.scene.collection:
+					object_collections.setdefault(o, []).append(SCENE_COLLECTION_NAME)
+					continue
+				if c.name not in parent_lookup.keys():
+					continue
+				object_collections.setdefault(o, []).append(c.name)
+
+				collections_to_process = [c.name]
+				while len(collections_to_process):
+					cc = collections_to_process.pop()
+					if cc in collection_parents.keys():
+						continue
+					collection_parents[cc] = parent_lookup[cc]
+					collections_to_process += [p for p in parent_lookup[cc] if p != self.scene.collection.name]
+
+		return collection_parents, object_collections
+
+	def export_layout(self, exported, dependencies, create_collection_hierarchy=True, export_in_new_collection=False, new_collection_name='Root Collection', dependencies_in_dedicated_collection=False):
+		"""Return the collection hierarchy and the object collections matching the export options of the import command"""
+		root_collection_name = new_collection_name if export_in_new_collection else SCENE_COLLECTION_NAME
+		collection_parents = {}
+		object_collections = {}
+
+		if create_collection_hierarchy:
+			mirrored_objects = exported if dependencies_in_dedicated_collection else exported | dependencies
+			collection_parents, object_collections = self.mirror_layout(mirrored_objects)
+			collection_parents = {n: [root_collection_name if p == self.scene.collection.name else p for p in parents] for n, parents in collection_parents.items()}
+			object_collections = {o: [root_collection_name if c == SCENE_COLLECTION_NAME else c for c in collections] for o, collections in object_collections.items()}
+
+		if export_in_new_collection:
+			collection_parents[root_collection_name] = [SCENE_COLLECTION_NAME]
+
+		if dependencies_in_dedicated_collection and len(dependencies):
+			collection_parents[DEPENDENCIES_COLLECTION_NAME] = [root_collection_name]
+			for o in dependencies:
+				object_collections[o] = [DEPENDENCIES_COLLECTION_NAME]
+
+		for o in exported | dependencies:
+			if o not in object_collections.keys():
+				object_collections[o] = [root_collection_name]
+
+		return collection_parents, object_collections
+
+	def write(self, filepath, objects, collection_parents, object_collections, scene_name=None, path_remap='ABSOLUTE'):
+		scene_name = self.scene.name if scene_name is None else scene_name
+		self.log.info(lambda: f'Writing {len(objects)} objects and {len(collection_parents)} collections to "{filepath}"')
+
+		# The proxies are removed before the names are restored, so the restored names are free
+		with TemporaryIDNames(bpy.data.scenes, [scene_name], self.print_message), TemporaryIDNames(bpy.data.collections, collection_parents.keys(), self.print_message):
+			proxy_scene = bpy.data.scenes.new(scene_name)
+			proxy_collections = {}
+			try:
+				for n in collection_parents.keys():
+					proxy_collections[n] = bpy.data.collections.new(n)
+				proxy_collections[self.scene.collection.name] = proxy_scene.collection
+				proxy_collections[SCENE_COLLECTION_NAME] = proxy_scene.collection
+
+				for n, parents in collection_parents.items():
+					for p in parents:
+						proxy_collections[p].children.link(proxy_collections[n])
+
+				for o, collections in object_collections.items():
+					for c in collections:
+						proxy_collections[c].objects.link(o)
+
+				# Objects outside of the scene are written explicitly
+				datablocks = {proxy_scene} | {o for o in objects if o not in object_collections.keys()}
+				bpy.data.libraries.write(filepath, datablocks, path_remap=path_remap, fake_user=False)
+			finally:
+				for n, c in proxy_collections.items():
+					if c != proxy_scene.collection:
+						bpy.data.collections.remove(c)
+				bpy.data.scenes.remove(proxy_scene)
+
+	def write_closure(self, filepath):
+		closure = self.closure_objects()
+		collection_parents, object_collections = self.mirror_layout(closure)
+		self.write(filepath, closure, collection_parents, object_collections)
+
+	def write_export(self, filepath, export_object_children=False, **layout_options):
+		exported, dependencies = self.collect(include_children=export_object_children)
+		collection_parents, object_collections = self.export_layout(exported, dependencies, **layout_options)
+		self.write(filepath, exported | dependencies, collection_parents, object_collections, path_remap='RELATIVE')
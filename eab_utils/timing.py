@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+REPORT_SUFFIX = '_eab_report.json'
+
+
+def default_report_path(filepath):
+	"""Return the report path written next to an exported file"""
+	return os.path.splitext(filepath)[0] + REPORT_SUFFIX
+
+
+def get_peak_rss():
+	"""Return the peak resident memory of the current process since it started in bytes, None if it can't be measured on this platform"""
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# ru_maxrss is in KiB on Linux and in bytes on macOS
+	return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PhaseTimer():
+	"""Named phase durations and counters of one component of an export.
+	Every process of an export writes its own section to the same json report, components run once per job of a batch are keyed by job"""
+	def __init__(self, component, report_file=None, job=None):
+		self.component = component
+		self.report_file = report_file
+		self.job = job
+		self.started_at = time.time()
+		self.phases = {}
+		self.process_peak_rss_so_far = {}
+		self.counters = {}
+
+	@property
+	def enabled(self):
+		return self.report_file is not None
+
+	@contextmanager
+	def phase(self, name):
+		if not self.enabled:
+			yield
+			return
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			# Phases run several times are accumulated
+			self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+			# ru_maxrss never decreases, it is the peak of the process up to the end of the phase, not the peak of the phase
+			self.process_peak_rss_so_far[name] = get_peak_rss()
+
+	def count(self, name, value):
+		if self.enabled:
+			self.counters[name] = value
+
+	def report(self):
+		return {'started_at': self.started_at,
+				'total': time.time() - self.started_at,
+				'phases': self.phases,
+				'process_peak_rss_so_far': self.process_peak_rss_so_far,
+				'counters': self.counters}
+
+	def write(self):
+		if not self.enabled:
+			return
+		report = {}
+		if os.path.exists(self.report_file):
+			try:
+				with open(self.report_file, 'r') as f:
+					report = json.load(f)
+			except ValueError:
+				report = {}
+		if self.job is None:
+			report[self.component] = self.report()
+		else:
+			report.setdefault(self.component, {})[self.job] = self.report()
+		with open(self.report_file, 'w') as f:
+			json.dump(report, f, indent=4)
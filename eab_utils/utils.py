@@ -3,17 +3,102 @@ import shutil
 import os
 import stat
 from os import path
+from collections import deque
+
+def get_children_map(objects):
+	# Single pass over objects, instead of walking all objects for each parent
+	children_map = {}
+	for o in objects:
+		if o.parent is not None:
+			children_map.setdefault(o.parent, []).append(o)
+
+	return children_map
+
+
+def get_object_children(obj, children_map=None, recursive=False):
+	if children_map is None:
+		children_map = get_children_map(bpy.data.objects)
 
-def get_object_children(obj):
 	children = []
-	parents = [o for o in bpy.data.objects]
-	for ob in parents:
-		if ob.parent == obj:
-			children.append(ob.name)
-	
+	objects_to_process = [obj]
+	while len(objects_to_process):
+		o = objects_to_process.pop()
+		for c in children_map.get(o, []):
+			children.append(c.name)
+			if recursive:
+				objects_to_process.append(c)
+
 	return children
 
 
+def get_ancestors(objects):
+	"""Return the parents of the objects, the parents of these parents and so on, that are not in objects"""
+	objects = set(objects)
+	ancestors = {}
+	for o in objects:
+		p = o.parent
+		while p is not None and p not in objects and p not in ancestors.keys():
+			ancestors[p] = None
+			p = p.parent
+
+	return list(ancestors.keys())
+
+
+def get_used_ids():
+	"""Return the IDs used by each ID of the file"""
+	# bpy.data.user_map gives the users of each ID, reversed once to walk from users to used IDs
+	used_ids = {}
+	for used, users in bpy.data.user_map().items():
+		for user in users:
+			used_ids.setdefault(user, []).append(used)
+
+	return used_ids
+
+
+def get_id_closure(ids, used_ids=None):
+	"""Return the IDs and every local ID they use, directly or indirectly. used_ids can be given to share one get_used_ids between several closures"""
+	if used_ids is None:
+		used_ids = get_used_ids()
+
+	closure = set(ids)
+	ids_to_process = deque(closure)
+	while len(ids_to_process):
+		for used in used_ids.get(ids_to_process.popleft(), ()):
+			if used in closure or used.library is not None:
+				continue
+			closure.add(used)
+			ids_to_process.append(used)
+
+	return closure
+
+
+def order_children_first(objects, include_parent=False):
+	# Kahn topological sort over the parent -> children graph, reversed so each object comes before its parent
+	nodes = {}
+	for o in objects:
+		nodes[o] = None
+		if include_parent:
+			p = o.parent
+			while p is not None and p not in nodes:
+				nodes[p] = None
+				p = p.parent
+
+	children_map = get_children_map(nodes.keys())
+	objects_to_process = deque(o for o in nodes.keys() if o.parent not in nodes)
+	ordered_list = []
+	while len(objects_to_process):
+		o = objects_to_process.popleft()
+		ordered_list.append(o)
+		objects_to_process.extend(children_map.get(o, []))
+
+	ordered_list.reverse()
+	return ordered_list
+
+
+def get_datablock_counts():
+	return {d: len(getattr(bpy.data, d)) for d in ['objects', 'collections', 'meshes', 'materials', 'node_groups', 'images', 'libraries', 'scenes']}
+
+
 def delete_folder_if_exist(p):
 	if path.exists(p):
 		shutil.rmtree(p, onerror=file_acces_handler)
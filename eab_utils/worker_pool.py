@@ -0,0 +1,140 @@
+import sys
+import json
+import time
+import queue
+import threading
+import subprocess
+
+WORKER_REPLY_PREFIX = 'EAB_WORKER_REPLY:'
+DEFAULT_POOL_SIZE = 2
+DEFAULT_IDLE_TIMEOUT = 300.0
+# A worker idle for longer than idle_timeout - IDLE_MARGIN is not reused, so a job is never sent to a worker that is about to exit on its own
+IDLE_MARGIN = 10.0
+
+
+class WorkerError(RuntimeError):
+	pass
+
+
+class WorkerProcess():
+	def __init__(self, binary_path, script_path, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+		self.idle_timeout = idle_timeout
+		self.last_used = time.monotonic()
+		self.replies = queue.Queue()
+		self.process = subprocess.Popen([binary_path,
+										'--background',
+										'--factory-startup',
+										'--python', script_path, '--',
+										'--idle_timeout', str(idle_timeout)],
+										stdin=subprocess.PIPE,
+										stdout=subprocess.PIPE,
+										text=True,
+										encoding='utf-8',
+										errors='replace',
+										bufsize=1)
+		self.reader = threading.Thread(target=self.read_output, daemon=True)
+		self.reader.start()
+
+	@property
+	def alive(self):
+		return self.process.poll() is None
+
+	@property
+	def expired(self):
+		return time.monotonic() - self.last_used > self.idle_timeout - IDLE_MARGIN
+
+	def read_output(self):
+		# Forward the worker console output and catch job replies
+		for line in self.process.stdout:
+			if line.startswith(WORKER_REPLY_PREFIX):
+				self.replies.put(json.loads(line[len(WORKER_REPLY_PREFIX):]))
+			else:
+				sys.stdout.write(line)
+		self.replies.put(None)
+
+	def run(self, job):
+		try:
+			self.process.stdin.write(json.dumps(job) + '\n')
+			self.process.stdin.flush()
+		except OSError as e:
+			raise WorkerError(f'Worker process is not reachable : {e}')
+
+		reply = self.replies.get()
+		self.last_used = time.monotonic()
+		if reply is None:
+			raise WorkerError(f'Worker process exited with code {self.process.wait()}')
+		if reply['status'] != 'FINISHED':
+			raise WorkerError(reply['error'])
+
+		return reply
+
+	def stop(self, timeout=10.0):
+		if not self.alive:
+			return
+		try:
+			# Closing stdin ask the worker to exit once its current job is done
+			self.process.stdin.close()
+			self.process.wait(timeout=timeout)
+		except (OSError, subprocess.TimeoutExpired):
+			self.process.kill()
+
+
+class WorkerPool():
+	def __init__(self, binary_path, script_path, size=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+		self.binary_path = binary_path
+		self.script_path = script_path
+		self.size = size
+		self.idle_timeout = idle_timeout
+		self.idle_workers = []
+		self.worker_count = 0
+		self.condition = threading.Condition()
+
+	def reap(self):
+		# Needs to be called with self.condition acquired
+		for w in self.idle_workers.copy():
+			if w.alive and not w.expired:
+				continue
+			self.idle_workers.remove(w)
+			self.worker_count -= 1
+			w.stop()
+
+	def acquire(self):
+		with self.condition:
+			while True:
+				self.reap()
+				if len(self.idle_workers):
+					return self.idle_workers.pop()
+				if self.worker_count < self.size:
+					self.worker_count += 1
+					break
+				self.condition.wait()
+
+		try:
+			return WorkerProcess(self.binary_path, self.script_path, self.idle_timeout)
+		except OSError:
+			with self.condition:
+				self.worker_count -= 1
+				self.condition.notify()
+			raise
+
+	def release(self, worker):
+		with self.condition:
+			if worker.alive:
+				self.idle_workers.append(worker)
+			else:
+				self.worker_count -= 1
+			self.condition.notify()
+
+	def run(self, script_name, blend_file, argv):
+		worker = self.acquire()
+		try:
+			return worker.run({'script': script_name, 'blend_file': blend_file, 'argv': argv})
+		finally:
+			self.release(worker)
+
+	def shutdown(self):
+		with self.condition:
+			for w in self.idle_workers:
+				w.stop()
+			self.worker_count -= len(self.idle_workers)
+			self.idle_workers = []
@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eab_utils")
+sys.path.append(os.path.dirname(SCRIPT_DIR))
+
+from eab_utils.logger import get_logger
+from eab_utils.worker_pool import WorkerPool, WorkerError
+from eab_utils.manifest import write_manifest
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker.py')
+REQUIRED_JOB_KEYS = ['source_file', 'destination_file', 'source_scene_name', 'source_object_list']
+DEFAULT_JOB_OPTIONS = {	'source_data': 'OBJECTS',
+						'file_override': 'OVERRIDE',
+						'target_scene': 'ACTIVE_SCENE',
+						'export_mode': 'APPEND',
+						'export_to_clean_file': True,
+						'pack_external_data': False,
+						'export_object_children': False,
+						'create_collection_hierarchy': True,
+						'export_in_new_collection': False,
+						'new_collection_name': 'Root Collection',
+						'dependencies_in_dedicated_collection': False,
+						'name_index': False,
+						'print_debug': False}
+
+
+class ExportFarm():
+	"""Run the export jobs of a json job file without the UI, spread over a pool of background Blenders.
+	The job file holds a "jobs" list, each job being an import_command.py manifest, and optional "defaults" shared by every job"""
+	def __init__(self, argv):
+		self.parse_argsv(argv)
+		self.log = get_logger('Export Farm', True)
+		self.pool = WorkerPool(self.blender, WORKER_SCRIPT, size=self.workers)
+
+	def parse_argsv(self, argv):
+		parser = argparse.ArgumentParser(description='This command export blend files from a job file, with a pool of background Blenders.')
+		parser.add_argument('-b', '--blender', required=True,
+							help='Path to the Blender executable')
+		parser.add_argument('-j', '--job_file', required=True,
+							help='Path to the json job file')
+		parser.add_argument('-o', '--output', default=None,
+							help='Path of the json result file, <job_file>_results.json by default')
+		parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+							help='Number of background Blenders running jobs at the same time, the number of cores by default')
+		parser.add_argument('-r', '--retries', type=int, default=1,
+							help='Number of times a failed job is run again')
+		args = parser.parse_args(argv)
+		self.blender = args.blender
+		self.job_file = args.job_file
+		self.output = args.output if args.output is not None else os.path.splitext(args.job_file)[0] + '_results.json'
+		self.workers = max(1, args.workers)
+		self.retries = max(0, args.retries)
+
+	def load_jobs(self):
+		with open(self.job_file, 'r') as f:
+			job_file = json.load(f)
+
+		defaults = dict(DEFAULT_JOB_OPTIONS, **job_file.get('defaults', {}))
+		jobs = []
+		for i, job in enumerate(job_file['jobs']):
+			job = dict(defaults, **job)
+			missing = [k for k in REQUIRED_JOB_KEYS if k not in job.keys()]
+			if len(missing):
+				raise ValueError(f'Job {i} is missing {", ".join(missing)}')
+			# Relative paths are relative to the job file
+			for k in ['source_file', 'destination_file']:
+				job[k] = os.path.join(os.path.dirname(os.path.abspath(self.job_file)), job[k])
+			jobs.append(job)
+		return jobs
+
+	def job_argv(self, job, manifest_file):
+		write_manifest(job, manifest_file)
+		return ['import_command', '--', '--manifest', manifest_file]
+
+	def run_job(self, index, job, report_dir):
+		# Appending or linking needs the destination file to be opened
+		blend_file = job['destination_file'] if job['file_override'] == 'APPEND_LINK' else None
+		report_file = os.path.join(report_dir, f'job_{index}.json')
+		argv = self.job_argv(dict(job, report_file=report_file), os.path.join(report_dir, f'job_{index}_manifest.json'))
+		result = {	'index': index,
+					'source_file': job['source_file'],
+					'destination_file': job['destination_file'],
+					'attempts': 0,
+					'error': None}
+
+		start = time.perf_counter()
+		for attempt in range(self.retries + 1):
+			result['attempts'] = attempt + 1
+			try:
+				self.pool.run('import_command', blend_file, argv)
+				result['error'] = None
+				break
+			except WorkerError as e:
+				result['error'] = str(e)
+				self.log.warning(lambda: f'Job {index} "{job["destination_file"]}" failed, attempt {attempt + 1} of {self.retries + 1}')
+		result['duration'] = time.perf_counter() - start
+		result['status'] = 'FINISHED' if result['error'] is None else 'FAILED'
+
+		if os.path.exists(report_file):
+			with open(report_file, 'r') as f:
+				result['report'] = json.load(f)
+
+		self.log.info(lambda: f'Job {index} {result["status"]} in {result["duration"]:.2f}s : "{job["destination_file"]}"')
+		return result
+
+	def run(self):
+		jobs = self.load_jobs()
+		self.log.info(lambda: f'Running {len(jobs)} jobs on {self.workers} workers')
+
+		report_dir = tempfile.mkdtemp(prefix='eab_farm_')
+		start = time.perf_counter()
+		try:
+			with ThreadPoolExecutor(max_workers=self.workers) as executor:
+				results = list(executor.map(lambda i: self.run_job(i, jobs[i], report_dir), range(len(jobs))))
+		finally:
+			self.pool.shutdown()
+			shutil.rmtree(report_dir, ignore_errors=True)
+		total_time = time.perf_counter() - start
+
+		failed = len([r for r in results if r['status'] != 'FINISHED'])
+		summary = {	'workers': self.workers,
+					'total_time': total_time,
+					'jobs_per_second': len(jobs) / total_time if total_time > 0 else None,
+					'finished': len(jobs) - failed,
+					'failed': failed,
+					'jobs': results}
+		with open(self.output, 'w') as f:
+			json.dump(summary, f, indent=4)
+
+		self.log.info(lambda: f'{len(jobs) - failed} of {len(jobs)} jobs finished in {total_time:.2f}s, results written to "{self.output}"')
+		return failed
+
+
+if __name__ == "__main__":
+	EF = ExportFarm(sys.argv[1:])
+	sys.exit(1 if EF.run() else 0)
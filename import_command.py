@@ -2,34 +2,165 @@ import bpy
 import os
 import sys
 import argparse
+from collections import deque
 
 SCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eab_utils")
 sys.path.append(os.path.dirname(SCRIPT_DIR))
 
-from eab_utils.logger import Logger
+from eab_utils.logger import get_logger
 from eab_utils.manager import ObjectManager, CollectionManager
 from eab_utils.element import Collection, Object
 from eab_utils.object_dependencies import ObjectDependencies
+from eab_utils.collection_ancestry import CollectionAncestry
+from eab_utils.snapshot import Snapshot
+from eab_utils.timing import PhaseTimer
+from eab_utils.profiling import Profiler, PROFILE_MODES
+from eab_utils.manifest import str_to_bool, read_manifest, get_manifest_path
+from eab_utils.name_index import NameIndex
+from eab_utils.blend_file import ID_CODES, ID_TYPE_CODES, UNRENAMED_ID_CODES
+from eab_utils.fingerprint import FINGERPRINT_PROPERTY, SOURCE_NAME_PROPERTY
 import eab_utils.utils as U
 
 IMPORT_COLLECTION_NAME = 'TILA_IMPORT_COLLECTION'
 DEPENDENCIES_COLLECTION_NAME = 'Dependencies'				
+# Options only given through a manifest, as dicts
+MANIFEST_OPTIONS = {'rename_map', 'name_correspondance', 'fingerprints', 'source_layout'}
+REQUIRED_MANIFEST_OPTIONS = ['source_file', 'destination_file', 'source_scene_name']
 
 class ImportCommand():
 	def __init__(self, argv):
 		self.parse_argsv(argv[argv.index("--") + 1:])
-		self.log = Logger(addon_name='Import Command', print=self.print_debug)
-		self.init_source_lists()
-		self._imported_objects = None
-		self._valid_collections = None
-		self.cm = CollectionManager(bpy.data.collections, Collection, self.print_debug)
-		self.om = ObjectManager(bpy.data.objects, Object, self.print_debug)
+		self.log = get_logger('Import Command', self.print_debug)
+		# Each job of a batch runs its own import session, its timings are kept under its destination file
+		self.timer = PhaseTimer('import_command', self.report_file, job=self.destination_file)
+		self.profiler = Profiler(os.path.splitext(self.destination_file)[0] + '_import_command', self.profile)
+		with self.profiler.phase('init'):
+			# Clean file before analysing source file, so the source library is kept when linking
+			if self.export_to_clean_file and self.file_override == "OVERRIDE":
+				with self.timer.phase('clean_file'):
+					self.clean_file()
+			self.previous_exports = {}
+			if self.incremental:
+				with self.timer.phase('skip_unchanged_objects'):
+					self.skip_unchanged_objects()
+			self.up_to_date = self.incremental and self.source_data == 'OBJECTS' and not len(self.source_object_list)
+			if self.up_to_date:
+				self.log.info(lambda: f'"{self.destination_file}" is up to date')
+				return
+
+			with self.timer.phase('init_source_lists'):
+				self.init_source_lists()
+			self._imported_objects = None
+			self._valid_collections = None
+			with self.timer.phase('init_managers'):
+				index = self.read_name_index()
+				self.cm = CollectionManager(bpy.data.collections, Collection, self.print_debug, names=self.get_index_names(index, 'GR'))
+				self.om = ObjectManager(bpy.data.objects, Object, self.print_debug, names=self.get_index_names(index, 'OB'))
+
+	def skip_unchanged_objects(self):
+		# Objects exported before, by their name in source file
+		self.previous_exports = {o[SOURCE_NAME_PROPERTY]: o for o in bpy.data.objects if o.library is None and SOURCE_NAME_PROPERTY in o.keys()}
+		unchanged = {n for n in self.source_object_list if self.is_unchanged(n)}
+		self.source_object_list = [n for n in self.source_object_list if n not in unchanged]
+		self.timer.count('unchanged_objects', len(unchanged))
+		self.log.info(lambda: f'{len(unchanged)} unchanged objects skipped : {sorted(unchanged)}')
+
+	def is_unchanged(self, name):
+		previous = self.previous_exports.get(name)
+		return previous is not None and name in self.fingerprints.keys() and previous.get(FINGERPRINT_PROPERTY) == self.fingerprints[name]
+
+	def read_name_index(self):
+		# Once the source library is removed, the appended destination only holds its own datablocks
+		if not self.name_index or self.file_override != 'APPEND_LINK' or self.export_mode != 'APPEND':
+			return None
+		index = NameIndex(self.destination_file).read()
+		self.log.info(lambda: f'Name index of "{self.destination_file}" {"not found or outdated" if index is None else "found"}')
+		return index
+
+	def get_index_names(self, index, id_code):
+		if index is None:
+			return None
+		return index['names'].get(id_code, []) + index['linked_names'].get(id_code, [])
+
+	def write_name_index(self):
+		names = {}
+		linked_names = {}
+		for code, d in ID_CODES.items():
+			if not hasattr(bpy.data, d):
+				continue
+			for i in getattr(bpy.data, d):
+				(names if i.library is None else linked_names).setdefault(code, []).append(i.name)
+		NameIndex(self.destination_file).write(names, linked_names)
 
 	def conform_path(self, path):
 		return os.path.normpath(bpy.path.abspath(path))
 		
 	def parse_argsv(self, argv):
+		manifest = get_manifest_path(argv)
+		if manifest is not None:
+			self.set_options(self.check_manifest(self.get_parser(), read_manifest(manifest)))
+		else:
+			self.set_options(self.parse_command_line(argv))
+
+	def check_manifest(self, parser, options):
+		"""Check the manifest options against the command line arguments : choices, types and required options. Boolean strings are converted like on the command line"""
+		actions = {a.dest: a for a in parser._actions if a.dest not in ('help', 'manifest', 'imported_names', 'new_names')}
+		unknown_options = options.keys() - actions.keys() - MANIFEST_OPTIONS
+		if len(unknown_options):
+			parser.error(f'unknown manifest options : {", ".join(sorted(unknown_options))}')
+
+		for dest in REQUIRED_MANIFEST_OPTIONS:
+			if options.get(dest) is None:
+				parser.error(f'the manifest option "{dest}" is required')
+
+		for dest, action in actions.items():
+			value = options.get(dest)
+			if value is None:
+				continue
+			if action.nargs == '+':
+				if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+					parser.error(f'the manifest option "{dest}" has to be a list of strings, got {value!r}')
+				continue
+			if action.type is str_to_bool:
+				try:
+					value = str_to_bool(value) if isinstance(value, str) else value
+				except argparse.ArgumentTypeError as e:
+					parser.error(f'the manifest option "{dest}" : {e}')
+				if not isinstance(value, bool):
+					parser.error(f'the manifest option "{dest}" has to be a boolean, got {value!r}')
+			elif not isinstance(value, str):
+				parser.error(f'the manifest option "{dest}" has to be a string, got {value!r}')
+			if action.choices is not None and value not in action.choices:
+				parser.error(f'the manifest option "{dest}" has to be one of {", ".join(action.choices)}, got {value!r}')
+			options[dest] = value
+
+		for dest in MANIFEST_OPTIONS:
+			if options.get(dest) is not None and not isinstance(options[dest], dict):
+				parser.error(f'the manifest option "{dest}" has to be a dict, got {options[dest]!r}')
+
+		return options
+
+	def parse_command_line(self, argv):
+		parser = self.get_parser()
+		args = parser.parse_args(argv)
+		options = vars(args)
+
+		imported_names = options.pop('imported_names')
+		new_names = options.pop('new_names')
+		if imported_names is None or new_names is None:
+			options['name_correspondance'] = {}
+		elif len(imported_names) != len(new_names):
+			parser.error(f'imported_names and new_names need to have the same length, got {len(imported_names)} imported_names and {len(new_names)} new_names')
+		else:
+			options['name_correspondance'] = {imported_names[i]: new_names[i] for i in range(len(imported_names))}
+
+		return options
+
+	def get_parser(self):
 		parser = argparse.ArgumentParser(description='This command allow you to import objects or scene to a blend file and save it once done.')
+		parser.add_argument('-M', '--manifest',
+							help='Path to a json manifest holding the options below, read instead of the command line. Lists of names are not limited by the command line length there, and name collisions are given as a {bpy.data collection name: {imported_name: new_name}} "rename_map" dict, or as a {imported_name: new_name} "name_correspondance" dict for objects only. A "source_layout" dict, as returned by Snapshot.source_layout, is read instead of linking the source scene to analyse it',
+							required=False)
 
 		file_group = parser.add_argument_group('File path')
 		file_group.add_argument('-f', '--source_file', nargs='?',
@@ -56,13 +187,13 @@ class ImportCommand():
 							default='APPEND',
 							help='Determine if the data is linked or appended from source file',
 							required=True)
-		import_option_group.add_argument('-X', '--export_to_clean_file', default=True,
+		import_option_group.add_argument('-X', '--export_to_clean_file', type=str_to_bool, default=True,
 							help='If enabled, data is imported in a clean file, otherwise it will be imported in the default startup file',
 							required=True)
-		import_option_group.add_argument('-p', '--pack_external_data', default=False,
+		import_option_group.add_argument('-p', '--pack_external_data', type=str_to_bool, default=False,
 					 		help='If enabled, all external data will be packed into blend file',
 							required=True)
-		import_option_group.add_argument('-C', '--export_object_children', default=False,
+		import_option_group.add_argument('-C', '--export_object_children', type=str_to_bool, default=False,
 							help='if enabled, all listed object children will be exported',
 							required=True)
 		import_option_group.add_argument('-S', '--source_scene_name',
@@ -73,154 +204,160 @@ class ImportCommand():
 							required=True)
 
 		collection_hierarchy_group = parser.add_argument_group('Collection Hierarchy')
-		collection_hierarchy_group.add_argument('-c', '--create_collection_hierarchy', default=True,
+		collection_hierarchy_group.add_argument('-c', '--create_collection_hierarchy', type=str_to_bool, default=True,
 							help='If enabled, the collection hierarchy of each objects will be created',
 							required=True)
-		collection_hierarchy_group.add_argument('-N', '--export_in_new_collection', default=False,
+		collection_hierarchy_group.add_argument('-N', '--export_in_new_collection', type=str_to_bool, default=False,
 							help='If enabled, all objects and dependencies will be placed in a new collection',
 							required=True)
 		collection_hierarchy_group.add_argument('-n', '--new_collection_name', default='Root Collection',
 							help='The name of the new collection that will be created',
 							required=True)
-		collection_hierarchy_group.add_argument('-D', '--dependencies_in_dedicated_collection', default=False,
+		collection_hierarchy_group.add_argument('-D', '--dependencies_in_dedicated_collection', type=str_to_bool, default=False,
 					  		help='If enabled, the dependencies of each objects will be placed in a "Dependencies" collection, otherwise they will be placed in ther respective collection if --create_collection_hierarchy is True or in root collection if False',
 							required=True)
 		
 		name_collision_group = parser.add_argument_group('Name Collsion')
 		name_collision_group.add_argument('-i', '--imported_names', nargs='+',
-									help='Each object matching "imported_names" names will be renamed to "new_name" after import, both list need to have the same length',
+									help='Each object matching "imported_names" names in source file will be renamed to the next valid "new_name" as it is imported, both list need to have the same length',
 									required=False)
 		name_collision_group.add_argument('-x', '--new_names', nargs='+',
-									help='Each object matching "imported_names" names will be renamed to "new_name" after import, both list need to have the same length',
+									help='Each object matching "imported_names" names in source file will be renamed to the next valid "new_name" as it is imported, both list need to have the same length',
 								   required=False)
+		name_collision_group.add_argument('-U', '--incremental', type=str_to_bool, default=False,
+									help='Only export the objects whose fingerprint changed since they were exported to the destination file, and replace their previous export. The fingerprints are given as a {object name: fingerprint} "fingerprints" dict of the manifest',
+									required=False)
+		name_collision_group.add_argument('-I', '--name_index', type=str_to_bool, default=False,
+									help='Write the datablock names of the destination file to a <destination>_eab_index.json sidecar once saved, and seed the names from the sidecar when appending to an unchanged destination file',
+									required=False)
 
 								   
 
 		debug_group = parser.add_argument_group('Collection Hierarchy')
-		debug_group.add_argument('-P', '--print_debug', default=False,
+		debug_group.add_argument('-P', '--print_debug', type=str_to_bool, default=False,
 										  help='Print debug message in console',
 										  required=False)
-		args = parser.parse_args(argv)
-		self.source_file = args.source_file
-		self.destination_file = args.destination_file
-		self.source_data = args.source_data
-		self.file_override = args.file_override
-		self.target_scene = args.target_scene
-		self.export_mode = args.export_mode
-		self.export_to_clean_file = eval(args.export_to_clean_file)
-		self.pack_external_data = eval(args.pack_external_data)
-		self.export_object_children = eval(args.export_object_children)
-		self.source_scene_name = args.source_scene_name
-		self.source_object_list = args.source_object_list
-		self.create_collection_hierarchy = eval(args.create_collection_hierarchy)
-		self.export_in_new_collection = eval(args.export_in_new_collection)
-		self.new_collection_name = args.new_collection_name
-		self.dependencies_in_dedicated_collection = eval(args.dependencies_in_dedicated_collection)
-
-		imported_names = args.imported_names
-		new_names = args.new_names
-
-		if imported_names is None or new_names is None:
-			self.name_correspondance = {}
-		else:
-			if len(imported_names) != len(new_names):
-				self.log.error('imported_names and new_names need to have the same length')
-				self.log.error(f'new_names = {new_names}')
-				self.log.error(f'imported_names = {imported_names}')
-				sys.exit()
-			else:
-				self.name_correspondance = {imported_names[i]: new_names[i] for i in range(len(imported_names))}
-		
-		self.print_debug = eval(args.print_debug)
+		debug_group.add_argument('-R', '--report_file', default=None,
+										  help='Path to the json report the phase timings and datablock counts are written to',
+										  required=False)
+		debug_group.add_argument('-F', '--profile', choices=PROFILE_MODES, default='NONE',
+										  help='Profile the command with cProfile, and with tracemalloc in MEMORY mode. Results are written next to the destination file',
+										  required=False)
+		return parser
+
+	def set_options(self, options):
+		self.source_file = options['source_file']
+		self.destination_file = options['destination_file']
+		self.source_data = options.get('source_data', 'OBJECTS')
+		self.file_override = options.get('file_override', 'OVERRIDE')
+		self.target_scene = options.get('target_scene', 'ACTIVE_SCENE')
+		self.export_mode = options.get('export_mode', 'APPEND')
+		self.export_to_clean_file = options.get('export_to_clean_file', True)
+		self.pack_external_data = options.get('pack_external_data', False)
+		self.export_object_children = options.get('export_object_children', False)
+		self.source_scene_name = options['source_scene_name']
+		self.source_object_list = list(options.get('source_object_list') or [])
+		self.create_collection_hierarchy = options.get('create_collection_hierarchy', True)
+		self.export_in_new_collection = options.get('export_in_new_collection', False)
+		self.new_collection_name = options.get('new_collection_name', 'Root Collection')
+		self.dependencies_in_dedicated_collection = options.get('dependencies_in_dedicated_collection', False)
+		# {bpy.data collection name: {imported name: new base name}}, the name_correspondance being the one of objects
+		self.rename_map = {d: dict(names) for d, names in (options.get('rename_map') or {}).items()}
+		self.rename_map.setdefault('objects', {}).update(options.get('name_correspondance') or {})
+		self.name_correspondance = self.rename_map['objects']
+		self.name_index = options.get('name_index', False)
+		# Objects are updated in place when appending to a destination file holding their previous export
+		self.incremental = options.get('incremental', False) and self.file_override == 'APPEND_LINK' and self.export_mode == 'APPEND'
+		self.fingerprints = options.get('fingerprints') or {}
+		self.source_layout = options.get('source_layout')
+		self.print_debug = options.get('print_debug', False)
+		self.report_file = options.get('report_file')
+		self.profile = options.get('profile', 'NONE')
 	
+	@property
+	def source_libraries(self):
+		return [l for l in bpy.data.libraries if self.conform_path(l.filepath) == self.conform_path(self.source_file)]
+
 	def init_source_lists(self):
+		self.source_library_objects = None
+		self.imported_childs = []
+
+		# The scene is appended as a whole, no need to analyse source file
+		if self.source_data == 'SCENE':
+			self.log_parameters()
+			return
+
 		# register previously loaded libraries
-		self.previous_library_objects = {	o.name: o for o in bpy.data.objects if
-											o.library is not None and
-											self.conform_path(o.library.filepath) == self.conform_path(self.source_file)}
-		self.previous_library_collections = {	c.name: c for c in bpy.data.collections if
-												c.library is not None and
-												self.conform_path(c.library.filepath) == self.conform_path(self.source_file)}
-		self.previous_library_scenes = {s.name: s for s in bpy.data.scenes if
-										s.library is not None and
-										self.conform_path(s.library.filepath) == self.conform_path(self.source_file)}
+		previous_libraries = self.source_libraries
+		self.previous_library_objects = {o.name: o for o in bpy.data.objects if o.library in previous_libraries}
+		self.previous_library_collections = {c.name: c for c in bpy.data.collections if c.library in previous_libraries}
+		self.previous_library_scenes = {s.name: s for s in bpy.data.scenes if s.library in previous_libraries}
 
 		self.previous_collections = {	c.name: c for c in bpy.data.collections}
 
-		with bpy.data.libraries.load(self.source_file, link=True) as (data_from, data_to):
-			for s in data_from.scenes:
-				data_to.scenes.append(s)
-			for c in data_from.collections:
-				data_to.collections.append(c)
-			for o in data_from.objects:
-				data_to.objects.append(o)
-
-		# register imported library datas
-		objects = {	o.name: o for o in bpy.data.objects if
-					o.library is not None and
-					self.conform_path(o.library.filepath) == self.conform_path(self.source_file)}
-		collections = {	c.name: c for c in bpy.data.collections if
-						c.library is not None and
-				  		self.conform_path(c.library.filepath) == self.conform_path(self.source_file)}
-		scenes = {	s.name:s for s in bpy.data.scenes if
-					s.library is not None and
-					self.conform_path(s.library.filepath) == self.conform_path(self.source_file)}
+		# The layout given by the export session replaces the analysis of the linked source scene
+		if self.source_layout is None:
+			with self.timer.phase('link_source'):
+				layout = self.link_source_layout()
+		else:
+			layout = self.source_layout
+		objects = layout['objects']
 
 		# register object children
 		self.objects_children = {}
-		object_to_process = self.source_object_list.copy()
+		children_map = {}
+		for n, o in objects.items():
+			if o['parent'] is not None:
+				children_map.setdefault(o['parent'], []).append(n)
+		object_to_process = deque(self.source_object_list)
+		queued_objects = set(self.source_object_list)
+		exported_objects = set(self.source_object_list)
 
 		while len(object_to_process):
-			o = object_to_process.pop(0)
-			self.objects_children[o] = U.get_object_children(objects[o])
-			if len(self.objects_children[o]):
-				for c in self.objects_children[o]:
-					if c not in object_to_process:
-						object_to_process.append(c)
-					if self.export_object_children and c not in self.source_object_list:
-						self.source_object_list.append(c)
-		if self.export_object_children:
-			for c in self.objects_children.values():
-				for cc in c:
-					if cc not in objects.keys():
-						o = bpy.data.objects[cc]
-						if o.library is not None and os.path.normpath(o.library.filepath) == os.path.normpath(self.source_file):
-							objects[cc] = o
+			o = object_to_process.popleft()
+			self.objects_children[o] = list(children_map.get(o, []))
+			for c in self.objects_children[o]:
+				if c not in queued_objects:
+					queued_objects.add(c)
+					object_to_process.append(c)
+				if self.export_object_children and c not in exported_objects:
+					exported_objects.add(c)
+					self.source_object_list.append(c)
 		
-		# register object depencencies
-		self.object_dependencies = {}
-		self.dependency_object_list = []
-		for o in objects.values():
-			dep = ObjectDependencies(o)
-			self.object_dependencies[o.name] = dep.dependencies
-			self.dependency_object_list += dep.dependency_objects
+		# register object depencencies, only for objects that will be exported
+		with self.timer.phase('dependency_closure'):
+			self.dependency_object_list = self.dependency_closure(objects, [n for n in self.source_object_list if n in objects.keys()])
+		self.object_dependencies = {n: o['dependencies'] for n, o in objects.items()}
+		self.source_parents = {n: o['parent'] for n, o in objects.items()}
 
 		for o in self.dependency_object_list:
-			if o not in self.source_object_list:
+			if o not in exported_objects:
+				exported_objects.add(o)
 				self.source_object_list.append(o)
 
 		# register parent collections
-		self.parent_collections = self.parent_lookup(scenes[self.source_scene_name].collection)
+		self.collection_ancestry = CollectionAncestry.from_parents(layout['root_collection_name'], layout['root_parents'], layout['parents'])
+		self.parent_collections = self.parent_lookup()
 
 		self.selected_objects_parent_collection = {}
 		for o in self.source_object_list:
-			self.selected_objects_parent_collection[o] = [c.name for c in objects[o].users_collection]
+			self.selected_objects_parent_collection[o] = list(objects[o]['collections'])
 			if o not in self.objects_children.keys():
 				continue
 			for c in self.objects_children[o]:
-				self.selected_objects_parent_collection[c] = [cc.name for cc in objects[c].users_collection]
+				self.selected_objects_parent_collection[c] = list(objects[c]['collections'])
 		
 		# register root collection name
-		self.root_collection_name = scenes[self.source_scene_name].collection.name
+		self.root_collection_name = layout['root_collection_name']
 
 		# register collections in scene
-		self.collections_in_scene = [c.name for c in collections.values() if scenes[self.source_scene_name].user_of_id(c)]
+		self.collections_in_scene = list(layout['collections_in_scene'])
 
 		# register object_collection_hierarchy
-		self.objects_collection_hierarchy = self.get_objects_collection_hierarchy([o for o in objects.values() if o.name in self.source_object_list], self.collections_in_scene, collections.values())
+		self.objects_collection_hierarchy = self.get_objects_collection_hierarchy({n: objects[n]['collections'] for n in self.source_object_list}, self.collections_in_scene)
 
 		# register objects collection list
-		self.objects_collection_list = [scenes[self.source_scene_name].collection.name]
+		self.objects_collection_list = [self.root_collection_name]
 		for c in self.objects_collection_hierarchy.values():
 			for cc in c:
 				if cc not in self.objects_collection_list:
@@ -228,75 +365,137 @@ class ImportCommand():
 
 		# register all objects collection hierarchy
 		self.all_objects_collection_hierarchy = {}
-		for o in objects.values():
+		for n in self.source_object_list:
 			hierarchies = []
-			for c in o.users_collection:
-				if c.name in self.previous_collections.keys():
+			for c in objects[n]['collections']:
+				if c in self.previous_collections.keys():
 					continue
 				coll = []
-				self.get_parent_collection_names(c, coll, collections.values())
+				self.get_parent_collection_names(c, coll)
 				hierarchies.append(coll)
-			self.all_objects_collection_hierarchy[o.name] = hierarchies
-
-		self.imported_childs = []
+			self.all_objects_collection_hierarchy[n] = hierarchies
 
-		# remove objects and collections
-		self.remove_source_library()
+		self.timer.count('source_objects', len(objects))
+		self.timer.count('source_collections', len(layout['parents']))
+		self.timer.count('exported_objects', len(self.source_object_list))
+		self.timer.count('dependency_objects', len(self.dependency_object_list))
 		
-		# log all registered parameters
-		self.log.info(f'source_file = {self.source_file}')
-		self.log.info(f'destination_file = {self.destination_file}')
-		self.log.info(f'source_data = {self.source_data}')
-		self.log.info(f'file_override = {self.file_override}')
-		self.log.info(f'export_mode = {self.export_mode}')
-		self.log.info(f'export_to_clean_file = {self.export_to_clean_file}')
-		self.log.info(f'pack_external_data = {self.pack_external_data}')
-		self.log.info(f'source_scene_name = {self.source_scene_name}')
-		self.log.info(f'source_object_list = {self.source_object_list}')
-		self.log.info(f'export_object_children = {self.export_object_children}')
-		self.log.info(f'create_collection_hierarchy = {self.create_collection_hierarchy}')
-		self.log.info(f'export_in_new_collection = {self.export_in_new_collection}')
-		self.log.info(f'new_collection_name = {self.new_collection_name}')
-		self.log.info(f'dependencies_in_dedicated_collection = {self.dependencies_in_dedicated_collection}')
-		self.log.info(f'print_debug = {self.print_debug}')
-
-
-		self.log.info(f'collections_in_scene = {self.collections_in_scene}')
-		self.log.info(f'parent_collections = {self.parent_collections}')
-		self.log.info(f'selected_objects_parent_collection = {self.selected_objects_parent_collection}')
-		self.log.info(f'root_collection_name = {self.root_collection_name}')
-		self.log.info(f'objects_collection_list = {self.objects_collection_list}')
-		self.log.info(f'objects_collection_hierarchy = {self.objects_collection_hierarchy}')
-		self.log.info(f'all_objects_collection_hierarchy = {self.all_objects_collection_hierarchy}')
-		self.log.info(f'objects_children = {self.objects_children}')
-		self.log.info(f'object_dependencies = {self.object_dependencies}')
-		self.log.info(f'dependency_object_list = {self.dependency_object_list}')
-		self.log.info(f'name_correspondance = {self.name_correspondance}')
+		self.log_parameters()
+		self.log.info(lambda: f'collections_in_scene = {self.collections_in_scene}')
+		self.log.info(lambda: f'parent_collections = {self.parent_collections}')
+		self.log.info(lambda: f'selected_objects_parent_collection = {self.selected_objects_parent_collection}')
+		self.log.info(lambda: f'root_collection_name = {self.root_collection_name}')
+		self.log.info(lambda: f'objects_collection_list = {self.objects_collection_list}')
+		self.log.info(lambda: f'objects_collection_hierarchy = {self.objects_collection_hierarchy}')
+		self.log.info(lambda: f'all_objects_collection_hierarchy = {self.all_objects_collection_hierarchy}')
+		self.log.info(lambda: f'objects_children = {self.objects_children}')
+		self.log.info(lambda: f'object_dependencies = {self.object_dependencies}')
+		self.log.info(lambda: f'dependency_object_list = {self.dependency_object_list}')
+		self.log.info(lambda: f'rename_map = {self.rename_map}')
+
+	def link_source_layout(self):
+		"""Link the source scene and the listed objects, return their layout"""
+		# Only link the source scene and the listed objects, the data they reference is linked indirectly
+		source_object_names = set(self.source_object_list)
+		with bpy.data.libraries.load(self.source_file, link=True) as (data_from, data_to):
+			data_to.scenes = [s for s in data_from.scenes if s == self.source_scene_name]
+			data_to.objects = [o for o in data_from.objects if o in source_object_names]
+
+		if not len(data_to.scenes) or data_to.scenes[0] is None:
+			self.log.error(lambda: f'Scene "{self.source_scene_name}" not found in "{self.source_file}"')
+			sys.exit()
+
+		source_scene = data_to.scenes[0]
+		library = source_scene.library
+		objects = {o.name: o for o in bpy.data.objects if o.library == library}
+		collections = [c for c in bpy.data.collections if c.library == library]
+		layout = Snapshot(source_scene, [objects[n] for n in self.source_object_list if n in objects.keys()], self.print_debug).source_layout(collections)
+
+		# Linked objects are reused by link_objects, otherwise remove objects and collections before appending them
+		if self.export_mode == 'LINK':
+			self.source_library_objects = objects
+			self.source_scene = source_scene
+		else:
+			with self.timer.phase('remove_source_library'):
+				self.remove_source_library()
+
+		return layout
+
+	def dependency_closure(self, objects, names):
+		"""Return the names of the objects the given objects depend on, directly or not, excluding the given objects"""
+		selection = set(names)
+		dependencies = {}
+		visited = set()
+		objects_to_process = list(names)
+		while len(objects_to_process):
+			n = objects_to_process.pop()
+			if n in visited:
+				continue
+			visited.add(n)
+			for r in objects[n]['references']:
+				if r in selection or r in dependencies.keys() or r not in objects.keys():
+					continue
+				self.log.info(lambda: f'"{n}" depends on "{r}"')
+				dependencies[r] = None
+				objects_to_process.append(r)
+
+		return list(dependencies.keys())
+
+	def log_parameters(self):
+		self.log.info(lambda: f'source_file = {self.source_file}')
+		self.log.info(lambda: f'destination_file = {self.destination_file}')
+		self.log.info(lambda: f'source_data = {self.source_data}')
+		self.log.info(lambda: f'file_override = {self.file_override}')
+		self.log.info(lambda: f'export_mode = {self.export_mode}')
+		self.log.info(lambda: f'export_to_clean_file = {self.export_to_clean_file}')
+		self.log.info(lambda: f'pack_external_data = {self.pack_external_data}')
+		self.log.info(lambda: f'source_scene_name = {self.source_scene_name}')
+		self.log.info(lambda: f'source_object_list = {self.source_object_list}')
+		self.log.info(lambda: f'export_object_children = {self.export_object_children}')
+		self.log.info(lambda: f'create_collection_hierarchy = {self.create_collection_hierarchy}')
+		self.log.info(lambda: f'export_in_new_collection = {self.export_in_new_collection}')
+		self.log.info(lambda: f'new_collection_name = {self.new_collection_name}')
+		self.log.info(lambda: f'dependencies_in_dedicated_collection = {self.dependencies_in_dedicated_collection}')
+		self.log.info(lambda: f'print_debug = {self.print_debug}')
 
 	def import_command(self):
-		if self.export_to_clean_file and self.file_override == "OVERRIDE":
-			self.clean_file()
-
-		self.initial_count = len(bpy.context.scene.objects)
-
-		if self.source_data == 'SCENE':
-			self.import_scene()
-		elif self.source_data == 'OBJECTS':
-			self.import_objects()
-
-		# Pack Files
-		if self.pack_external_data and self.export_mode == 'APPEND':
-			try:
-				bpy.ops.file.pack_all()
-
-			except RuntimeError as e:
-				self.log.error("Cannot pack data or data does not exist on drive.  " + e)
-
-		# Save File
-		bpy.ops.wm.save_as_mainfile('EXEC_DEFAULT', filepath=self.destination_file)
+		if self.up_to_date:
+			self.timer.write()
+			return
+
+		with self.profiler.phase('import_command'):
+			self.initial_count = len(bpy.context.scene.objects)
+
+			if self.source_data == 'SCENE':
+				with self.timer.phase('import_scene'):
+					self.import_scene()
+			elif self.source_data == 'OBJECTS':
+				self.import_objects()
+
+			# Pack Files
+			if self.pack_external_data and self.export_mode == 'APPEND':
+				try:
+					with self.timer.phase('pack_all'):
+						bpy.ops.file.pack_all()
+
+				except RuntimeError as e:
+					self.log.error(lambda: f'Cannot pack data or data does not exist on drive. {e}')
+
+			# Save File
+			with self.timer.phase('save_as_mainfile'):
+				bpy.ops.wm.save_as_mainfile('EXEC_DEFAULT', filepath=self.destination_file)
+			if self.name_index:
+				with self.timer.phase('write_name_index'):
+					self.write_name_index()
+
+		if self.timer.enabled:
+			for d, count in U.get_datablock_counts().items():
+				self.timer.count(f'destination_{d}', count)
+			self.timer.count('destination_file_size', os.path.getsize(self.destination_file))
+		self.timer.write()
 
 	def import_scene(self):
-		self.log.info(f"Importing Scene {self.source_scene_name}")
+		self.log.info(lambda: f"Importing Scene {self.source_scene_name}")
 
 		filepath = os.path.join(self.source_file, 'Scene', self.source_scene_name)
 		directory = os.path.join(self.source_file, 'Scene')
@@ -314,9 +513,9 @@ class ImportCommand():
 	def import_objects(self):
 		if self.target_scene != 'ACTIVE_SCENE':
 			if self.target_scene not in bpy.data.scenes:
-				self.log.error(f'The target scene "{self.target_scene}" doesn\'t exists in the file, the objects will be placed in the current scene')
+				self.log.error(lambda: f'The target scene "{self.target_scene}" doesn\'t exists in the file, the objects will be placed in the current scene')
 			else:
-				self.log.info(f'Switching to "{self.target_scene}" scene')
+				self.log.info(lambda: f'Switching to "{self.target_scene}" scene')
 				bpy.context.window.scene = bpy.data.scenes[self.target_scene]
 
 		self.log.info("Importing Objects")
@@ -330,7 +529,9 @@ class ImportCommand():
 		self.cm.set_collection_active(IMPORT_COLLECTION_NAME)
 
 		# Link object from source file
-		self.link_objects(self.source_file, self.source_object_list, bpy.data.collections[IMPORT_COLLECTION_NAME], self.export_mode == 'LINK')
+		with self.timer.phase('link_objects'):
+			self.link_objects(self.source_file, self.source_object_list, bpy.data.collections[IMPORT_COLLECTION_NAME], self.export_mode == 'LINK')
+		self.timer.count('imported_objects', len(self.imported_objects))
 
 		self.have_dependencies = len(bpy.data.collections[IMPORT_COLLECTION_NAME].objects) > len(self.source_object_list)
 
@@ -347,36 +548,42 @@ class ImportCommand():
 			self.root_collection = self.scene_root_collection
   
 		# Create Collection Hierarchy
-		if self.create_collection_hierarchy:
-			self.create_and_link_collection_hierarchy()
-		
-		if self.dependencies_in_dedicated_collection:
-			self.link_dependencies_in_dedicated_collection()
-		elif not self.dependencies_in_dedicated_collection and self.create_collection_hierarchy:
-			self.link_dependencies_in_their_respective_collection()
+		with self.timer.phase('collection_hierarchy'):
+			if self.create_collection_hierarchy:
+				self.create_and_link_collection_hierarchy()
+			
+			if self.dependencies_in_dedicated_collection:
+				self.link_dependencies_in_dedicated_collection()
+			elif not self.dependencies_in_dedicated_collection and self.create_collection_hierarchy:
+				self.link_dependencies_in_their_respective_collection()
   
 		# Remove Import Collection and make local if needed
 		bpy.data.collections.remove(bpy.data.collections[IMPORT_COLLECTION_NAME])
 
 		if self.export_object_children:
-			self.parent_children_hierarchy()
+			with self.timer.phase('parent_children_hierarchy'):
+				self.parent_children_hierarchy()
 		# else:
 		# 	self.remove_objects_chilren()
-			
-		if self.export_mode == 'APPEND':
-			for imported_name, new_name in self.name_correspondance.items():
-				new_name = self.om.get_next_valid_name(new_name)
-				self.log.info(f'Renaming object "{imported_name}" to "{new_name}"')
-				bpy.data.objects[imported_name].name = new_name
+
+		if self.incremental:
+			with self.timer.phase('replace_previous_exports'):
+				self.replace_previous_ids()
+				self.replace_previous_exports()
+
+		# Source scene was only linked to analyse source file
+		if self.source_library_objects is not None and self.source_scene_name not in self.previous_library_scenes.keys():
+			self.log.info(lambda: f'Remove linked scene : {self.source_scene_name}')
+			bpy.data.scenes.remove(self.source_scene)
 
 	# Main Flow Methods
 	def create_and_link_to_new_collection(self):
 		if self.new_collection_name == '':
-			self.log.warning(f'New collection name is empty, skipping root collection creation.')
+			self.log.warning(lambda: f'New collection name is empty, skipping root collection creation.')
 			self.report({'ERROR'}, 'Export As Blend : New collection name is empty, skipping root collection creation.')
 			self.export_in_new_collection = False
 		else:
-			self.log.info(f'Creating "{self.new_collection_name}" new collection and move imported files to it')
+			self.log.info(lambda: f'Creating "{self.new_collection_name}" new collection and move imported files to it')
 			self.root_collection = self.cm.create_collection(self.new_collection_name)
 			self.cm.link_collection_to_collection(bpy.data.collections[self.new_collection_name], self.scene_root_collection)
 			for o in self.imported_objects.values():
@@ -435,14 +642,14 @@ class ImportCommand():
 	def link_dependencies_in_dedicated_collection(self):
 		if self.have_dependencies:
 			dependency_collection = self.cm.add_element(DEPENDENCIES_COLLECTION_NAME)
-			self.log.info(f'Link Dependencies in "{dependency_collection.name}" collection')
+			self.log.info(lambda: f'Link Dependencies in "{dependency_collection.name}" collection')
 			dependency_collection = self.cm.create_collection(dependency_collection.name)
 			self.cm.link_collection_to_collection(dependency_collection, self.root_collection)
 
 			for o in self.imported_objects.keys():
 				if o in self.source_object_list:
 					continue
-				if o not in self.root_collection.objects:
+				if self.imported_objects[o].name not in self.root_collection.objects:
 					continue
 
 				self.cm.move_object_to_collection(self.imported_objects[o], self.root_collection, dependency_collection)
@@ -454,12 +661,12 @@ class ImportCommand():
 				if o in self.source_object_list:
 					continue
 
-				self.log.info(f'Linking Dependency object "{o}"')
+				self.log.info(lambda: f'Linking Dependency object "{o}"')
 	
 				for obj, h in self.all_objects_collection_hierarchy.items():
 					if obj != o:
 						continue
-					if obj not in self.root_collection.objects:
+					if self.imported_objects[obj].name not in self.root_collection.objects:
 						continue
 					for hh in h:
 						hierarchy = list(reversed(hh))
@@ -494,9 +701,9 @@ class ImportCommand():
 
 			for c in children:
 				if c not in self.source_object_list:
-					c = self.om.add_element(bpy.data.objects[c])
+					c = self.om.add_element(self.imported_objects[c])
 					if c in bpy.data.objects:
-						self.log.info(f'Remove object children : "{c.name}"')
+						self.log.info(lambda: f'Remove object children : "{c.name}"')
 						bpy.data.objects.remove(bpy.data.objects[c.name])
 	
 	def clean_file(self):
@@ -514,36 +721,29 @@ class ImportCommand():
 						p.remove(e)
 
 	def link_objects(self, blend_file, object_names, collection, is_link):
-		self.log.info(f'Linking objects from source file {blend_file} to Collection {collection}')
+		self.log.info(lambda: f'Linking objects from source file {blend_file} to Collection {collection}')
 		imported_objects = []
-		def library_link_all(data_blocks, libpath, collection):
+		self.imported_dependencies = {}
+		self.previous_ids = {}
+		self.appended_ids = {}
+		def library_link_all(data_blocks, collection):
 			for x in data_blocks:
-				if x.name not in imported_objects:
-					continue
-
-				if self.export_mode == 'LINK':
-					if x.library is not None:
-						if self.conform_path(libpath) == self.conform_path(x.library.filepath):
-							link_to_collection(x, collection)
-				else:
-					link_to_collection(x, collection)
+				link_to_collection(x, collection)
 						
 		def link_to_collection(object, collection):
 			if object.name in self.imported_childs:
-				self.log.info(f'Linking child "{object.name}" to collection "{collection.name}"')
+				self.log.info(lambda: f'Linking child "{object.name}" to collection "{collection.name}"')
 			else:
-				self.log.info(f'Linking "{object.name}" to collection "{collection.name}"')
+				self.log.info(lambda: f'Linking "{object.name}" to collection "{collection.name}"')
 			collection.objects.link(object)
 		
-		def load_loop(data_from, data_to, object_to_include):
-			object_to_include = object_to_include.copy()
-			for name in data_from.objects:
+		def load_loop(available_objects, object_to_include):
+			object_to_include = set(object_to_include)
+			for name in available_objects:
 				# Import objects
 				if name in object_to_include:
-					if name not in data_to.objects:
-						self.log.info(f'Importing : {name}')
-						data_to.objects.append(name)
 					if name not in imported_objects:
+						self.log.info(lambda: f'Importing : {name}')
 						imported_objects.append(name)
 
 				if self.export_object_children:
@@ -554,100 +754,199 @@ class ImportCommand():
 					for c in children:
 						if c not in self.imported_childs:
 							self.imported_childs.append(c)
-						if c not in data_to.objects:
-							self.log.info(f'Importing child : {c}')
-							data_to.objects.append(c)
 						if c not in imported_objects:
+							self.log.info(lambda: f'Importing child : {c}')
 							imported_objects.append(c)
 
 		# Link objects
-		with bpy.data.libraries.load(blend_file, link=is_link) as (data_from, data_to):
-			load_loop(data_from, data_to, object_names)
-
-		self.imported_objects = {o.name:o for o in bpy.data.objects if o.name in imported_objects}
-
-		library_link_all(bpy.data.objects, blend_file, collection)
+		if is_link and self.source_library_objects is not None:
+			# Reuse the objects linked while analysing source file
+			load_loop(self.source_library_objects.keys(), object_names)
+			loaded_objects = [self.source_library_objects.get(n) for n in imported_objects]
+		else:
+			renamed_ids = {}
+			dependencies = []
+			# The datablocks already in destination file, to tell the appended ones apart
+			local_ids = self.get_shared_ids() if self.incremental else {}
+			with bpy.data.libraries.load(blend_file, link=is_link) as (data_from, data_to):
+				load_loop(data_from.objects, object_names)
+				# Dependencies are requested too, so their previous export can be found
+				if self.incremental:
+					dependencies = self.incremental_dependencies(imported_objects)
+				data_to.objects = imported_objects + dependencies
+				# Colliding datablocks are appended in the same load as the objects using them, so they are the datablocks the objects use
+				if not is_link:
+					for d, names in self.rename_map.items():
+						if d == 'objects' or not hasattr(data_from, d):
+							continue
+						available = set(getattr(data_from, d))
+						renamed_ids[d] = [n for n in names.keys() if n in available]
+						setattr(data_to, d, renamed_ids[d].copy())
+			loaded_objects = data_to.objects[:len(imported_objects)]
+			self.imported_dependencies = {n: o for n, o in zip(dependencies, data_to.objects[len(imported_objects):]) if o is not None}
+			self.imported_ids = {d: {n: i for n, i in zip(names, getattr(data_to, d)) if i is not None} for d, names in renamed_ids.items()}
+			if self.incremental:
+				self.previous_ids, self.appended_ids = self.find_appended_ids(local_ids)
+
+		# Imported objects are registered by their name in source file : appended objects can be renamed by Blender on name collision
+		self.imported_objects = {n: o for n, o in zip(imported_objects, loaded_objects) if o is not None}
+
+		if not is_link:
+			self.rename_imported_objects()
+			self.rename_imported_ids()
+
+		library_link_all(self.imported_objects.values(), collection)
 
 		if self.export_object_children:
 			self.ordered_children = self.reorder_list_child_first(list(self.imported_objects.values()), include_parent=True)
-			self.log.info(f'ordered_children = {self.ordered_children}')
+			self.log.info(lambda: f'ordered_children = {self.ordered_children}')
 	
-
-	def make_imported_objects_local(self):
-		self.log.info(f'Make all imported objects local')
-		if self.export_object_children:
-			object_list = self.ordered_children
-		else:
-			object_list = [bpy.data.objects[o] for o in self.imported_objects]
-
-		for o in object_list:
-			self.log.info(f'Make local : {o.name}')
-			obj = self.om.add_element(o, register=True)
-			o.make_local()
-			if o.data is None:
+	def rename_imported_objects(self):
+		for imported_name, new_name in self.name_correspondance.items():
+			if imported_name not in self.imported_objects.keys():
+				continue
+			o = self.imported_objects[imported_name]
+			new_name = self.om.get_next_valid_name(new_name)
+			self.log.info(lambda: f'Renaming object "{imported_name}" to "{new_name}"')
+			o.name = new_name
+			self.om.register_element_correspondance(o)
+
+
+	def incremental_dependencies(self, imported_objects):
+		"""Return the objects requested with the imported objects so their previous export can be found : their dependencies, and their parents that would be appended indirectly otherwise"""
+		requested = set(imported_objects)
+		dependencies = [n for n in self.dependency_object_list if n not in requested]
+		requested.update(dependencies)
+		for n in imported_objects + dependencies:
+			p = self.source_parents.get(n)
+			while p is not None and p not in requested:
+				requested.add(p)
+				dependencies.append(p)
+				p = self.source_parents.get(p)
+		return dependencies
+
+	def replace_previous_exports(self):
+		"""Unchanged objects appended again as children or dependencies are replaced by their previous export, changed objects replace their previous export.
+		Either way the references to the replaced object are remapped, and the remaining objects are marked with their fingerprint"""
+		replaced = 0
+		for source_name, o in dict(self.imported_dependencies, **self.imported_objects).items():
+			previous = self.previous_exports.get(source_name)
+			# Objects only brought along without a fingerprint can't be compared, their previous export is kept
+			unfingerprinted = source_name in self.imported_dependencies.keys() and source_name not in self.fingerprints.keys()
+			if previous is not None and (self.is_unchanged(source_name) or unfingerprinted):
+				self.log.info(lambda: f'Keeping previous export of "{source_name}" : "{previous.name}"')
+				self.replace_object(o, previous)
 				continue
-			
-			o.data.make_local()
-
-			layer = bpy.context.view_layer
-			layer.update()
 
-			self.om.update_element_name(o, o.name)
-			obj.name = o.name
+			if previous is not None:
+				self.log.info(lambda: f'Replacing previous export of "{source_name}" : "{previous.name}"')
+				name = previous.name
+				data = previous.data
+				self.replace_object(previous, o)
+				o.name = name
+				# The previous object data is orphan once replaced, its name is given to the new data
+				if data is not None and o.data is not None and data.users == 0 and data.id_type == o.data.id_type:
+					data_name = data.name
+					getattr(bpy.data, ID_CODES[ID_TYPE_CODES[data.id_type]]).remove(data)
+					o.data.name = data_name
+				replaced += 1
+
+			if source_name in self.fingerprints.keys():
+				o[SOURCE_NAME_PROPERTY] = source_name
+				o[FINGERPRINT_PROPERTY] = self.fingerprints[source_name]
+
+		self.timer.count('replaced_objects', replaced)
+
+	def get_shared_ids(self):
+		# Local datablocks of the types renamed on collision, objects aside
+		return {d: [i for i in getattr(bpy.data, d) if i.library is None] for c, d in ID_CODES.items() if c != 'OB' and c not in UNRENAMED_ID_CODES and hasattr(bpy.data, d)}
+
+	def find_appended_ids(self, local_ids):
+		"""Return the datablocks exported before and the datablocks just appended, by bpy.data collection then name in source file"""
+		previous_ids = {}
+		appended_ids = {}
+		for d, ids in self.get_shared_ids().items():
+			existing = set(local_ids.get(d, ()))
+			# Colliding datablocks are numbered by Blender, their source name is the one they were requested with
+			source_names = {i: n for n, i in self.imported_ids.get(d, {}).items()}
+			previous_ids[d] = {i[SOURCE_NAME_PROPERTY]: i for i in local_ids.get(d, ()) if SOURCE_NAME_PROPERTY in i.keys()}
+			appended_ids[d] = {source_names.get(i, i.name): i for i in ids if i not in existing}
+		return previous_ids, appended_ids
+
+	def replace_previous_ids(self):
+		"""Datablocks appended with the objects replace their previous export, instead of piling up as numbered copies.
+		Their users, the previous export of unchanged objects included, are remapped to the appended datablock, which takes the previous name"""
+		replaced = 0
+		for d, appended_ids in self.appended_ids.items():
+			for source_name, i in appended_ids.items():
+				previous = self.previous_ids[d].get(source_name)
+				if previous is not None:
+					self.log.info(lambda: f'Replacing previous export of {d} "{source_name}" : "{previous.name}"')
+					name = previous.name
+					previous.user_remap(i)
+					getattr(bpy.data, d).remove(previous)
+					i.name = name
+					replaced += 1
+				i[SOURCE_NAME_PROPERTY] = source_name
+
+		self.timer.count('replaced_ids', replaced)
+
+	def replace_object(self, old, new):
+		# The new object keeps its own collections, an object appended indirectly takes the ones of the old object
+		collections = list(old.users_collection)
+		for c in collections:
+			c.objects.unlink(old)
+		old.user_remap(new)
+		if not len(new.users_collection):
+			for c in collections:
+				c.objects.link(new)
+		bpy.data.objects.remove(old)
+
+	def rename_imported_ids(self):
+		# Blender numbers the colliding datablocks as they are appended, they are only renamed when the rename map gives them another base name
+		for d, imported_ids in self.imported_ids.items():
+			for imported_name, i in imported_ids.items():
+				new_name = self.rename_map[d][imported_name]
+				if new_name != imported_name:
+					i.name = new_name
+				self.log.info(lambda: f'{d} "{imported_name}" collides with destination file, imported as "{i.name}"')
 
 	def resolve_dependencies(self):
-		self.log.info(f'Resolve objects dependencies')
+		self.log.info(lambda: f'Resolve objects dependencies')
 		for e in self.om.element_list:
-			print(e.incoming_name, e.name, e.object.name)
+			self.log.debug(lambda: f'{e.incoming_name} {e.name} {e.object.name}')
 		for o in self.om.element_list:
-			dependency = ObjectDependencies(o.object, True)
+			dependency = ObjectDependencies(o.object, self.print_debug)
 			dependency.depenencies = self.object_dependencies[o.incoming_name]
 			dependency.resolve_dependencies(self.om)
 
-	# Traverse Tree and parent lookup from brockmann: https://blender.stackexchange.com/a/172581
-	def traverse_tree(self, t):
-		yield t
-		for child in t.children:
-			yield from self.traverse_tree(child)
-
-	def parent_lookup(self, coll):
-		parent_lookup = {}
-		for coll in self.traverse_tree(coll):
-			for c in coll.children.keys():
-				if c not in parent_lookup:
-					parent_lookup.setdefault(c, [coll.name])
-				else:
-					parent_lookup[c].append(coll.name)
-		return parent_lookup
-
-	def get_parent_collection_names(self, collection, parent_names, collection_data):
-		if collection.name not in parent_names:
-			parent_names.append(collection.name)
-		for parent_collection in collection_data:
-			if collection.name in parent_collection.children.keys():
-				if parent_collection.name not in parent_names:
-					parent_names.append(parent_collection.name)
-				self.get_parent_collection_names(
-					parent_collection, parent_names, collection_data)
-				return
+	def parent_lookup(self):
+		return self.collection_ancestry.parent_lookup()
+
+	def get_parent_collection_names(self, collection_name, parent_names):
+		for n in self.collection_ancestry.root_path(collection_name):
+			if n not in parent_names:
+				parent_names.append(n)
 
-	def get_objects_collection_hierarchy(self, objs, collections_in_scene, collection_data):
+	def get_objects_collection_hierarchy(self, object_collections, collections_in_scene):
+		collections_in_scene = set(collections_in_scene)
 		collection_hierarchy = {}
-		for obj in objs:
+		for obj, collections in object_collections.items():
 			parent_collection = []
-			for coll in obj.users_collection:
-				if coll.name not in collections_in_scene:
+			for coll in collections:
+				if coll not in collections_in_scene:
 					continue
-				self.get_parent_collection_names(coll, parent_collection, collection_data)
-				collection_hierarchy.setdefault(obj.name, parent_collection)
+				self.get_parent_collection_names(coll, parent_collection)
+				collection_hierarchy.setdefault(obj, parent_collection)
 		return collection_hierarchy
 	
 
 	def remove_source_library(self):
 		if len(self.previous_library_objects) or len(self.previous_library_collections) or len(self.previous_library_scenes):
-			objects = [o for o in bpy.data.objects if o.library is not None and self.conform_path(o.library.filepath) == self.conform_path(self.source_file) and o not in self.previous_library_objects.values()]
-			collections = [c for c in bpy.data.collections if c.library is not None and self.conform_path(c.library.filepath) == self.conform_path(self.source_file) and c not in self.previous_library_collections.values()]
-			scenes = [s for s in bpy.data.scenes if s.library is not None and self.conform_path(s.library.filepath) == os.path.normpath(self.source_file) and s not in self.previous_library_scenes.values()]
+			libraries = self.source_libraries
+			objects = [o for o in bpy.data.objects if o.library in libraries and o.name not in self.previous_library_objects.keys()]
+			collections = [c for c in bpy.data.collections if c.library in libraries and c.name not in self.previous_library_collections.keys()]
+			scenes = [s for s in bpy.data.scenes if s.library in libraries and s.name not in self.previous_library_scenes.keys()]
 
 			for o in objects :
 				bpy.data.objects.remove(o)
@@ -660,45 +959,21 @@ class ImportCommand():
 		else:
 			for l in bpy.data.libraries:
 				if l.name == os.path.basename(self.source_file):
-					self.log.info(f'Remove library : {self.source_file}')
+					self.log.info(lambda: f'Remove library : {self.source_file}')
 					bpy.data.libraries.remove(l)
 
 	def parent_children_hierarchy(self):
-		for o, c in self.objects_children.items():
-			p = self.om.add_element(bpy.data.objects[o])
-			for h in c:
-				cc = self.om.add_element(bpy.data.objects[h])
-				self.om.parent(p, cc, keep_transform=True)
+		# Children are parented before their own parent, in the order computed once the objects are imported
+		source_names = {o: n for n, o in self.imported_objects.items()}
+		parents = {c: p for p, children in self.objects_children.items() for c in children}
+		for o in self.ordered_children:
+			parent = parents.get(source_names.get(o))
+			if parent is None:
+				continue
+			self.om.parent(self.om.add_element(self.imported_objects[parent]), self.om.add_element(o), keep_transform=True)
 
 	def reorder_list_child_first(self, object_list, include_parent=False):
-		object_list = object_list.copy()
-		ordered_list = []
-		def insert_in_list(o, index):
-			if o not in ordered_list:
-				ordered_list.insert(index, o)
-
-		while len(object_list):
-			o = object_list.pop(0)
-			if not len(o.children):
-				insert_in_list(o, 0)
-			else:
-				if o.parent is None:
-					insert_in_list(o, len(ordered_list))
-				else:
-					if o.parent in ordered_list:
-						insert_in_list(o, ordered_list.index(o.parent)-1)
-					else:
-						if include_parent:
-							object_list.insert(0, o.parent)
-						insert_in_list(o, 0)
-					if len(o.children):
-						for c in o.children:
-							if c in ordered_list:
-								insert_in_list(o, ordered_list.index(c)+1)
-							else:
-								insert_in_list(o, 0)
-								insert_in_list(c, 0)
-		return ordered_list
+		return U.order_children_first(object_list, include_parent=include_parent)
 
 
 if __name__ == "__main__":
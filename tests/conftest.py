@@ -0,0 +1,11 @@
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(TESTS_DIR)
+sys.path.append(os.path.join(ADDON_DIR, 'benchmarks'))
+sys.path.append(ADDON_DIR)
+
+# eab_utils is imported outside of Blender, against the stand-in bpy of the benchmarks
+import fake_bpy
+fake_bpy.install()
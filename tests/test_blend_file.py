@@ -0,0 +1,110 @@
+import gzip
+import struct
+import pytest
+from eab_utils.blend_file import BlendFile, BlendFileError
+
+# Synthetic blend files : a few datablocks, a library with a linked object, and the DNA of the structs read
+DNA_NAMES = ['*next', '*prev', '*newid', '*lib', '*asset_data', 'name[66]', 'id', '*filedata', 'filepath[1024]', 'loc[3]']
+DNA_TYPES = ['char', 'float', 'ID', 'Library', 'Object', 'Scene']
+# struct type -> (field type, field name) of each field
+DNA_STRUCTS = [	(2, [(2, 0), (2, 1), (2, 2), (3, 3), (2, 4), (0, 5)]),
+				(3, [(2, 6), (2, 7), (0, 8)]),
+				(4, [(2, 6), (1, 9)]),
+				(5, [(2, 6)])]
+
+
+def pad(data):
+	return data + b'\0' * (-len(data) % 4)
+
+
+def sdna(endian, pointer_size):
+	id_size = 5 * pointer_size + 66
+	data = b'SDNA' + b'NAME' + struct.pack(f'{endian}i', len(DNA_NAMES)) + pad(b''.join(n.encode() + b'\0' for n in DNA_NAMES))
+	data += b'TYPE' + struct.pack(f'{endian}i', len(DNA_TYPES)) + pad(b''.join(t.encode() + b'\0' for t in DNA_TYPES))
+	data += b'TLEN' + pad(struct.pack(f'{endian}6h', 1, 4, id_size, 0, 0, 0))
+	data += b'STRC' + struct.pack(f'{endian}i', len(DNA_STRUCTS))
+	for type_index, fields in DNA_STRUCTS:
+		data += struct.pack(f'{endian}2h', type_index, len(fields)) + b''.join(struct.pack(f'{endian}2h', *f) for f in fields)
+	return data
+
+
+def id_struct(endian, pointer_size, name, library=0, extra=b''):
+	pointer = 'I' if pointer_size == 4 else 'Q'
+	return struct.pack(f'{endian}5{pointer}', 0, 0, 0, library, 0) + name.encode().ljust(66, b'\0') + extra
+
+
+def build_blend_file(endian='<', pointer_size=8, large_bhead=False, dna=None):
+	if large_bhead:
+		data = b'BLENDER17-01' + (b'v' if endian == '<' else b'V') + b'0500'
+		bhead = lambda code, block, old: struct.pack(f'{endian}4siQqq', code, 0, old, len(block), 1) + block
+	else:
+		data = b'BLENDER' + (b'_' if pointer_size == 4 else b'-') + (b'v' if endian == '<' else b'V') + b'402'
+		bhead = lambda code, block, old: struct.pack(f'{endian}4si{"I" if pointer_size == 4 else "Q"}ii', code, len(block), old, 0, 1) + block
+
+	ids = lambda name, library=0, extra=b'': id_struct(endian, pointer_size, name, library, extra)
+	data += bhead(b'REND', b'\0' * 72, 0)
+	data += bhead(b'OB\0\0', ids('OBCube', extra=b'\0' * 12), 10)
+	data += bhead(b'DATA', b'\0' * 5000, 0)
+	data += bhead(b'SC\0\0', ids('SCScene'), 11)
+	data += bhead(b'ME\0\0', ids('MECube.001', extra=b'\0' * 3000), 12)
+	data += bhead(b'LI\0\0', ids('LIlib.blend') + b'\0' * pointer_size + b'//lib.blend'.ljust(1024, b'\0'), 500)
+	data += bhead(b'ID\0\0', ids('OBLinked', library=500), 13)
+	data += bhead(b'DNA1', sdna(endian, pointer_size) if dna is None else dna, 0)
+	data += bhead(b'ENDB', b'', 0)
+	return data
+
+
+def write(tmp_path, data, compressed=False):
+	filepath = tmp_path / 'test.blend'
+	filepath.write_bytes(gzip.compress(data) if compressed else data)
+	return str(filepath)
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+@pytest.mark.parametrize('endian', ['<', '>'])
+@pytest.mark.parametrize('pointer_size, large_bhead', [(4, False), (8, False), (8, True)])
+def test_read_ids(tmp_path, compressed, endian, pointer_size, large_bhead):
+	blend_file = BlendFile(write(tmp_path, build_blend_file(endian, pointer_size, large_bhead), compressed))
+	assert blend_file.version == (500 if large_bhead else 402)
+	assert blend_file.pointer_size == pointer_size
+	assert blend_file.libraries == ['//lib.blend']
+	assert blend_file.id_names('OB') == ['Cube']
+	assert blend_file.id_names('OB', local=False) == ['Cube', 'Linked']
+	assert blend_file.ids['OB'][1] == ('Linked', '//lib.blend')
+	assert blend_file.id_names('SC') == ['Scene']
+	assert blend_file.id_names('ME') == ['Cube.001']
+	assert blend_file.id_names('MA') == []
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_truncated_file(tmp_path, compressed):
+	data = build_blend_file()
+	with pytest.raises(BlendFileError):
+		BlendFile(write(tmp_path, data[:len(data) // 2], compressed))
+
+
+def test_truncated_gzip_stream(tmp_path):
+	data = gzip.compress(build_blend_file())
+	with pytest.raises(BlendFileError):
+		BlendFile(write(tmp_path, data[:len(data) - 20]))
+
+
+def test_invalid_version(tmp_path):
+	data = bytearray(build_blend_file())
+	data[9:12] = b'4x2'
+	with pytest.raises(BlendFileError):
+		BlendFile(write(tmp_path, bytes(data)))
+
+
+@pytest.mark.parametrize('dna', [	b'SDNA',
+									sdna('<', 8)[:-6],
+									sdna('<', 8).replace(b'TLEN', b'XXXX')], ids=['empty', 'truncated', 'no_type_lengths'])
+def test_malformed_dna(tmp_path, dna):
+	with pytest.raises(BlendFileError):
+		BlendFile(write(tmp_path, build_blend_file(dna=dna)))
+
+
+@pytest.mark.parametrize('data', [b'', b'not a blend file', b'BLENDER99-01v0500'])
+def test_not_a_blend_file(tmp_path, data):
+	with pytest.raises(BlendFileError):
+		BlendFile(write(tmp_path, data))
@@ -0,0 +1,58 @@
+import fake_bpy
+import bpy
+from eab_utils.fingerprint import ObjectFingerprints
+
+
+def object_fingerprints(references, local_fingerprints, include_children=False):
+	# Object references and local hashes are given, the RNA of the objects is not read
+	fingerprints = ObjectFingerprints(include_children)
+	fingerprints.dependency_graph.references = {o: references.get(o, []) for o in bpy.data.objects}
+	fingerprints.local_fingerprints = dict(local_fingerprints)
+	return fingerprints
+
+
+def objects(*names):
+	fake_bpy.reset()
+	return [bpy.data.objects.new(n) for n in names]
+
+
+def test_components_come_after_their_dependencies():
+	a, b, c, d = objects('A', 'B', 'C', 'D')
+	graph = object_fingerprints({a: [b], b: [c, a], c: [d]}, {}).dependency_graph
+	components = graph.components([a])
+	assert [set(c) for c in components] == [{d}, {c}, {a, b}]
+
+
+def test_indirect_dependency_change():
+	a, b, c, d = objects('A', 'B', 'C', 'D')
+	references = {a: [b], b: [c]}
+	local_fingerprints = {a: 'a', b: 'b', c: 'c', d: 'd'}
+	before = object_fingerprints(references, local_fingerprints).fingerprints([a, b, d])
+	after = object_fingerprints(references, local_fingerprints | {c: 'c2'}).fingerprints([a, b, d])
+	assert before['A'] != after['A'] and before['B'] != after['B']
+	assert before['D'] == after['D']
+
+
+def test_objects_depending_on_each_other():
+	a, b, c = objects('A', 'B', 'C')
+	references = {a: [b], b: [a], c: [a]}
+	local_fingerprints = {a: 'a', b: 'b', c: 'c'}
+	before = object_fingerprints(references, local_fingerprints).fingerprints([a, b, c])
+	after = object_fingerprints(references, local_fingerprints | {b: 'b2'}).fingerprints([a, c])
+	assert before['A'] == before['B']
+	assert before['A'] != after['A'] and before['C'] != after['C']
+
+
+def test_children_change():
+	fake_bpy.reset()
+	root = bpy.data.objects.new('Root')
+	child = bpy.data.objects.new('Child', root)
+	grandchild = bpy.data.objects.new('Grandchild', child)
+	sibling = bpy.data.objects.new('Sibling', root)
+	local_fingerprints = {root: 'root', child: 'child', grandchild: 'grandchild', sibling: 'sibling'}
+	before = object_fingerprints({}, local_fingerprints, include_children=True).fingerprints([root, sibling])
+	after = object_fingerprints({}, local_fingerprints | {grandchild: 'grandchild2'}, include_children=True).fingerprints([root, sibling])
+	assert before['Root'] != after['Root']
+	assert before['Sibling'] == after['Sibling']
+	# Without children, an object only covers itself and its dependencies
+	assert object_fingerprints({}, local_fingerprints).fingerprints([root]) == object_fingerprints({}, local_fingerprints | {grandchild: 'grandchild2'}).fingerprints([root])
@@ -0,0 +1,33 @@
+import fake_bpy
+import bpy
+from import_command import ImportCommand
+from eab_utils.logger import get_logger
+
+
+class RecordingManager():
+	"""Object manager keeping the parenting order instead of setting the parent matrices"""
+	def __init__(self):
+		self.parented = []
+
+	def add_element(self, obj):
+		return obj
+
+	def parent(self, parent, child, keep_transform=False):
+		child.parent = parent
+		self.parented.append((child.name, parent.name))
+
+
+def test_children_parented_before_their_parent():
+	fake_bpy.reset()
+	imported_objects = {n: bpy.data.objects.new(f'{n}.001') for n in ['Root', 'Child', 'Grandchild', 'Sibling']}
+	command = ImportCommand.__new__(ImportCommand)
+	command.log = get_logger('Import Command')
+	command.om = RecordingManager()
+	command.imported_objects = imported_objects
+	command.objects_children = {'Root': ['Child', 'Sibling'], 'Child': ['Grandchild'], 'Grandchild': [], 'Sibling': []}
+	# The order only follows the source hierarchy once the objects are parented, it is given here
+	command.ordered_children = [imported_objects[n] for n in ['Grandchild', 'Sibling', 'Child', 'Root']]
+	command.parent_children_hierarchy()
+
+	assert command.om.parented == [('Grandchild.001', 'Child.001'), ('Sibling.001', 'Root.001'), ('Child.001', 'Root.001')]
+	assert imported_objects['Grandchild'].parent.parent is imported_objects['Root']
@@ -0,0 +1,169 @@
+import fake_bpy
+import bpy
+from import_command import ImportCommand
+from eab_utils.logger import get_logger
+from eab_utils.timing import PhaseTimer
+from eab_utils.fingerprint import FINGERPRINT_PROPERTY, SOURCE_NAME_PROPERTY
+
+
+def previous_export(name, fingerprint, parent=None, collection=None):
+	o = bpy.data.objects.new(name, parent)
+	o[SOURCE_NAME_PROPERTY] = name
+	o[FINGERPRINT_PROPERTY] = fingerprint
+	if collection is not None:
+		collection.objects.link(o)
+	return o
+
+
+def import_command(**attributes):
+	command = ImportCommand.__new__(ImportCommand)
+	command.log = get_logger('Import Command')
+	command.timer = PhaseTimer('import_command')
+	command.dependency_object_list = []
+	command.source_parents = {}
+	command.imported_dependencies = {}
+	command.imported_objects = {}
+	command.previous_exports = {o[SOURCE_NAME_PROPERTY]: o for o in bpy.data.objects if SOURCE_NAME_PROPERTY in o.keys()}
+	for k, v in attributes.items():
+		setattr(command, k, v)
+	return command
+
+
+def test_incremental_dependencies_include_parent_chain():
+	command = import_command(dependency_object_list=['Target', 'Child'],
+							source_parents={'Child': 'Parent', 'Parent': 'Root', 'Root': None, 'Target': 'Parent'})
+	assert command.incremental_dependencies(['Child']) == ['Target', 'Parent', 'Root']
+	assert command.incremental_dependencies(['Child', 'Parent']) == ['Target', 'Root']
+
+
+def test_changed_child_of_unchanged_parent():
+	fake_bpy.reset()
+	collection = bpy.data.collections.new('Props')
+	parent = previous_export('Parent', 'parent_v1', collection=collection)
+	child = previous_export('Child', 'child_v1', parent=parent, collection=collection)
+
+	# The changed child is appended with a copy of its parent, requested as a dependency and linked to no collection
+	parent_copy = bpy.data.objects.new('Parent')
+	child_copy = bpy.data.objects.new('Child', parent_copy)
+	collection.objects.link(child_copy)
+
+	command = import_command(fingerprints={'Parent': 'parent_v1', 'Child': 'child_v2'},
+							imported_objects={'Child': child_copy},
+							imported_dependencies={'Parent': parent_copy})
+	command.replace_previous_exports()
+
+	assert child_copy.parent is parent
+	assert parent in bpy.data.objects and parent_copy not in bpy.data.objects
+	assert child not in bpy.data.objects
+	assert child_copy.name == 'Child'
+	assert child_copy[FINGERPRINT_PROPERTY] == 'child_v2'
+	assert set(collection.objects) == {parent, child_copy}
+
+
+def test_changed_parent_appended_as_dependency():
+	fake_bpy.reset()
+	collection = bpy.data.collections.new('Props')
+	parent = previous_export('Parent', 'parent_v1', collection=collection)
+	previous_export('Child', 'child_v1', parent=parent, collection=collection)
+
+	parent_copy = bpy.data.objects.new('Parent')
+	child_copy = bpy.data.objects.new('Child', parent_copy)
+	collection.objects.link(child_copy)
+
+	command = import_command(fingerprints={'Parent': 'parent_v2', 'Child': 'child_v2'},
+							imported_objects={'Child': child_copy},
+							imported_dependencies={'Parent': parent_copy})
+	command.replace_previous_exports()
+
+	# The new parent replaces the previous one in its collections
+	assert child_copy.parent is parent_copy
+	assert parent not in bpy.data.objects
+	assert set(collection.objects) == {parent_copy, child_copy}
+
+
+def test_appended_datablocks_replace_previous_export():
+	fake_bpy.reset()
+	previous_mesh = bpy.data.meshes.new('Cube')
+	previous_mesh[SOURCE_NAME_PROPERTY] = 'Cube'
+	unchanged = previous_export('Unchanged', 'unchanged_v1')
+	unchanged.data = previous_mesh
+	# An unrelated datablock of the destination file sharing a source name is left alone
+	bpy.data.materials.new('Paint')
+	command = import_command(incremental=True)
+	local_ids = command.get_shared_ids()
+
+	# The changed object brings along the mesh it shares with the unchanged one, numbered by Blender on collision
+	mesh = bpy.data.meshes.new('Cube')
+	material = bpy.data.materials.new('Paint')
+	command.imported_ids = {'meshes': {'Cube': mesh}, 'materials': {'Paint': material}}
+	command.previous_ids, command.appended_ids = command.find_appended_ids(local_ids)
+	command.replace_previous_ids()
+
+	assert unchanged.data is mesh
+	assert list(bpy.data.meshes) == [mesh] and mesh.name == 'Cube'
+	assert [m.name for m in bpy.data.materials] == ['Paint', 'Paint.001']
+	assert material[SOURCE_NAME_PROPERTY] == 'Paint'
+
+
+def test_changed_object_data_replaces_previous_data():
+	fake_bpy.reset()
+	collection = bpy.data.collections.new('Props')
+	previous = previous_export('Cube', 'cube_v1', collection=collection)
+	previous.data = bpy.data.meshes.new('Cube')
+
+	cube = bpy.data.objects.new('Cube')
+	cube.data = bpy.data.meshes.new('Cube')
+	collection.objects.link(cube)
+	command = import_command(fingerprints={'Cube': 'cube_v2'}, imported_objects={'Cube': cube})
+	command.replace_previous_exports()
+
+	# The previous data is orphan once the object is replaced, its name goes to the new data
+	assert [m.name for m in bpy.data.meshes] == ['Cube'] and cube.data.name == 'Cube'
+	assert cube.name == 'Cube' and cube[FINGERPRINT_PROPERTY] == 'cube_v2'
+
+
+def test_changed_object_sharing_its_data():
+	fake_bpy.reset()
+	collection = bpy.data.collections.new('Props')
+	previous_mesh = bpy.data.meshes.new('Cube')
+	previous_mesh[SOURCE_NAME_PROPERTY] = 'Cube'
+	previous = previous_export('Cube', 'cube_v1', collection=collection)
+	instance = previous_export('Instance', 'instance_v1', collection=collection)
+	previous.data = instance.data = previous_mesh
+	command = import_command(incremental=True)
+	local_ids = command.get_shared_ids()
+
+	# The changed object is appended with a copy of the mesh it shares with the unchanged one
+	cube = bpy.data.objects.new('Cube')
+	cube.data = bpy.data.meshes.new('Cube')
+	collection.objects.link(cube)
+	command.fingerprints = {'Cube': 'cube_v2', 'Instance': 'instance_v1'}
+	command.imported_objects = {'Cube': cube}
+	command.imported_ids = {'meshes': {'Cube': cube.data}}
+	command.previous_ids, command.appended_ids = command.find_appended_ids(local_ids)
+	command.replace_previous_ids()
+	command.replace_previous_exports()
+
+	assert cube.data is instance.data
+	assert [m.name for m in bpy.data.meshes] == ['Cube']
+	assert [o.name for o in bpy.data.objects] == ['Instance', 'Cube']
+	assert set(collection.objects) == {instance, cube}
+
+
+def test_previous_data_kept_while_used():
+	fake_bpy.reset()
+	collection = bpy.data.collections.new('Props')
+	previous_mesh = bpy.data.meshes.new('Cube')
+	previous = previous_export('Cube', 'cube_v1', collection=collection)
+	instance = previous_export('Instance', 'instance_v1', collection=collection)
+	previous.data = instance.data = previous_mesh
+
+	cube = bpy.data.objects.new('Cube')
+	cube.data = bpy.data.meshes.new('Cube')
+	collection.objects.link(cube)
+	command = import_command(fingerprints={'Cube': 'cube_v2'}, imported_objects={'Cube': cube})
+	command.replace_previous_exports()
+
+	# The unchanged object still uses the previous data, the new data keeps its numbered name
+	assert instance.data is previous_mesh and previous_mesh.name == 'Cube'
+	assert [m.name for m in bpy.data.meshes] == ['Cube', 'Cube.001']
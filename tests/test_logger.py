@@ -0,0 +1,17 @@
+from eab_utils.logger import get_logger
+
+
+def test_print_flag_kept_per_caller(capsys):
+	quiet = get_logger('Test Component')
+	verbose = get_logger('Test Component', True)
+	quiet.info(lambda: 'quiet message')
+	verbose.info(lambda: 'verbose message')
+	assert not quiet.print
+	assert capsys.readouterr().out == 'Test Component : INFO : verbose message\n'
+	assert get_logger('Test Component', True) is verbose
+
+
+def test_messages_built_only_when_printed():
+	def message():
+		raise AssertionError('message built for a disabled logger')
+	get_logger('Test Component').debug(message)
@@ -0,0 +1,41 @@
+import pytest
+from import_command import ImportCommand
+
+OPTIONS = {	'source_file': 'source.blend',
+			'destination_file': 'destination.blend',
+			'source_scene_name': 'Scene',
+			'source_object_list': ['Cube'],
+			'file_override': 'APPEND_LINK',
+			'export_mode': 'APPEND',
+			'export_object_children': True,
+			'report_file': None,
+			'rename_map': {'materials': {'Material': 'Material'}}}
+
+
+def check_manifest(options):
+	command = ImportCommand.__new__(ImportCommand)
+	return command.check_manifest(command.get_parser(), dict(OPTIONS, **options))
+
+
+def test_valid_manifest():
+	assert check_manifest({}) == OPTIONS
+
+
+@pytest.mark.parametrize('value, expected', [('false', False), ('True', True), ('0', False), (True, True)])
+def test_boolean_strings(value, expected):
+	assert check_manifest({'pack_external_data': value})['pack_external_data'] is expected
+
+
+@pytest.mark.parametrize('options', [	{'file_override': 'APEND_LINK'},
+										{'export_mode': 'append'},
+										{'profile': 'ALL'},
+										{'pack_external_data': 'maybe'},
+										{'pack_external_data': 1},
+										{'source_object_list': 'Cube'},
+										{'target_scene': ['Scene']},
+										{'fingerprints': ['Cube']},
+										{'export_objects_children': True},
+										{'source_scene_name': None}])
+def test_invalid_manifest(options):
+	with pytest.raises(SystemExit):
+		check_manifest(options)
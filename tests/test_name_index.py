@@ -0,0 +1,35 @@
+import os
+from eab_utils.name_index import NameIndex
+from test_blend_file import build_blend_file
+
+
+def test_read_written_index(tmp_path):
+	filepath = tmp_path / 'test.blend'
+	filepath.write_bytes(build_blend_file())
+	index = NameIndex(str(filepath))
+	written = index.write({'OB': ['Cube']}, {})
+	assert index.read() == written
+
+
+def test_changed_file(tmp_path):
+	filepath = tmp_path / 'test.blend'
+	data = build_blend_file()
+	filepath.write_bytes(data)
+	index = NameIndex(str(filepath))
+	index.write({'OB': ['Cube']}, {})
+
+	# Same size, new content in the middle of the file
+	middle = len(data) // 2
+	filepath.write_bytes(data[:middle] + b'\1' + data[middle + 1:])
+	stat = os.stat(filepath)
+	os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+	assert index.read() is None
+
+
+def test_rebuild(tmp_path):
+	filepath = tmp_path / 'test.blend'
+	filepath.write_bytes(build_blend_file())
+	index = NameIndex(str(filepath)).get()
+	assert index['names']['OB'] == ['Cube']
+	assert index['linked_names']['OB'] == ['Linked']
+	assert NameIndex(str(filepath)).read() == index
@@ -0,0 +1,21 @@
+import json
+from eab_utils.timing import PhaseTimer
+
+
+def test_jobs_keep_their_own_section(tmp_path):
+	report_file = str(tmp_path / 'report.json')
+	export_timer = PhaseTimer('export_as_blend', report_file)
+	export_timer.count('jobs', 2)
+	export_timer.write()
+	for job, objects in [('a.blend', 1), ('b.blend', 2)]:
+		timer = PhaseTimer('import_command', report_file, job=job)
+		with timer.phase('link_objects'):
+			timer.count('imported_objects', objects)
+		timer.write()
+
+	with open(report_file, 'r') as f:
+		report = json.load(f)
+	assert report['export_as_blend']['counters'] == {'jobs': 2}
+	assert sorted(report['import_command'].keys()) == ['a.blend', 'b.blend']
+	assert report['import_command']['b.blend']['counters'] == {'imported_objects': 2}
+	assert 'link_objects' in report['import_command']['a.blend']['phases'].keys()
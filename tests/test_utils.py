@@ -0,0 +1,64 @@
+import random
+import pytest
+import fake_bpy
+import bpy
+import eab_utils.utils as U
+
+FOREST_SIZE = 100000
+
+
+@pytest.fixture
+def forest():
+	"""Objects parented to a random previous object or to nothing, the same ones on each run"""
+	fake_bpy.reset()
+	rng = random.Random(0)
+	objects = []
+	for i in range(FOREST_SIZE):
+		parent = rng.choice(objects) if len(objects) and rng.random() > 0.1 else None
+		objects.append(bpy.data.objects.new(f'Object_{i:06d}', parent))
+	selection = rng.sample(objects, FOREST_SIZE // 10)
+	return objects, selection
+
+
+def check_children_first(ordered, objects, include_parent):
+	positions = {o: i for i, o in enumerate(ordered)}
+	assert len(positions) == len(ordered)
+	assert set(objects) <= positions.keys()
+	for o in ordered:
+		if o.parent is None:
+			continue
+		if include_parent:
+			assert o.parent in positions.keys()
+		if o.parent in positions.keys():
+			assert positions[o] < positions[o.parent]
+
+
+def test_order_children_first(forest):
+	objects, _ = forest
+	ordered = U.order_children_first(objects)
+	assert len(ordered) == len(objects)
+	check_children_first(ordered, objects, include_parent=False)
+
+
+def test_order_children_first_include_parent(forest):
+	_, selection = forest
+	ordered = U.order_children_first(selection, include_parent=True)
+	check_children_first(ordered, selection, include_parent=True)
+
+
+def test_order_children_first_without_parents(forest):
+	# Parents left out of the list are not added
+	_, selection = forest
+	ordered = U.order_children_first(selection)
+	assert sorted(ordered, key=lambda o: o.name) == sorted(selection, key=lambda o: o.name)
+	check_children_first(ordered, selection, include_parent=False)
+
+
+def test_order_children_first_deep_chain():
+	fake_bpy.reset()
+	parent = None
+	chain = []
+	for i in range(FOREST_SIZE):
+		parent = bpy.data.objects.new(f'Object_{i:06d}', parent)
+		chain.append(parent)
+	assert U.order_children_first(chain[-1:], include_parent=True) == list(reversed(chain))
@@ -0,0 +1,80 @@
+import bpy
+import os
+import sys
+import json
+import queue
+import argparse
+import threading
+import traceback
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eab_utils")
+sys.path.append(os.path.dirname(SCRIPT_DIR))
+
+from eab_utils.logger import get_logger
+from eab_utils.worker_pool import WORKER_REPLY_PREFIX, DEFAULT_IDLE_TIMEOUT
+from import_command import ImportCommand
+
+
+class Worker():
+	def __init__(self, argv):
+		self.parse_argsv(argv[argv.index("--") + 1:])
+		self.log = get_logger('Worker', True)
+		self.commands = {'import_command': lambda argv: ImportCommand(argv).import_command()}
+		self.jobs = queue.Queue()
+
+	def parse_argsv(self, argv):
+		parser = argparse.ArgumentParser(description='This command keep a background Blender alive and run export jobs received on stdin, one json job per line.')
+		parser.add_argument('-I', '--idle_timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+							help='Number of seconds the worker waits for a new job before exiting',
+							required=False)
+		args = parser.parse_args(argv)
+		self.idle_timeout = args.idle_timeout
+
+	def read_jobs(self):
+		for line in sys.stdin:
+			self.jobs.put(line)
+		self.jobs.put(None)
+
+	def serve(self):
+		threading.Thread(target=self.read_jobs, daemon=True).start()
+		self.log.info(lambda: f'Worker ready, idle timeout set to {self.idle_timeout} seconds')
+		while True:
+			try:
+				line = self.jobs.get(timeout=self.idle_timeout)
+			except queue.Empty:
+				self.log.info('No job received, stopping worker')
+				return
+
+			if line is None:
+				self.log.info('Job stream closed, stopping worker')
+				return
+
+			self.reply(self.run_job(json.loads(line)))
+
+	def reset_session(self, blend_file):
+		# Mimic the command line behaviour : a missing blend file leaves the factory startup session opened
+		if blend_file is None or not os.path.exists(blend_file):
+			bpy.ops.wm.read_factory_settings(use_empty=False)
+		else:
+			bpy.ops.wm.open_mainfile(filepath=blend_file, load_ui=False)
+
+	def run_job(self, job):
+		self.log.info(lambda: f'Running "{job["script"]}" job')
+		try:
+			self.reset_session(job['blend_file'])
+			self.commands[job['script']](job['argv'])
+		except SystemExit as e:
+			return {'status': 'ERROR', 'error': f'"{job["script"]}" exited with code {e.code}'}
+		except Exception:
+			return {'status': 'ERROR', 'error': traceback.format_exc()}
+
+		return {'status': 'FINISHED'}
+
+	def reply(self, result):
+		sys.stdout.write(WORKER_REPLY_PREFIX + json.dumps(result) + '\n')
+		sys.stdout.flush()
+
+
+if __name__ == "__main__":
+	W = Worker(sys.argv)
+	W.serve()